@@ -0,0 +1,214 @@
+# File: /offchain/bot/ammquoteengine.py
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.bots.BellmanFord import Hop, TokenGraph
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+V2 = 0
+V3 = 1
+Q96 = 1 << 96
+FEE_DENOMINATOR = 1_000_000
+
+
+def _grow(values: np.ndarray, size: int) -> np.ndarray:
+    if size <= len(values):
+        return values
+    grown = np.zeros(max(size, 2 * len(values)), dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+class AMMQuoteEngine:
+    """
+    Offline quote engine over cached pool state. Uniswap V2 pools are priced from their reserves
+    and V3 pools from sqrtPriceX96 and in-range liquidity, with the same integer rounding as the
+    contracts, so edge weights and cycle simulation need no RPC. State is kept current from Sync
+    (V2) and Swap (V3) events.
+
+    V3 quotes assume the swap stays inside the current tick range; tick crossings are not modelled.
+    """
+
+    def __init__(self):
+        self.pool_index: Dict[str, int] = {}
+        self.addresses: List[str] = []
+        self.token0: List[str] = []
+        self.token1: List[str] = []
+        self.size = 0
+
+        # Per-pool columns. Object arrays hold exact Python ints (reserves and sqrtPriceX96 exceed 64 bits).
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.fee = np.zeros(0, dtype=np.int64)
+        self.reserve0 = np.zeros(0, dtype=object)
+        self.reserve1 = np.zeros(0, dtype=object)
+        self.sqrt_price_x96 = np.zeros(0, dtype=object)
+        self.liquidity = np.zeros(0, dtype=object)
+
+    def _add_pool(self, address: str, token0: str, token1: str, kind: int, fee: int) -> int:
+        index = self.pool_index.get(address)
+        if index is None:
+            index = self.size
+            self.size += 1
+            self.pool_index[address] = index
+            self.addresses.append(address)
+            self.token0.append(token0)
+            self.token1.append(token1)
+            for column in ('kind', 'fee', 'reserve0', 'reserve1', 'sqrt_price_x96', 'liquidity'):
+                setattr(self, column, _grow(getattr(self, column), self.size))
+        self.kind[index] = kind
+        self.fee[index] = fee
+        return index
+
+    def add_v2_pool(self, address: str, token0: str, token1: str, reserve0: int, reserve1: int,
+                    fee: int = 3000) -> int:
+        """
+        Registers a constant-product pool.
+        :param fee: Swap fee in hundredths of a basis point (3000 = 0.3%)
+        :return: Pool index
+        """
+        index = self._add_pool(address, token0, token1, V2, fee)
+        self.apply_sync(address, reserve0, reserve1)
+        return index
+
+    def add_v3_pool(self, address: str, token0: str, token1: str, fee: int, sqrt_price_x96: int,
+                    liquidity: int) -> int:
+        """
+        Registers a concentrated-liquidity pool at its current tick.
+        :return: Pool index
+        """
+        index = self._add_pool(address, token0, token1, V3, fee)
+        self.apply_swap(address, sqrt_price_x96, liquidity)
+        return index
+
+    def apply_sync(self, address: str, reserve0: int, reserve1: int) -> None:
+        """
+        Applies a V2 Sync(reserve0, reserve1) event.
+        """
+        index = self.pool_index[address]
+        self.reserve0[index] = int(reserve0)
+        self.reserve1[index] = int(reserve1)
+
+    def apply_swap(self, address: str, sqrt_price_x96: int, liquidity: int) -> None:
+        """
+        Applies the post-swap state carried by a V3 Swap event.
+        """
+        index = self.pool_index[address]
+        self.sqrt_price_x96[index] = int(sqrt_price_x96)
+        self.liquidity[index] = int(liquidity)
+
+    def quote(self, address: str, token_in: str, amount_in: int) -> int:
+        """
+        Exact output amount for swapping amount_in of token_in through one pool.
+        """
+        index = self.pool_index[address]
+        zero_for_one = token_in == self.token0[index]
+        if not zero_for_one and token_in != self.token1[index]:
+            raise ValueError(f"Token {token_in} is not traded by pool {address}")
+        return int(self.quote_many([index], [zero_for_one], [amount_in])[0])
+
+    def quote_many(self, pool_ids: Sequence[int], zero_for_one: Sequence[bool],
+                   amounts_in: Sequence[int]) -> np.ndarray:
+        """
+        Exact output amounts for a batch of swaps, evaluated column-wise.
+        :param pool_ids: Pool indices
+        :param zero_for_one: True to sell token0 for token1, False for the reverse
+        :param amounts_in: Input amounts (raw token units)
+        :return: Object array of exact integer output amounts
+        """
+        ids = np.asarray(pool_ids, dtype=np.int64)
+        direction = np.asarray(zero_for_one, dtype=bool)
+        amounts = np.empty(len(ids), dtype=object)
+        amounts[:] = [int(amount) for amount in amounts_in]
+        out = np.zeros(len(ids), dtype=object)
+
+        v2 = self.kind[ids] == V2
+        if v2.any():
+            pools, forward, amount = ids[v2], direction[v2], amounts[v2]
+            reserve_in = np.where(forward, self.reserve0[pools], self.reserve1[pools])
+            reserve_out = np.where(forward, self.reserve1[pools], self.reserve0[pools])
+            amount_with_fee = amount * (FEE_DENOMINATOR - self.fee[pools]).astype(object)
+            denominator = reserve_in * FEE_DENOMINATOR + amount_with_fee
+            out[v2] = np.where(denominator > 0, amount_with_fee * reserve_out // np.maximum(denominator, 1), 0)
+
+        v3 = ~v2
+        if v3.any():
+            out[v3] = self._quote_v3(ids[v3], direction[v3], amounts[v3])
+        return out
+
+    def _quote_v3(self, pools: np.ndarray, zero_for_one: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        # SwapMath.computeSwapStep for an exact-input step that ends inside the current tick
+        sqrt_price = self.sqrt_price_x96[pools]
+        liquidity = self.liquidity[pools]
+        amount = amounts * (FEE_DENOMINATOR - self.fee[pools]).astype(object) // FEE_DENOMINATOR
+        out = np.zeros(len(pools), dtype=object)
+        live = (liquidity > 0) & (sqrt_price > 0)
+
+        down = live & zero_for_one
+        if down.any():
+            # getNextSqrtPriceFromAmount0RoundingUp, then getAmount1Delta rounded down
+            numerator = liquidity[down] * Q96
+            product = amount[down] * sqrt_price[down]
+            next_price = -((-numerator * sqrt_price[down]) // (numerator + product))
+            out[down] = liquidity[down] * (sqrt_price[down] - next_price) // Q96
+
+        up = live & ~zero_for_one
+        if up.any():
+            # getNextSqrtPriceFromAmount1RoundingDown, then getAmount0Delta rounded down
+            next_price = sqrt_price[up] + amount[up] * Q96 // liquidity[up]
+            numerator = liquidity[up] * Q96
+            out[up] = numerator * (next_price - sqrt_price[up]) // next_price // sqrt_price[up]
+        return out
+
+    def spot_rates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Marginal exchange rates net of fee for every pool, in raw token units.
+        :return: (token0 -> token1 rates, token1 -> token0 rates) as float64 arrays
+        """
+        n = self.size
+        kind = self.kind[:n]
+        fee_factor = 1.0 - self.fee[:n] / FEE_DENOMINATOR
+        reserve0 = self.reserve0[:n].astype(np.float64)
+        reserve1 = self.reserve1[:n].astype(np.float64)
+        price = (self.sqrt_price_x96[:n].astype(np.float64) / Q96) ** 2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            forward = np.where(kind == V2, reserve1 / reserve0, price)
+            backward = np.where(kind == V2, reserve0 / reserve1, 1.0 / price)
+        forward = np.nan_to_num(forward * fee_factor, nan=0.0, posinf=0.0)
+        backward = np.nan_to_num(backward * fee_factor, nan=0.0, posinf=0.0)
+        return forward, backward
+
+    def to_token_graph(self, token_graph: Optional[TokenGraph] = None) -> TokenGraph:
+        """
+        Writes both swap directions of every pool into a TokenGraph, priced from cached state.
+        """
+        token_graph = token_graph or TokenGraph()
+        forward, backward = self.spot_rates()
+        for index, address in enumerate(self.addresses):
+            venue = 'uniswap-v2' if self.kind[index] == V2 else 'uniswap-v3'
+            fee = int(self.fee[index])
+            if forward[index] > 0:
+                token_graph.add_edge(self.token0[index], self.token1[index], forward[index], venue, address, fee)
+            if backward[index] > 0:
+                token_graph.add_edge(self.token1[index], self.token0[index], backward[index], venue, address, fee)
+        return token_graph
+
+    def simulate_route(self, route: Sequence[Union[Hop, Tuple[str, str]]], amount_in: int) -> int:
+        """
+        Exact output of trading amount_in along a route of hops (e.g. from TokenGraph.route).
+        :param route: Hops, or (pool address, token_in) tuples
+        :param amount_in: Input amount of the first hop's token
+        :return: Output amount of the last hop's token
+        """
+        amount = int(amount_in)
+        for hop in route:
+            if isinstance(hop, Hop):
+                amount = self.quote(hop.pool, hop.token_in, amount)
+            else:
+                amount = self.quote(hop[0], hop[1], amount)
+        return amount
@@ -0,0 +1,265 @@
+# File: /offchain/bot/arbitragebot.py
+
+import time
+
+# Taken before any other import so start-up cost is part of the reported timings
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.bots.IncrementalDetector import IncrementalArbitrageDetector
+from src.bots.Pipeline import ArbitragePipeline, Opportunity
+from src.utils.StateSnapshot import load_snapshot, save_snapshot
+from src.utils.Tracing import tracer
+
+# web3, uniswap, eth_account and aiohttp are imported only by the functions that need them
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class StartupReport(NamedTuple):
+    restored: bool
+    snapshot_block: Optional[int]
+    snapshot_age: Optional[float]
+    edges: int
+    ready: float
+    time_to_first_detection: Optional[float]
+    opportunities: int
+
+
+def log_opportunity(opportunity: Opportunity) -> None:
+    hops = ' -> '.join(f"{hop.token_in}>{hop.token_out}@{hop.venue or '?'}" for hop in opportunity.route)
+    logging.info(f"Opportunity x{opportunity.rate_product:.6f} at block {opportunity.block}: {hops}")
+
+
+class ArbitrageBot:
+    def __init__(self, feeds: Sequence[Any] = (),
+                 sink: Optional[Callable[[Opportunity], Optional[Awaitable[None]]]] = None,
+                 snapshot_path: str = 'build/bot_state.npz', snapshot_interval: float = 30.0,
+                 nonce_managers: Optional[Dict[str, Any]] = None, engine=None, warm_start: bool = True,
+                 started_at: Optional[float] = None):
+        """
+        Warm-starting bot. On start the last saved graph, pool state and nonces are restored and the
+        cycles open in that state are handed to the sink right away (tagged with the snapshot's
+        block), while the feeds refresh the graph in the background through an ArbitragePipeline.
+        State is saved periodically and on stop.
+        :param feeds: Feed adapters exposing `async run(emit)` that refresh the graph
+        :param sink: Callback receiving each Opportunity (may be a coroutine function); logs by default
+        :param snapshot_path: Snapshot file to restore from and save to
+        :param snapshot_interval: Seconds between snapshots while running (0 saves only on stop)
+        :param nonce_managers: Account address -> NonceManager seeded from the snapshot and re-synced in the background
+        :param engine: AMMQuoteEngine saved with the graph (replaced by the snapshot's one when restored)
+        :param warm_start: Restore the snapshot on start (False starts from an empty graph but still saves)
+        :param started_at: time.perf_counter() timings are measured from (module import by default)
+        """
+        self.feeds = list(feeds)
+        self.sink = sink or log_opportunity
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.nonce_managers = nonce_managers or {}
+        self.engine = engine
+        self.warm_start = warm_start
+        self.started_at = _PROCESS_START if started_at is None else started_at
+
+        self.pipeline: Optional[ArbitragePipeline] = None
+        self.restored = False
+        self.snapshot_block: Optional[int] = None
+        self.snapshot_age: Optional[float] = None
+        self.ready: Optional[float] = None
+        self.first_detection: Optional[float] = None
+        self.opportunities = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def restore(self) -> bool:
+        """
+        Loads the snapshot into a fresh pipeline. Without a readable snapshot the bot starts cold.
+        :return: True if state was restored
+        """
+        token_graph = detector = snapshot = None
+        if self.warm_start:
+            try:
+                snapshot = load_snapshot(self.snapshot_path)
+            except FileNotFoundError:
+                logging.info(f"No snapshot at {self.snapshot_path}; starting cold")
+            except Exception as e:
+                logging.error(f"Unreadable snapshot {self.snapshot_path}, starting cold: {str(e)}")
+
+        if snapshot is not None:
+            token_graph = snapshot.token_graph
+            if token_graph is not None:
+                detector = IncrementalArbitrageDetector(token_graph.to_weight_dict())
+            self.engine = snapshot.engine or self.engine
+            for address, nonce in snapshot.nonces.items():
+                if address in self.nonce_managers:
+                    self.nonce_managers[address].seed(nonce)
+            self.restored = True
+            self.snapshot_block = snapshot.block
+            self.snapshot_age = time.time() - snapshot.saved_at
+            logging.info(f"Restored {len(token_graph) if token_graph is not None else 0} edges from block "
+                         f"{snapshot.block} ({self.snapshot_age:.0f}s old)")
+
+        self.pipeline = ArbitragePipeline(self.feeds, self._emit, detector=detector, token_graph=token_graph)
+        self.pipeline.last_block = self.snapshot_block or 0
+        return self.restored
+
+    def save(self) -> Optional[str]:
+        """
+        Saves the current graph, pool state and nonces. Runs on the event loop thread so the
+        pipeline cannot grow the graph's edge columns while they are being written.
+        :return: Snapshot path, or None if saving failed
+        """
+        nonces = {address: manager.peek() for address, manager in self.nonce_managers.items()
+                  if manager.peek() is not None}
+        try:
+            return save_snapshot(self.snapshot_path, self.pipeline.token_graph, self.engine, nonces,
+                                 self.pipeline.last_block or None)
+        except Exception as e:
+            logging.error(f"Failed to save snapshot {self.snapshot_path}: {str(e)}")
+            return None
+
+    async def start(self) -> None:
+        """
+        Restores state, serves the snapshot's open cycles, then starts the background refresh.
+        """
+        if self.pipeline is None:
+            self.restore()
+        self.ready = time.perf_counter() - self.started_at
+
+        detector, token_graph = self.pipeline.detector, self.pipeline.token_graph
+        for cycle, rate_product in detector.active_cycles():
+            try:
+                route = token_graph.route(cycle)
+            except KeyError:
+                continue
+            await self._emit(Opportunity(cycle, rate_product, route, self.snapshot_block, time.time(),
+                                         tracer.start('detection')))
+
+        await self.pipeline.start()
+        self._tasks = [asyncio.ensure_future(manager.sync_async()) for manager in self.nonce_managers.values()]
+        if self.snapshot_interval > 0:
+            self._tasks.append(asyncio.ensure_future(self._save_periodically()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.pipeline is not None:
+            await self.pipeline.stop()
+            self.save()
+
+    async def __aenter__(self) -> 'ArbitrageBot':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def report(self) -> StartupReport:
+        return StartupReport(self.restored, self.snapshot_block, self.snapshot_age,
+                             len(self.pipeline.token_graph) if self.pipeline is not None else 0, self.ready,
+                             self.first_detection, self.opportunities)
+
+    async def _emit(self, opportunity: Opportunity) -> None:
+        self.opportunities += 1
+        if self.first_detection is None:
+            self.first_detection = time.perf_counter() - self.started_at
+            logging.info(f"Time to first detection: {self.first_detection * 1000:.1f}ms "
+                         f"({'warm' if self.restored else 'cold'} start)")
+        try:
+            result = self.sink(opportunity)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logging.error(f"Opportunity sink failed: {str(e)}")
+
+    async def _save_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self.save()
+
+
+def parse_pairs(values: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    Parses TOKEN_IN:TOKEN_OUT arguments.
+    """
+    pairs = []
+    for value in values:
+        token_in, separator, token_out = value.partition(':')
+        if not separator or not token_in or not token_out:
+            raise argparse.ArgumentTypeError(f"Pair {value} must look like TOKEN_IN:TOKEN_OUT")
+        pairs.append((token_in, token_out))
+    return pairs
+
+
+def connect_nonce_manager(rpc_url: str, address: str):
+    # web3 is only loaded when nonces are managed
+    from web3 import Web3
+
+    from src.utils.NonceManager import NonceManager
+
+    return NonceManager(Web3(Web3.HTTPProvider(rpc_url)), address)
+
+
+async def run(args: argparse.Namespace) -> StartupReport:
+    """
+    Runs the bot until args.duration elapses (forever when it is not set).
+    """
+    aggregator = None
+    feeds = []
+    if args.routers and args.pairs:
+        from src.bots.LiquidityAggregator import AsyncLiquidityAggregator
+        from src.bots.Pipeline import LiquidityFeed
+
+        aggregator = AsyncLiquidityAggregator(args.routers)
+        feeds.append(LiquidityFeed(aggregator, parse_pairs(args.pairs), interval=args.interval))
+
+    nonce_managers = {}
+    if args.rpc and args.address:
+        nonce_managers[args.address] = connect_nonce_manager(args.rpc, args.address)
+
+    # Router feeds carry rates only, so no AMMQuoteEngine is kept here: the CLI persists the graph
+    # and nonces, and pool state only when an embedding caller passes its own engine
+    bot = ArbitrageBot(feeds, snapshot_path=args.snapshot, snapshot_interval=args.snapshot_interval,
+                       nonce_managers=nonce_managers, warm_start=not args.no_restore)
+    try:
+        async with bot:
+            await asyncio.sleep(args.duration if args.duration is not None else math.inf)
+    finally:
+        if aggregator is not None:
+            await aggregator.close()
+
+    report = bot.report()
+    ttfd = f"{report.time_to_first_detection * 1000:.1f}ms" if report.time_to_first_detection is not None else 'none'
+    logging.info(f"Ready after {report.ready * 1000:.1f}ms, time to first detection {ttfd}, "
+                 f"{report.opportunities} opportunities, {report.edges} edges saved to {args.snapshot}")
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> StartupReport:
+    parser = argparse.ArgumentParser(description="Warm-starting arbitrage bot")
+    parser.add_argument('--snapshot', default=os.path.join('build', 'bot_state.npz'),
+                        help="State snapshot restored on start and saved while running")
+    parser.add_argument('--routers', nargs='*', default=[], help="Router API base URLs to poll")
+    parser.add_argument('--pairs', nargs='*', default=[], metavar='TOKEN_IN:TOKEN_OUT', help="Token pairs to poll")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between polling rounds")
+    parser.add_argument('--snapshot-interval', type=float, default=30.0, help="Seconds between snapshots")
+    parser.add_argument('--duration', type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument('--rpc', default=os.getenv('INFURA_URL'), help="RPC URL for nonce syncing")
+    parser.add_argument('--address', default=os.getenv('WALLET_ADDRESS'), help="Account whose nonce is tracked")
+    parser.add_argument('--no-restore', action='store_true', help="Ignore the snapshot and start cold")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        logging.info("Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,27 @@
 
 import math
 import logging
-from typing import Dict, Tuple, List, Optional
+from array import array
+from collections import deque
+from typing import Dict, Tuple, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
 
 # Set up logger to track events and errors
 logging.basicConfig(level=logging.INFO)
 
 class BellmanFordArbitrage:
-    def __init__(self, graph: Dict[str, Dict[str, float]]):
+    def __init__(self, graph: Union[Dict[str, Dict[str, float]], 'TokenGraph']):
         """
         Initialize with a weighted graph where weights are -log(exchange_rate).
-        :param graph: Dictionary representing token connections with negative log weights.
+        :param graph: Dictionary representing token connections with negative log weights,
+                      or a TokenGraph (the best venue per token pair is searched)
         """
+        if isinstance(graph, TokenGraph):
+            self.token_graph: Optional[TokenGraph] = graph
+            graph = graph.to_weight_dict()
+        else:
+            self.token_graph = None
         self.graph = graph
 
     def find_arbitrage(self, start_token: str) -> Optional[List[str]]:
@@ -66,21 +76,545 @@ class BellmanFordArbitrage:
         logging.info(f"Cycle reconstructed: {' -> '.join(cycle)}")
         return cycle
 
+    def route_for_cycle(self, cycle: List[str]) -> List['Hop']:
+        """
+        Resolves which pool each hop of a detected cycle trades through.
+        :param cycle: Closed token cycle as returned by find_arbitrage
+        :return: One Hop per consecutive token pair
+        """
+        if self.token_graph is None:
+            raise ValueError("Routing requires the detector to be built from a TokenGraph")
+        return self.token_graph.route(cycle)
+
+    def find_all_arbitrage(self) -> List[Tuple[List[str], float]]:
+        """
+        Detects every distinct negative cycle in the graph in a single Bellman-Ford run.
+        A virtual super-source with a zero-weight edge to every token makes all cycles
+        reachable at once, so no start token is needed.
+        :return: List of (cycle, product of rates along the cycle) tuples, most profitable first
+        """
+        # Step 1: Starting every distance at zero is equivalent to relaxing from the super-source
+        tokens = set(self.graph)
+        for u in self.graph:
+            tokens.update(self.graph[u])
+        distance = {token: 0.0 for token in tokens}
+        predecessor = {token: None for token in tokens}
+        cycles: Dict[Tuple[str, ...], float] = {}
+
+        # Step 2: Relax edges (|V|+1 nodes -> |V| passes), collecting the cycles that form
+        # in the predecessor graph after each pass
+        for i in range(len(tokens)):
+            changed = False
+            for u in self.graph:
+                for v, weight in self.graph[u].items():
+                    if distance[u] + weight < distance[v]:
+                        distance[v] = distance[u] + weight
+                        predecessor[v] = u
+                        changed = True
+            if not changed:
+                break
+            self.collect_cycles(predecessor, cycles)
+
+        return self.rank_cycles(cycles)
+
+    def collect_cycles(self, predecessor: Dict[str, Optional[str]], cycles: Dict[Tuple[str, ...], float]) -> None:
+        """
+        Walks the predecessor graph and records every cycle in it, keyed by its canonical rotation.
+        :param predecessor: Dictionary mapping token to its predecessor
+        :param cycles: Accumulator mapping canonical cycle to its total weight
+        """
+        walk_of = {}
+        for token in predecessor:
+            if token in walk_of:
+                continue
+            path = []
+            current = token
+            while current is not None and current not in walk_of:
+                walk_of[current] = token
+                path.append(current)
+                current = predecessor[current]
+
+            # Only a walk that runs into itself has found a new cycle
+            if current is not None and walk_of[current] == token:
+                cycle = path[path.index(current):]
+                cycle.reverse()
+                self.record_cycle(cycle, cycles)
+
+    def record_cycle(self, cycle: List[str], cycles: Dict[Tuple[str, ...], float]) -> None:
+        """
+        Canonicalizes an open cycle (first token not repeated) and records it if its weight is negative.
+        Rotations of the same cycle collapse onto one key starting at the smallest token.
+        :param cycle: Tokens in trading order
+        :param cycles: Accumulator mapping canonical cycle to its total weight
+        """
+        pivot = cycle.index(min(cycle))
+        key = tuple(cycle[pivot:] + cycle[:pivot])
+        if key in cycles:
+            return
+        weight = sum(self.graph[u][v] for u, v in zip(key, key[1:] + key[:1]))
+        if weight < 0:
+            cycles[key] = weight
+
+    def rank_cycles(self, cycles: Dict[Tuple[str, ...], float]) -> List[Tuple[List[str], float]]:
+        """
+        Orders recorded cycles by the product of exchange rates along them, best first.
+        :param cycles: Mapping of canonical cycle to its total -log(rate) weight
+        :return: List of (closed cycle, rate product) tuples
+        """
+        ranked = sorted(cycles.items(), key=lambda item: item[1])
+        result = [(list(key) + [key[0]], math.exp(-weight)) for key, weight in ranked]
+        logging.info(f"Found {len(result)} distinct arbitrage cycles.")
+        return result
+
+
+class SPFAArbitrage(BellmanFordArbitrage):
+    """
+    Queue-driven negative-cycle finder (Bellman-Ford-Moore with Tarjan's subtree disassembly).
+    Only tokens whose distance changed are revisited, and the shortest-path tree is checked on
+    every improvement, so a cycle is returned as soon as it forms rather than after |V|-1 passes.
+    """
+
+    def find_arbitrage(self, start_token: str) -> Optional[List[str]]:
+        """
+        Executes the queue-based search from a start token.
+        :param start_token: The token to start traversing from
+        :return: A list representing arbitrage cycle if found, else None
+        """
+        if start_token not in self.graph:
+            logging.info("No arbitrage cycle found.")
+            return None
+
+        # Step 1: Setup distances, predecessors and the shortest-path tree
+        distance = {start_token: 0.0}
+        predecessor: Dict[str, Optional[str]] = {start_token: None}
+        children: Dict[str, set] = {start_token: set()}
+        in_tree = {start_token}
+        queue = deque([start_token])
+        queued = {start_token}
+
+        # Step 2: Relax out-edges of tokens whose distance changed
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            if u not in in_tree:
+                # Disassembled since it was queued; it re-enters once re-priced
+                continue
+
+            # Tokens that only appear as a quote have no out-edges
+            for v, weight in self.graph.get(u, {}).items():
+                candidate = distance[u] + weight
+                if candidate >= distance.get(v, math.inf):
+                    continue
+
+                # Step 3: Disassemble v's subtree; finding u in it means u -> v closes a negative cycle
+                if v == u or self._disassemble(v, u, children, in_tree):
+                    predecessor[v] = u
+                    logging.info("Arbitrage opportunity detected!")
+                    return self.reconstruct_cycle(predecessor, v)
+
+                parent = predecessor.get(v)
+                if parent is not None:
+                    children[parent].discard(v)
+                predecessor[v] = u
+                children[u].add(v)
+                children.setdefault(v, set())
+                in_tree.add(v)
+                distance[v] = candidate
+                if v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+
+        logging.info("No arbitrage cycle found.")
+        return None
+
+    def _disassemble(self, root: str, target: str, children: Dict[str, set], in_tree: set) -> bool:
+        """
+        Detaches every descendant of root from the shortest-path tree.
+        :return: True if target is among the descendants (a negative cycle), else False
+        """
+        stack = list(children.get(root, ()))
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            stack.extend(children[node])
+            children[node] = set()
+            in_tree.discard(node)
+        children[root] = set()
+        return False
+
+
+class VectorizedBellmanFordArbitrage(BellmanFordArbitrage):
+    def __init__(self, graph: Union[Dict[str, Dict[str, float]], 'TokenGraph']):
+        """
+        Array-backed variant of BellmanFordArbitrage. Tokens are interned to integer indices and
+        the graph is flattened into parallel (src, dst, weight) edge arrays so each relaxation
+        pass runs as a single NumPy operation.
+        :param graph: Dictionary representing token connections with negative log weights, or a TokenGraph
+        """
+        super().__init__(graph)
+        if self.token_graph is not None:
+            # Reuse the TokenGraph's interned IDs and edge columns; parallel venues stay as parallel edges
+            self.tokens = self.token_graph.tokens
+            self.token_index = self.token_graph.token_index
+            src, dst, weight = self.token_graph.edge_arrays()
+            self.src = src.astype(np.int64)
+            self.dst = dst.astype(np.int64)
+            self.weight = weight.copy()
+            return
+
+        self.tokens: List[str] = []
+        self.token_index: Dict[str, int] = {}
+
+        src, dst, weight = [], [], []
+        for u in self.graph:
+            self._intern(u)
+        for u, edges in self.graph.items():
+            for v, w in edges.items():
+                src.append(self.token_index[u])
+                dst.append(self._intern(v))
+                weight.append(w)
+
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.weight = np.asarray(weight, dtype=np.float64)
+
+    def _intern(self, token: str) -> int:
+        """
+        Returns the integer index of a token, assigning the next free one on first sight.
+        """
+        index = self.token_index.get(token)
+        if index is None:
+            index = len(self.tokens)
+            self.token_index[token] = index
+            self.tokens.append(token)
+        return index
+
+    def find_arbitrage(self, start_token: str) -> Optional[List[str]]:
+        """
+        Executes a vectorized Bellman-Ford, stopping early once a pass relaxes nothing.
+        :param start_token: The token to start traversing from
+        :return: A list representing arbitrage cycle if found, else None
+        """
+        if start_token not in self.token_index:
+            logging.info("No arbitrage cycle found.")
+            return None
+
+        # Step 1: Setup distances and predecessors
+        n = len(self.tokens)
+        distance = np.full(n, np.inf)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        distance[self.token_index[start_token]] = 0.0
+
+        # Step 2: Relax all edges at once, up to |V|-1 times
+        for i in range(n - 1):
+            candidate = distance[self.src] + self.weight
+            improved = candidate < distance[self.dst]
+            if not improved.any():
+                logging.info(f"Converged after {i} passes. No arbitrage cycle found.")
+                return None
+            self._relax(distance, predecessor, candidate, improved)
+
+        # Step 3: Check for negative-weight cycles
+        candidate = distance[self.src] + self.weight
+        improved = candidate < distance[self.dst]
+        if improved.any():
+            logging.info("Arbitrage opportunity detected!")
+            # Apply the violating pass so the predecessor chain closes through the detected token
+            target = self.tokens[self.dst[np.flatnonzero(improved)[0]]]
+            self._relax(distance, predecessor, candidate, improved)
+            return self.reconstruct_cycle(self._predecessor_map(predecessor), target)
+
+        logging.info("No arbitrage cycle found.")
+        return None
+
+    def find_all_arbitrage(self) -> List[Tuple[List[str], float]]:
+        """
+        Vectorized single-run detection of every distinct negative cycle via a virtual super-source.
+        :return: List of (cycle, product of rates along the cycle) tuples, most profitable first
+        """
+        n = len(self.tokens)
+        distance = np.zeros(n)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        cycles: Dict[Tuple[str, ...], float] = {}
+
+        for i in range(n):
+            candidate = distance[self.src] + self.weight
+            improved = candidate < distance[self.dst]
+            if not improved.any():
+                break
+            self._relax(distance, predecessor, candidate, improved)
+            self._collect_cycles(predecessor, cycles)
+
+        return self.rank_cycles(cycles)
+
+    def _collect_cycles(self, predecessor: np.ndarray, cycles: Dict[Tuple[str, ...], float]) -> None:
+        """
+        Finds the tokens lying on predecessor cycles by pointer jumping, then walks each cycle once.
+        """
+        n = len(self.tokens)
+        # Index n is a sentinel standing in for "no predecessor"
+        jump = np.append(np.where(predecessor >= 0, predecessor, n), n)
+        for _ in range(max(n, 1).bit_length()):
+            jump = jump[jump]
+        on_cycle = np.unique(jump[:n])
+
+        seen = set()
+        for start in on_cycle[on_cycle < n].tolist():
+            if start in seen:
+                continue
+            cycle = [start]
+            current = int(predecessor[start])
+            while current != start:
+                cycle.append(current)
+                current = int(predecessor[current])
+            seen.update(cycle)
+            cycle.reverse()
+            self.record_cycle([self.tokens[i] for i in cycle], cycles)
+
+    def _relax(self, distance: np.ndarray, predecessor: np.ndarray, candidate: np.ndarray,
+               improved: np.ndarray) -> None:
+        """
+        Applies one relaxation pass in place, keeping the cheapest improving edge per target token.
+        """
+        edges = np.flatnonzero(improved)
+        targets = self.dst[edges]
+        best = np.full(distance.shape, np.inf)
+        np.minimum.at(best, targets, candidate[edges])
+
+        winners = edges[candidate[edges] == best[targets]]
+        distance[self.dst[winners]] = candidate[winners]
+        predecessor[self.dst[winners]] = self.src[winners]
+
+    def _predecessor_map(self, predecessor: np.ndarray) -> Dict[str, Optional[str]]:
+        """
+        Converts the predecessor index array back into the token map used by reconstruct_cycle.
+        """
+        return {
+            token: (self.tokens[p] if p >= 0 else None)
+            for token, p in zip(self.tokens, predecessor.tolist())
+        }
+
+
+class Hop(NamedTuple):
+    """
+    A single swap of a route: which pool on which venue carries token_in -> token_out.
+    """
+    token_in: str
+    token_out: str
+    rate: float
+    venue: str
+    pool: Optional[str]
+    fee: int
+
+
+class TokenGraph:
+    """
+    Compact multi-venue token graph. Tokens and venues are interned to integer IDs and edges live
+    in flat typed arrays, so several pools quoting the same token pair coexist as parallel edges
+    instead of overwriting each other.
+    """
+    __slots__ = ('tokens', 'token_index', 'venues', 'venue_index', 'src', 'dst', 'weight',
+                 'venue', 'fee', 'pools', 'pair_edges', 'edge_keys')
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.token_index: Dict[str, int] = {}
+        self.venues: List[str] = []
+        self.venue_index: Dict[str, int] = {}
+
+        # Edge columns, one entry per pool quote
+        self.src = array('I')
+        self.dst = array('I')
+        self.weight = array('d')
+        self.venue = array('H')
+        self.fee = array('I')
+        self.pools: List[Optional[str]] = []
+
+        # (src, dst) packed into one int -> parallel edge IDs; (pair, venue, pool) -> edge ID
+        self.pair_edges: Dict[int, List[int]] = {}
+        self.edge_keys: Dict[Tuple[int, int, Optional[str]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.weight)
+
+    @classmethod
+    def from_columns(cls, tokens: Sequence[str], venues: Sequence[str], src: np.ndarray, dst: np.ndarray,
+                     weight: np.ndarray, venue: np.ndarray, fee: np.ndarray,
+                     pools: Sequence[Optional[str]]) -> 'TokenGraph':
+        """
+        Rebuilds a graph from its edge columns (e.g. a saved snapshot). Weights are restored
+        bit for bit and edge IDs are unchanged.
+        """
+        graph = cls()
+        graph.tokens = list(tokens)
+        graph.token_index = {token: i for i, token in enumerate(graph.tokens)}
+        graph.venues = list(venues)
+        graph.venue_index = {name: i for i, name in enumerate(graph.venues)}
+        graph.src.frombytes(np.ascontiguousarray(src, dtype=np.uint32).tobytes())
+        graph.dst.frombytes(np.ascontiguousarray(dst, dtype=np.uint32).tobytes())
+        graph.weight.frombytes(np.ascontiguousarray(weight, dtype=np.float64).tobytes())
+        graph.venue.frombytes(np.ascontiguousarray(venue, dtype=np.uint16).tobytes())
+        graph.fee.frombytes(np.ascontiguousarray(fee, dtype=np.uint32).tobytes())
+        graph.pools = list(pools)
+        if len({len(graph.src), len(graph.dst), len(graph.weight), len(graph.venue), len(graph.fee), len(graph.pools)}) > 1:
+            raise ValueError("Edge columns have different lengths")
+
+        for edge, (u, v, venue_id, pool) in enumerate(zip(graph.src, graph.dst, graph.venue, graph.pools)):
+            pair = (u << 32) | v
+            graph.pair_edges.setdefault(pair, []).append(edge)
+            graph.edge_keys[(pair, venue_id, pool)] = edge
+        return graph
+
+    def intern(self, token: str) -> int:
+        """
+        Returns the integer ID of a token, assigning the next free one on first sight.
+        """
+        index = self.token_index.get(token)
+        if index is None:
+            index = len(self.tokens)
+            self.token_index[token] = index
+            self.tokens.append(token)
+        return index
+
+    def _intern_venue(self, venue: str) -> int:
+        index = self.venue_index.get(venue)
+        if index is None:
+            index = len(self.venues)
+            self.venue_index[venue] = index
+            self.venues.append(venue)
+        return index
+
+    def add_edge(self, base: str, quote: str, rate: float, venue: str = '', pool: Optional[str] = None,
+                 fee: int = 0) -> int:
+        """
+        Adds a pool quote for base -> quote, or re-prices it if the same venue/pool is already known.
+        :param base: Token being sold
+        :param quote: Token being bought
+        :param rate: Exchange rate (units of quote per unit of base), must be positive
+        :param venue: DEX name, e.g. 'uniswap-v3'
+        :param pool: Pool address carrying the swap
+        :param fee: Fee tier in hundredths of a basis point (3000 = 0.3%)
+        :return: Edge ID
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate for {base}/{quote} must be positive, got {rate}")
+
+        pair = (self.intern(base) << 32) | self.intern(quote)
+        venue_id = self._intern_venue(venue)
+        key = (pair, venue_id, pool)
+        edge = self.edge_keys.get(key)
+        if edge is not None:
+            self.weight[edge] = -math.log(rate)
+            return edge
+
+        edge = len(self.weight)
+        self.src.append(pair >> 32)
+        self.dst.append(pair & 0xFFFFFFFF)
+        self.weight.append(-math.log(rate))
+        self.venue.append(venue_id)
+        self.fee.append(fee)
+        self.pools.append(pool)
+        self.pair_edges.setdefault(pair, []).append(edge)
+        self.edge_keys[key] = edge
+        return edge
+
+    def update_rate(self, edge: int, rate: float) -> None:
+        """
+        Re-prices an existing edge in place.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate for edge {edge} must be positive, got {rate}")
+        self.weight[edge] = -math.log(rate)
+
+    def edges_between(self, base: str, quote: str) -> List[int]:
+        """
+        Returns the IDs of every parallel edge quoting base -> quote.
+        """
+        if base not in self.token_index or quote not in self.token_index:
+            return []
+        return self.pair_edges.get((self.token_index[base] << 32) | self.token_index[quote], [])
+
+    def best_edge(self, base: str, quote: str) -> Optional[int]:
+        """
+        Returns the ID of the best-priced (lowest weight) edge for base -> quote, or None.
+        """
+        edges = self.edges_between(base, quote)
+        if not edges:
+            return None
+        return min(edges, key=self.weight.__getitem__)
+
+    def hop(self, edge: int) -> Hop:
+        return Hop(
+            token_in=self.tokens[self.src[edge]],
+            token_out=self.tokens[self.dst[edge]],
+            rate=math.exp(-self.weight[edge]),
+            venue=self.venues[self.venue[edge]],
+            pool=self.pools[edge],
+            fee=self.fee[edge],
+        )
+
+    def route(self, cycle: List[str]) -> List[Hop]:
+        """
+        Maps each consecutive token pair of a cycle to the pool quoting it best.
+        :param cycle: Tokens in trading order
+        :return: One Hop per pair
+        """
+        hops = []
+        for base, quote in zip(cycle, cycle[1:]):
+            edge = self.best_edge(base, quote)
+            if edge is None:
+                raise KeyError(f"No pool quotes {base} -> {quote}")
+            hops.append(self.hop(edge))
+        return hops
+
+    def to_weight_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Collapses parallel edges to the best venue per pair, giving the weight graph used by Bellman-Ford.
+        """
+        graph: Dict[str, Dict[str, float]] = {token: {} for token in self.tokens}
+        for pair, edges in self.pair_edges.items():
+            weight = min(self.weight[edge] for edge in edges)
+            graph[self.tokens[pair >> 32]][self.tokens[pair & 0xFFFFFFFF]] = weight
+        return graph
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Zero-copy NumPy views of the (src, dst, weight) edge columns.
+        """
+        return (np.frombuffer(self.src, dtype=np.uint32), np.frombuffer(self.dst, dtype=np.uint32),
+                np.frombuffer(self.weight, dtype=np.float64))
+
 
 # Example utility to build the graph from exchange rates
-def build_graph_from_prices(prices: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+def build_graph_from_prices(prices: Dict[str, Dict[str, Union[float, List[Dict]]]],
+                            token_graph: Optional[TokenGraph] = None) -> Dict[str, Dict[str, float]]:
     """
     Converts a token price graph into a weight graph using -log(rate) for Bellman-Ford.
+    A pair may carry a list of venue quotes instead of a single rate, e.g.
+    [{'rate': 3000.0, 'venue': 'uniswap-v3', 'pool': '0x...', 'fee': 500}, ...];
+    the best one is kept in the weight graph.
     :param prices: Raw token exchange rates
+    :param token_graph: Optional TokenGraph that additionally receives every venue quote as a parallel edge
     :return: Graph suitable for Bellman-Ford
     """
     graph = {}
     for base in prices:
         graph[base] = {}
         for quote in prices[base]:
-            rate = prices[base][quote]
-            if rate > 0:
-                graph[base][quote] = -math.log(rate)
+            quotes = prices[base][quote]
+            if not isinstance(quotes, list):
+                quotes = [{'rate': quotes}]
+            for entry in quotes:
+                rate = entry['rate']
+                if rate <= 0:
+                    continue
+                if token_graph is not None:
+                    token_graph.add_edge(base, quote, rate, entry.get('venue', ''), entry.get('pool'),
+                                         entry.get('fee', 0))
+                weight = -math.log(rate)
+                if weight < graph[base].get(quote, math.inf):
+                    graph[base][quote] = weight
     return graph
 
 
@@ -0,0 +1,136 @@
+# File: /offchain/bot/cycleindex.py
+
+import math
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.bots.BellmanFord import TokenGraph
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class CycleIndex:
+    def __init__(self, graph: Union[Dict[str, Dict[str, float]], TokenGraph], max_length: int = 4,
+                 anchors: Optional[Iterable[str]] = None):
+        """
+        Precomputes every short cycle of the graph and, for each edge, the cycles that use it.
+        A price tick then only re-scores the cycles through the changed edge, as one vectorized
+        sum of log-weights, instead of running a graph search. Fast path next to BellmanFordArbitrage.
+        :param graph: Weight graph with -log(exchange_rate) weights, or a TokenGraph
+        :param max_length: Longest cycle (in hops) to index
+        :param anchors: Only index cycles through at least one of these tokens (e.g. WETH and
+                        stablecoins); every token is an anchor when omitted
+        """
+        if isinstance(graph, TokenGraph):
+            graph = graph.to_weight_dict()
+
+        self.max_length = max_length
+        self.edge_index: Dict[Tuple[str, str], int] = {}
+        edge_weights: List[float] = []
+        for u in graph:
+            for v, weight in graph[u].items():
+                self.edge_index[(u, v)] = len(edge_weights)
+                edge_weights.append(weight)
+
+        # The trailing zero-weight slot pads cycles shorter than max_length
+        self.pad = len(edge_weights)
+        self.weights = np.asarray(edge_weights + [0.0], dtype=np.float64)
+
+        self.cycles: List[Tuple[str, ...]] = self._enumerate_cycles(graph, anchors)
+        self.cycle_edges = np.full((len(self.cycles), max_length), self.pad, dtype=np.int64)
+        for row, cycle in enumerate(self.cycles):
+            for hop, edge in enumerate(zip(cycle, cycle[1:] + cycle[:1])):
+                self.cycle_edges[row, hop] = self.edge_index[edge]
+
+        # CSR layout of edge -> cycle IDs: cycles of edge e are edge_cycles[edge_offsets[e]:edge_offsets[e + 1]]
+        rows, hops = np.nonzero(self.cycle_edges != self.pad)
+        edges = self.cycle_edges[rows, hops]
+        order = np.argsort(edges, kind='stable')
+        self.edge_cycles = rows[order]
+        self.edge_offsets = np.searchsorted(edges[order], np.arange(self.pad + 1))
+
+        logging.info(f"Indexed {len(self.cycles)} cycles of length <= {max_length} over {self.pad} edges.")
+
+    def _enumerate_cycles(self, graph: Dict[str, Dict[str, float]],
+                          anchors: Optional[Iterable[str]]) -> List[Tuple[str, ...]]:
+        """
+        Lists each simple cycle of length 2..max_length once, starting from its lowest-ranked anchor.
+        """
+        ranked = list(anchors) if anchors is not None else sorted(graph)
+        rank = {token: position for position, token in enumerate(ranked)}
+        cycles = []
+
+        for start in ranked:
+            if start not in graph:
+                continue
+            floor = rank[start]
+            # Depth-first walk over simple paths from start that only visit higher-ranked tokens
+            stack = [(start, [start])]
+            while stack:
+                node, path = stack.pop()
+                for nxt in graph.get(node, {}):
+                    if nxt == start:
+                        if len(path) >= 2:
+                            cycles.append(tuple(path))
+                    elif (len(path) < self.max_length and nxt not in path
+                          and rank.get(nxt, math.inf) > floor):
+                        stack.append((nxt, path + [nxt]))
+        return cycles
+
+    def cycles_for_edge(self, u: str, v: str) -> np.ndarray:
+        """
+        Returns the IDs of every indexed cycle containing the edge u -> v.
+        """
+        edge = self.edge_index.get((u, v))
+        if edge is None:
+            return np.empty(0, dtype=np.int64)
+        return self.edge_cycles[self.edge_offsets[edge]:self.edge_offsets[edge + 1]]
+
+    def update_rate(self, u: str, v: str, rate: float) -> List[Tuple[List[str], float]]:
+        """
+        Applies a price tick and re-scores only the cycles through u -> v.
+        :param u: Token being sold
+        :param v: Token being bought
+        :param rate: New exchange rate
+        :return: Profitable affected cycles as (cycle, product of rates) tuples, best first
+        """
+        return self.update_rates([(u, v, rate)])
+
+    def update_rates(self, updates: Iterable[Tuple[str, str, float]]) -> List[Tuple[List[str], float]]:
+        """
+        Applies a batch of price ticks and re-scores the union of cycles they touch in one pass.
+        Pairs that are not indexed are ignored; rebuild the index when the pair universe changes.
+        :param updates: Iterable of (token_in, token_out, rate)
+        :return: Profitable affected cycles as (cycle, product of rates) tuples, best first
+        """
+        touched = []
+        for u, v, rate in updates:
+            edge = self.edge_index.get((u, v))
+            if edge is None:
+                continue
+            self.weights[edge] = -math.log(rate) if rate > 0 else math.inf
+            touched.append(self.edge_cycles[self.edge_offsets[edge]:self.edge_offsets[edge + 1]])
+
+        if not touched:
+            return []
+        return self._score(np.unique(np.concatenate(touched)))
+
+    def profitable_cycles(self) -> List[Tuple[List[str], float]]:
+        """
+        Scores every indexed cycle at once.
+        :return: Profitable cycles as (cycle, product of rates) tuples, best first
+        """
+        return self._score(np.arange(len(self.cycles)))
+
+    def _score(self, cycle_ids: np.ndarray) -> List[Tuple[List[str], float]]:
+        scores = self.weights[self.cycle_edges[cycle_ids]].sum(axis=1)
+        profitable = scores < 0
+        cycle_ids, scores = cycle_ids[profitable], scores[profitable]
+        order = np.argsort(scores, kind='stable')
+        return [
+            (list(self.cycles[cycle_id]) + [self.cycles[cycle_id][0]], math.exp(-score))
+            for cycle_id, score in zip(cycle_ids[order].tolist(), scores[order].tolist())
+        ]
@@ -0,0 +1,140 @@
+# File: /offchain/bot/cyclesizer.py
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.bots.AMMQuoteEngine import FEE_DENOMINATOR, Q96, V2, AMMQuoteEngine
+from src.bots.BellmanFord import Hop
+from src.utils.Tracing import tracer
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class SizedCycle(NamedTuple):
+    """
+    A candidate cycle with its profit-maximizing input, evaluated along the real swap curves.
+    """
+    route: List[Hop]
+    amount_in: int
+    amount_out: int
+    profit: int
+    net_profit: float
+
+
+class CycleSizer:
+    def __init__(self, engine: AMMQuoteEngine, token_prices: Optional[Dict[str, float]] = None,
+                 gas_cost: float = 0.0, gas_cost_per_hop: float = 0.0,
+                 max_amounts: Optional[Dict[str, int]] = None):
+        """
+        Sizes candidate cycles against pool depth instead of a unit spot price.
+        Every hop is a constant-product curve out = g*x*R_out / (R_in + g*x) (V3 pools use their
+        in-range virtual reserves), and a chain of such curves collapses to one curve
+        A*x / (B + C*x). Its profit A*x / (B + C*x) - x peaks at x* = (sqrt(A*B) - B) / C, so all
+        candidates are solved in closed form at once, then re-quoted exactly with integer math.
+        Any mix of V2 and V3 pools can be sized, but sizing says nothing about executability: the
+        Execute contract swaps every hop through the Uniswap V3 0.3% pool, so only routes made of
+        those pools trade on-chain as sized (see BundleExecutor.executable).
+        :param engine: Quote engine holding the pool state the routes trade through
+        :param token_prices: Value of one raw unit of each start token in a common numeraire
+                             (e.g. wei); 1.0 for tokens not listed
+        :param gas_cost: Fixed execution cost per cycle in the same numeraire
+        :param gas_cost_per_hop: Additional execution cost per hop in the same numeraire
+        :param max_amounts: Cap on the input per start token (balance or flash-loan limit)
+        """
+        self.engine = engine
+        self.token_prices = token_prices or {}
+        self.gas_cost = gas_cost
+        self.gas_cost_per_hop = gas_cost_per_hop
+        self.max_amounts = max_amounts or {}
+
+    def size(self, routes: Sequence[Sequence[Hop]],
+             trace_ids: Optional[Sequence[Optional[int]]] = None) -> List[SizedCycle]:
+        """
+        Computes the optimal input and expected profit of every candidate route in one vectorized pass.
+        :param routes: Candidate cycles as hop lists (e.g. from BellmanFordArbitrage.route_for_cycle)
+        :param trace_ids: Opportunity trace IDs to stamp with the sizing stage
+        :return: Profitable cycles ranked by net profit, best first
+        """
+        if not routes:
+            return []
+        engine = self.engine
+        count = len(routes)
+        length = max(len(route) for route in routes)
+
+        # Hop columns padded to the longest route; padded slots are masked out
+        pools = np.zeros((count, length), dtype=np.int64)
+        forward = np.zeros((count, length), dtype=bool)
+        active = np.zeros((count, length), dtype=bool)
+        for row, route in enumerate(routes):
+            for column, hop in enumerate(route):
+                pool = engine.pool_index[hop.pool]
+                pools[row, column] = pool
+                forward[row, column] = hop.token_in == engine.token0[pool]
+                active[row, column] = True
+
+        reserve_in, reserve_out = self._virtual_reserves(pools, forward)
+        gamma = 1.0 - engine.fee[pools] / FEE_DENOMINATOR
+
+        # Fold the hop curves left to right, renormalizing so B stays 1 and nothing overflows
+        a = np.ones(count)
+        c = np.zeros(count)
+        for column in range(length):
+            hop_a = np.where(active[:, column], gamma[:, column] * reserve_out[:, column], 1.0)
+            hop_b = np.where(active[:, column], reserve_in[:, column], 1.0)
+            hop_c = np.where(active[:, column], gamma[:, column], 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                a, c = a * hop_a / hop_b, (hop_b * c + hop_c * a) / hop_b
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            optimum = np.where((a > 1.0) & (c > 0), (np.sqrt(a) - 1.0) / c, 0.0)
+        optimum = np.nan_to_num(optimum, nan=0.0, posinf=0.0)
+
+        amounts = []
+        for row, route in enumerate(routes):
+            amount = int(optimum[row])
+            cap = self.max_amounts.get(route[0].token_in)
+            amounts.append(min(amount, cap) if cap is not None else amount)
+
+        # Exact integer re-quote, one hop position at a time across every candidate
+        current = np.empty(count, dtype=object)
+        current[:] = amounts
+        for column in range(length):
+            rows = np.flatnonzero(active[:, column] & (np.asarray(amounts, dtype=object) > 0))
+            if rows.size:
+                current[rows] = engine.quote_many(pools[rows, column], forward[rows, column], current[rows])
+
+        sized = []
+        for row, route in enumerate(routes):
+            amount_in = amounts[row]
+            if amount_in <= 0:
+                continue
+            amount_out = int(current[row])
+            profit = amount_out - amount_in
+            net_profit = (profit * self.token_prices.get(route[0].token_in, 1.0)
+                          - self.gas_cost - self.gas_cost_per_hop * len(route))
+            if profit > 0 and net_profit > 0:
+                sized.append(SizedCycle(list(route), amount_in, amount_out, profit, net_profit))
+
+        sized.sort(key=lambda cycle: cycle.net_profit, reverse=True)
+        tracer.mark_many(trace_ids, 'sizing')
+        logging.info(f"Sized {count} candidate cycles, {len(sized)} profitable after fees and gas.")
+        return sized
+
+    def _virtual_reserves(self, pools: np.ndarray, forward: np.ndarray):
+        """
+        Float reserves (input side, output side) per hop; V3 pools use L/sqrtP and L*sqrtP.
+        """
+        engine = self.engine
+        kind = engine.kind[pools]
+        reserve0 = engine.reserve0[pools].astype(np.float64)
+        reserve1 = engine.reserve1[pools].astype(np.float64)
+        sqrt_price = engine.sqrt_price_x96[pools].astype(np.float64) / Q96
+        liquidity = engine.liquidity[pools].astype(np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            virtual0 = np.where(kind == V2, reserve0, liquidity / sqrt_price)
+            virtual1 = np.where(kind == V2, reserve1, liquidity * sqrt_price)
+        return np.where(forward, virtual0, virtual1), np.where(forward, virtual1, virtual0)
@@ -0,0 +1,223 @@
+# File: /offchain/bot/incrementaldetector.py
+
+import math
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.bots.BellmanFord import BellmanFordArbitrage
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+# Distances must improve by more than this to count as a relaxation (guards against float churn)
+EPSILON = 1e-12
+
+
+class IncrementalArbitrageDetector(BellmanFordArbitrage):
+    def __init__(self, graph: Optional[Dict[str, Dict[str, float]]] = None, max_relaxations: int = 1_000_000):
+        """
+        Stateful negative-cycle detector fed by streaming edge updates.
+        Distances are kept relative to a virtual super-source, so every token starts at zero and
+        every cycle is reachable. The predecessor tree is kept acyclic: a relaxation that would
+        close a loop is recorded as an arbitrage cycle instead of applied.
+        :param graph: Optional initial graph with -log(exchange_rate) weights
+        :param max_relaxations: Safety budget of relaxations for a single update
+        """
+        super().__init__({})
+        self.max_relaxations = max_relaxations
+        self.incoming: Dict[str, Set[str]] = {}
+        self.distance: Dict[str, float] = {}
+        self.predecessor: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.cycles: Dict[Tuple[str, ...], float] = {}
+        self.cycles_by_edge: Dict[Tuple[str, str], Set[Tuple[str, ...]]] = {}
+
+        if graph:
+            for u in graph:
+                for v, weight in graph[u].items():
+                    self._set_weight(u, v, weight)
+            self._propagate(deque(self.graph), [])
+
+    def update_edge(self, u: str, v: str, rate: float) -> Tuple[List[List[str]], List[List[str]]]:
+        """
+        Inserts or re-prices the edge u -> v and re-relaxes only the part of the graph it affects.
+        :param u: Token being sold
+        :param v: Token being bought
+        :param rate: New exchange rate (a non-positive rate removes the edge)
+        :return: Tuple of (newly detected cycles, cycles broken by this update)
+        """
+        if rate <= 0:
+            return self.remove_edge(u, v)
+
+        weight = -math.log(rate)
+        old_weight = self.graph.get(u, {}).get(v)
+        self._set_weight(u, v, weight)
+        broken = self._rescore_cycles(u, v)
+        new: List[List[str]] = []
+
+        if old_weight is not None and weight > old_weight and self.predecessor[v] == u:
+            # v's subtree was priced through the old, cheaper edge and is now too optimistic
+            self._invalidate(v, new)
+        elif self._try_relax(u, v, weight, new):
+            self._propagate(deque([v]), new)
+
+        self._log_changes(new, broken)
+        return new, broken
+
+    def remove_edge(self, u: str, v: str) -> Tuple[List[List[str]], List[List[str]]]:
+        """
+        Removes the edge u -> v, repairing the distances of every token priced through it.
+        :param u: Token being sold
+        :param v: Token being bought
+        :return: Tuple of (newly detected cycles, cycles broken by this update)
+        """
+        if v not in self.graph.get(u, {}):
+            return [], []
+
+        del self.graph[u][v]
+        self.incoming[v].discard(u)
+        broken = self._rescore_cycles(u, v)
+        new: List[List[str]] = []
+        if self.predecessor[v] == u:
+            self._invalidate(v, new)
+
+        self._log_changes(new, broken)
+        return new, broken
+
+    def active_cycles(self) -> List[Tuple[List[str], float]]:
+        """
+        Returns the currently open arbitrage cycles.
+        :return: List of (cycle, product of rates along the cycle) tuples, most profitable first
+        """
+        return self.rank_cycles(self.cycles)
+
+    def _add_token(self, token: str) -> None:
+        if token not in self.distance:
+            self.graph.setdefault(token, {})
+            self.incoming[token] = set()
+            self.distance[token] = 0.0
+            self.predecessor[token] = None
+            self.children[token] = set()
+
+    def _set_weight(self, u: str, v: str, weight: float) -> None:
+        self._add_token(u)
+        self._add_token(v)
+        self.graph[u][v] = weight
+        self.incoming[v].add(u)
+
+    def _set_parent(self, v: str, u: Optional[str]) -> None:
+        parent = self.predecessor[v]
+        if parent is not None:
+            self.children[parent].discard(v)
+        if u is not None:
+            self.children[u].add(v)
+        self.predecessor[v] = u
+
+    def _tree_path(self, u: str, v: str) -> Optional[List[str]]:
+        """
+        Returns the predecessor-tree path v -> ... -> u if v is an ancestor of (or equal to) u.
+        """
+        path = [u]
+        current = u
+        while current != v:
+            current = self.predecessor[current]
+            if current is None:
+                return None
+            path.append(current)
+        path.reverse()
+        return path
+
+    def _try_relax(self, u: str, v: str, weight: float, new: List[List[str]]) -> bool:
+        """
+        Relaxes u -> v, recording a cycle instead if the relaxation would close a predecessor loop.
+        :return: True if v's distance improved and its out-edges need relaxing
+        """
+        candidate = self.distance[u] + weight
+        if candidate >= self.distance[v] - EPSILON:
+            return False
+
+        path = self._tree_path(u, v)
+        if path is not None:
+            before = len(self.cycles)
+            self.record_cycle(path, self.cycles)
+            if len(self.cycles) > before:
+                self._index_cycle(path, new)
+            return False
+
+        self._set_parent(v, u)
+        self.distance[v] = candidate
+        return True
+
+    def _propagate(self, queue: Deque[str], new: List[List[str]]) -> None:
+        """
+        Relaxes outward from every queued token until distances settle (queue-based Bellman-Ford).
+        """
+        queued = set(queue)
+        relaxations = 0
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            for v, weight in self.graph[u].items():
+                if self._try_relax(u, v, weight, new) and v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+            relaxations += len(self.graph[u])
+            if relaxations > self.max_relaxations:
+                logging.warning(f"Relaxation budget exhausted with {len(queue)} tokens still queued.")
+                return
+
+    def _invalidate(self, root: str, new: List[List[str]]) -> None:
+        """
+        Resets every token priced through root back to the super-source and re-relaxes them.
+        """
+        subtree = [root]
+        stack = [root]
+        while stack:
+            for child in self.children[stack.pop()]:
+                subtree.append(child)
+                stack.append(child)
+
+        members = set(subtree)
+        for token in subtree:
+            self._set_parent(token, None)
+            self.distance[token] = 0.0
+
+        # The subtree is re-priced from outside first, then by its own internal edges
+        for token in subtree:
+            for u in self.incoming[token]:
+                if u not in members:
+                    self._try_relax(u, token, self.graph[u][token], new)
+        self._propagate(deque(subtree), new)
+
+    def _index_cycle(self, path: List[str], new: List[List[str]]) -> None:
+        pivot = path.index(min(path))
+        key = tuple(path[pivot:] + path[:pivot])
+        for edge in zip(key, key[1:] + key[:1]):
+            self.cycles_by_edge.setdefault(edge, set()).add(key)
+        new.append(list(key) + [key[0]])
+
+    def _rescore_cycles(self, u: str, v: str) -> List[List[str]]:
+        """
+        Re-prices the open cycles that use the edge u -> v and closes those that are no longer negative.
+        """
+        broken = []
+        for key in list(self.cycles_by_edge.get((u, v), ())):
+            edges = list(zip(key, key[1:] + key[:1]))
+            if all(b in self.graph[a] for a, b in edges):
+                weight = sum(self.graph[a][b] for a, b in edges)
+                if weight < 0:
+                    self.cycles[key] = weight
+                    continue
+
+            del self.cycles[key]
+            for edge in edges:
+                self.cycles_by_edge[edge].discard(key)
+            broken.append(list(key) + [key[0]])
+        return broken
+
+    def _log_changes(self, new: List[List[str]], broken: List[List[str]]) -> None:
+        for cycle in new:
+            logging.info(f"Arbitrage cycle opened: {' -> '.join(cycle)}")
+        for cycle in broken:
+            logging.info(f"Arbitrage cycle closed: {' -> '.join(cycle)}")
@@ -1,20 +1,27 @@
 # File: /offchain/bot/liquidityaggregator.py
 
+import asyncio
 import requests
+import aiohttp
 import logging
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Dict, List, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from src.utils.LiquidityCache import LiquidityCache
 
 # Set up logging to track process flow and errors
 logging.basicConfig(level=logging.INFO)
 
 class LiquidityAggregator:
-    def __init__(self, router_urls: List[str]):
+    def __init__(self, router_urls: List[str], cache: Optional['LiquidityCache'] = None):
         """
         Initializes the aggregator with a list of DEX router API endpoints.
 
         :param router_urls: List of base URLs for router APIs (e.g., Uniswap, SushiSwap, etc.)
+        :param cache: Optional liquidity cache shared with other clients
         """
         self.router_urls = router_urls
+        self.cache = cache
 
     def fetch_liquidity_from_router(self, router_url: str, token_1: str, token_2: str) -> Optional[Dict]:
         """
@@ -25,6 +32,14 @@ class LiquidityAggregator:
         :param token_2: Symbol or address of the second token
         :return: Dict with liquidity data or None if request failed
         """
+        if self.cache is not None:
+            return self.cache.get_or_fetch(
+                self.cache.key(router_url, token_1, token_2),
+                lambda: self._request_liquidity(router_url, token_1, token_2)
+            )
+        return self._request_liquidity(router_url, token_1, token_2)
+
+    def _request_liquidity(self, router_url: str, token_1: str, token_2: str) -> Optional[Dict]:
         try:
             response = requests.get(
                 f'{router_url}/liquidity',
@@ -61,6 +76,237 @@ class LiquidityAggregator:
         return aggregated_data
 
 
+class AsyncLiquidityAggregator:
+    def __init__(self, router_urls: List[str], per_router_limit: int = 8, max_connections: int = 100,
+                 request_timeout: float = 5.0, keepalive_timeout: float = 30.0,
+                 cache: Optional['LiquidityCache'] = None, batch_sizes: Optional[Dict[str, int]] = None):
+        """
+        Asynchronous aggregator that fans out to every router concurrently over one shared,
+        keep-alive connection pool. Use as an async context manager so the pool is closed.
+
+        :param router_urls: List of base URLs for router APIs (e.g., Uniswap, SushiSwap, etc.)
+        :param per_router_limit: Maximum in-flight requests per router
+        :param max_connections: Size of the shared connection pool
+        :param request_timeout: Timeout for a single router request, in seconds
+        :param keepalive_timeout: How long idle connections are kept warm, in seconds
+        :param cache: Optional liquidity cache shared with other clients
+        :param batch_sizes: Routers exposing a POST /liquidity/batch endpoint, mapped to the
+                            maximum number of pairs per batch request
+        """
+        self.router_urls = router_urls
+        self.batch_sizes = batch_sizes or {}
+        self.per_router_limit = per_router_limit
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.cache = cache
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncLiquidityAggregator':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Opens the shared connection pool (called implicitly on first use).
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+
+    async def close(self) -> None:
+        """
+        Closes the shared connection pool.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _limit(self, router_url: str) -> asyncio.Semaphore:
+        limit = self._limits.get(router_url)
+        if limit is None:
+            limit = self._limits[router_url] = asyncio.Semaphore(self.per_router_limit)
+        return limit
+
+    async def fetch_liquidity_from_router(self, router_url: str, token_1: str, token_2: str) -> Optional[Dict]:
+        """
+        Fetch liquidity info for a token pair from a single router API.
+
+        :param router_url: Base URL for the router's API
+        :param token_1: Symbol or address of the first token
+        :param token_2: Symbol or address of the second token
+        :return: Dict with liquidity data or None if request failed
+        """
+        if self.cache is not None:
+            return await self.cache.get_or_fetch_async(
+                self.cache.key(router_url, token_1, token_2),
+                lambda: self._request_liquidity(router_url, token_1, token_2)
+            )
+        return await self._request_liquidity(router_url, token_1, token_2)
+
+    async def _request_liquidity(self, router_url: str, token_1: str, token_2: str) -> Optional[Dict]:
+        await self.start()
+        try:
+            async with self._limit(router_url):
+                async with self.session.get(
+                    f'{router_url}/liquidity',
+                    params={'token_1': token_1, 'token_2': token_2}
+                ) as response:
+                    if response.status == 200:
+                        logging.info(f"Liquidity fetched from {router_url} for {token_1}/{token_2}")
+                        return await response.json()
+                    logging.warning(f"Non-200 response from {router_url}: {response.status}")
+                    return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Exception when querying {router_url}: {str(e)}")
+            return None
+
+    async def aggregate_liquidity(self, token_1: str, token_2: str, deadline: Optional[float] = None) -> Dict:
+        """
+        Aggregates liquidity data from all known router URLs for a given token pair, concurrently.
+
+        :param token_1: First token (symbol or address)
+        :param token_2: Second token (symbol or address)
+        :param deadline: Overall time budget in seconds; routers that have not answered by then are dropped
+        :return: Aggregated liquidity dictionary keyed by router URL
+        """
+        results = await self.aggregate_liquidity_pairs([(token_1, token_2)], deadline)
+        aggregated_data = results.get((token_1, token_2), {})
+        if not aggregated_data:
+            logging.error(f"No liquidity data found for {token_1}/{token_2} across all routers.")
+        return aggregated_data
+
+    async def aggregate_liquidity_pairs(self, pairs: Iterable[Tuple[str, str]],
+                                        deadline: Optional[float] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Queries every router for every pair concurrently.
+
+        :param pairs: Token pairs to query
+        :param deadline: Overall time budget in seconds; whatever has arrived by then is returned
+        :return: Mapping of pair to liquidity data keyed by router URL (partial if the deadline passed)
+        """
+        await self.start()
+        tasks = {}
+        for token_1, token_2 in pairs:
+            for router_url in self.router_urls:
+                task = asyncio.ensure_future(self.fetch_liquidity_from_router(router_url, token_1, token_2))
+                tasks[task] = (router_url, (token_1, token_2))
+        if not tasks:
+            return {}
+
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logging.warning(f"Deadline passed with {len(pending)} of {len(tasks)} router requests outstanding.")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        aggregated_data: Dict[Tuple[str, str], Dict] = {}
+        for task in done:
+            data = task.result()
+            if data:
+                router_url, pair = tasks[task]
+                aggregated_data.setdefault(pair, {})[router_url] = data
+        return aggregated_data
+
+    async def aggregate_liquidity_many(self, pairs: Iterable[Tuple[str, str]],
+                                       deadline: Optional[float] = None
+                                       ) -> AsyncIterator[Tuple[str, Dict[Tuple[str, str], Dict]]]:
+        """
+        Fetches liquidity for many pairs, streaming results back as each request completes so the
+        caller can start building the graph before the slowest router answers. Pairs are grouped
+        into batch requests for routers listed in batch_sizes; other routers get concurrent single
+        requests.
+
+        :param pairs: Token pairs to query
+        :param deadline: Overall time budget in seconds; outstanding requests are cancelled when it passes
+        :return: Async iterator of (router URL, {pair: liquidity data}) for each completed request
+        """
+        await self.start()
+        pairs = list(dict.fromkeys(pairs))
+        cached = []
+        tasks = []
+        for router_url in self.router_urls:
+            batch_size = self.batch_sizes.get(router_url)
+            if not batch_size:
+                tasks.extend(asyncio.ensure_future(self._fetch_single(router_url, pair)) for pair in pairs)
+                continue
+
+            missing = pairs
+            if self.cache is not None:
+                hits, missing = {}, []
+                for pair in pairs:
+                    data = self.cache.get(self.cache.key(router_url, *pair))
+                    if data is None:
+                        missing.append(pair)
+                    else:
+                        hits[pair] = data
+                if hits:
+                    cached.append((router_url, hits))
+            tasks.extend(
+                asyncio.ensure_future(self._fetch_batch(router_url, missing[i:i + batch_size]))
+                for i in range(0, len(missing), batch_size)
+            )
+
+        try:
+            for hit in cached:
+                yield hit
+            for next_done in asyncio.as_completed(tasks, timeout=deadline):
+                router_url, results = await next_done
+                if results:
+                    yield router_url, results
+        except asyncio.TimeoutError:
+            outstanding = sum(not task.done() for task in tasks)
+            logging.warning(f"Deadline passed with {outstanding} of {len(tasks)} liquidity requests outstanding.")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_single(self, router_url: str, pair: Tuple[str, str]) -> Tuple[str, Dict[Tuple[str, str], Dict]]:
+        data = await self.fetch_liquidity_from_router(router_url, *pair)
+        return router_url, ({pair: data} if data else {})
+
+    async def _fetch_batch(self, router_url: str,
+                           pairs: List[Tuple[str, str]]) -> Tuple[str, Dict[Tuple[str, str], Dict]]:
+        """
+        Fetches a chunk of pairs with one batch request, falling back to single requests if it fails.
+        The batch endpoint answers {'results': [...]} in request order, null for unknown pairs.
+        """
+        body = {'pairs': [{'token_1': token_1, 'token_2': token_2} for token_1, token_2 in pairs]}
+        try:
+            async with self._limit(router_url):
+                async with self.session.post(f'{router_url}/liquidity/batch', json=body) as response:
+                    if response.status == 200:
+                        payload = await response.json()
+                        logging.info(f"Liquidity fetched from {router_url} for {len(pairs)} pairs")
+                        results = {pair: data for pair, data in zip(pairs, payload['results']) if data}
+                        if self.cache is not None:
+                            for pair, data in results.items():
+                                self.cache.put(self.cache.key(router_url, *pair), data)
+                        return router_url, results
+                    logging.warning(f"Non-200 batch response from {router_url}: {response.status}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Exception when batch-querying {router_url}: {str(e)}")
+
+        singles = await asyncio.gather(*[self._fetch_single(router_url, pair) for pair in pairs])
+        results = {}
+        for _, found in singles:
+            results.update(found)
+        return router_url, results
+
+
 # Example usage block (can be removed/commented in production)
 if __name__ == "__main__":
     # List of DEX router APIs (these must be real endpoints or mocked/test APIs)
@@ -0,0 +1,207 @@
+# File: /offchain/bot/parallelarbitrage.py
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Type, Union
+
+from src.bots.BellmanFord import BellmanFordArbitrage, TokenGraph, VectorizedBellmanFordArbitrage
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+def strongly_connected_components(graph: Dict[str, Dict[str, float]]) -> List[List[str]]:
+    """
+    Splits a token graph into strongly connected components (iterative Tarjan, no recursion limit).
+    :param graph: Weight graph keyed by token
+    :return: List of components, each a list of tokens
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    nodes = set(graph)
+    for u in graph:
+        nodes.update(graph[u])
+
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(graph.get(root, ())))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, neighbours = work[-1]
+            advanced = False
+            for nxt in neighbours:
+                if nxt not in index:
+                    index[nxt] = lowlink[nxt] = len(index)
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(graph.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    lowlink[node] = min(lowlink[node], index[nxt])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _search_component(engine: Type[BellmanFordArbitrage],
+                      subgraph: Dict[str, Dict[str, float]]) -> List[Tuple[List[str], float]]:
+    """
+    Runs a single-run all-cycles search on one component.
+    """
+    return engine(subgraph).find_all_arbitrage()
+
+
+def _search_components(engine: Type[BellmanFordArbitrage],
+                       subgraphs: List[Dict[str, Dict[str, float]]]) -> List[Tuple[List[str], float]]:
+    """
+    Worker entry point: searches a batch of components one after another.
+    """
+    results: List[Tuple[List[str], float]] = []
+    for subgraph in subgraphs:
+        results.extend(_search_component(engine, subgraph))
+    return results
+
+
+class ParallelBellmanFordArbitrage(BellmanFordArbitrage):
+    def __init__(self, graph: Union[Dict[str, Dict[str, float]], TokenGraph], max_workers: Optional[int] = None,
+                 engine: Type[BellmanFordArbitrage] = VectorizedBellmanFordArbitrage, min_parallel_edges: int = 500):
+        """
+        Searches strongly connected components of the token graph in parallel with a process pool.
+        Arbitrage cycles cannot cross components, so components that are single tokens without a
+        self-loop are skipped and the rest are searched independently.
+        :param graph: Weight graph with -log(exchange_rate) weights, or a TokenGraph
+        :param max_workers: Worker processes (defaults to every core)
+        :param engine: Detector class run on each component
+        :param min_parallel_edges: Smallest unit of work shipped to a worker: larger components are
+                                   a task each and smaller ones are packed into batches of at
+                                   least this many edges. A graph with fewer edges in total is
+                                   searched in-process, as shipping it costs more than searching it
+        """
+        super().__init__(graph)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine = engine
+        self.min_parallel_edges = min_parallel_edges
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.components = []
+        self.component_of: Dict[str, int] = {}
+        for component in strongly_connected_components(self.graph):
+            members = set(component)
+            subgraph = {u: {v: w for v, w in self.graph.get(u, {}).items() if v in members} for u in component}
+            if len(component) == 1 and component[0] not in subgraph[component[0]]:
+                continue
+            for token in component:
+                self.component_of[token] = len(self.components)
+            self.components.append(subgraph)
+
+        logging.info(f"Graph split into {len(self.components)} components that can hold cycles.")
+
+    def find_all_arbitrage(self) -> List[Tuple[List[str], float]]:
+        """
+        Detects every distinct negative cycle, one component per worker.
+        :return: List of (cycle, product of rates along the cycle) tuples, most profitable first
+        """
+        return self._search(range(len(self.components)))
+
+    def find_arbitrage(self, start_token: str) -> Optional[List[str]]:
+        """
+        Searches every component reachable from the start token and returns the most profitable cycle.
+        :param start_token: The token to start traversing from
+        :return: A list representing arbitrage cycle if found, else None
+        """
+        reachable = {start_token}
+        frontier = [start_token]
+        while frontier:
+            for nxt in self.graph.get(frontier.pop(), {}):
+                if nxt not in reachable:
+                    reachable.add(nxt)
+                    frontier.append(nxt)
+
+        component_ids = {self.component_of[token] for token in reachable if token in self.component_of}
+        found = self._search(sorted(component_ids))
+        if not found:
+            logging.info("No arbitrage cycle found.")
+            return None
+        logging.info("Arbitrage opportunity detected!")
+        return found[0][0]
+
+    def _search(self, component_ids) -> List[Tuple[List[str], float]]:
+        sized = []
+        for component_id in component_ids:
+            subgraph = self.components[component_id]
+            sized.append((sum(len(edges) for edges in subgraph.values()), subgraph))
+        # Largest components first so the long pole starts immediately
+        sized.sort(key=lambda item: item[0], reverse=True)
+
+        # One task per large component; small ones (typically many, next to one giant component)
+        # are spread over the remaining workers in batches instead of running serially in-process
+        small_edges = sum(edges for edges, _ in sized if edges < self.min_parallel_edges)
+        batch_budget = max(self.min_parallel_edges, small_edges // self.max_workers, 1)
+        tasks: List[List[Dict[str, Dict[str, float]]]] = []
+        batch: List[Dict[str, Dict[str, float]]] = []
+        batch_edges = 0
+        for edges, subgraph in sized:
+            if edges >= self.min_parallel_edges:
+                tasks.append([subgraph])
+                continue
+            batch.append(subgraph)
+            batch_edges += edges
+            if batch_edges >= batch_budget:
+                tasks.append(batch)
+                batch, batch_edges = [], 0
+        if batch:
+            tasks.append(batch)
+
+        results: List[Tuple[List[str], float]] = []
+        if len(tasks) > 1 and self.max_workers > 1:
+            for found in self._pool().map(_search_components, [self.engine] * len(tasks), tasks):
+                results.extend(found)
+        else:
+            for subgraphs in tasks:
+                results.extend(_search_components(self.engine, subgraphs))
+
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ParallelBellmanFordArbitrage':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
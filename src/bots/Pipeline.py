@@ -0,0 +1,278 @@
+# File: /offchain/bot/pipeline.py
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.bots.BellmanFord import Hop, TokenGraph
+from src.bots.IncrementalDetector import IncrementalArbitrageDetector
+from src.utils.MarketRecorder import MarketRecorder
+from src.utils.Tracing import tracer
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class EdgeUpdate(NamedTuple):
+    """
+    A fresh quote for one pool: token_in -> token_out at rate.
+    """
+    token_in: str
+    token_out: str
+    rate: float
+    venue: str = ''
+    pool: Optional[str] = None
+    fee: int = 0
+    block: Optional[int] = None
+    trace_id: Optional[int] = None
+    liquidity: float = 0.0
+
+
+class Opportunity(NamedTuple):
+    """
+    A newly opened arbitrage cycle, ready for sizing and execution.
+    """
+    cycle: List[str]
+    rate_product: float
+    route: List[Hop]
+    block: Optional[int]
+    detected_at: float
+    trace_id: Optional[int] = None
+
+
+class CoalescingQueue:
+    """
+    Bounded asyncio queue keyed by token pair. A put for a pair that is still waiting replaces the
+    queued value instead of adding another entry, so when the consumer falls behind it only sees the
+    latest rate for each pair. Puts of new pairs block while the queue is full (backpressure).
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.merged = 0
+        self._items: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._changed = asyncio.Condition()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, key: Hashable, item: Any) -> None:
+        async with self._changed:
+            if key in self._items:
+                self._items[key] = item
+                self.merged += 1
+                return
+            await self._changed.wait_for(lambda: len(self._items) < self.maxsize)
+            self._items[key] = item
+            self._changed.notify_all()
+
+    async def get(self) -> Any:
+        async with self._changed:
+            await self._changed.wait_for(lambda: bool(self._items))
+            _, item = self._items.popitem(last=False)
+            self._changed.notify_all()
+            return item
+
+
+class LiquidityFeed:
+    def __init__(self, aggregator, pairs: Iterable[Tuple[str, str]], interval: float = 1.0,
+                 to_rate: Optional[Callable[[Dict], Optional[float]]] = None):
+        """
+        Feed adapter that polls a LiquidityAggregator (sync or async) and emits one EdgeUpdate per
+        router quote. Async aggregators stream results as they arrive via aggregate_liquidity_many.
+        :param aggregator: LiquidityAggregator or AsyncLiquidityAggregator
+        :param pairs: Token pairs to poll, as (token_in, token_out)
+        :param interval: Seconds between polling rounds
+        :param to_rate: Extracts the exchange rate from a router response (default: 'rate' or 'price' field)
+        """
+        self.aggregator = aggregator
+        self.pairs = list(pairs)
+        self.interval = interval
+        self.to_rate = to_rate or (lambda data: data.get('rate', data.get('price')))
+
+    async def run(self, emit: Callable[[EdgeUpdate], Awaitable[None]]) -> None:
+        while True:
+            try:
+                if hasattr(self.aggregator, 'aggregate_liquidity_many'):
+                    async for router_url, results in self.aggregator.aggregate_liquidity_many(self.pairs):
+                        for pair, data in results.items():
+                            await self._emit(emit, router_url, pair, data)
+                else:
+                    for pair in self.pairs:
+                        results = await asyncio.to_thread(self.aggregator.aggregate_liquidity, *pair)
+                        for router_url, data in results.items():
+                            await self._emit(emit, router_url, pair, data)
+            except Exception as e:
+                logging.error(f"Liquidity polling round failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def _emit(self, emit, router_url: str, pair: Tuple[str, str], data: Dict) -> None:
+        try:
+            rate = float(self.to_rate(data) or 0.0)
+            fee, liquidity = int(data.get('fee', 0)), float(data.get('liquidity', 0.0))
+        except Exception as e:
+            logging.error(f"Malformed quote for {pair[0]}/{pair[1]} from {router_url}: {str(e)}")
+            return
+        if not (rate > 0 and math.isfinite(rate)):
+            if rate:
+                logging.warning(f"Dropped invalid rate {rate} for {pair[0]}/{pair[1]} from {router_url}")
+            return
+        await emit(EdgeUpdate(pair[0], pair[1], rate, venue=router_url, pool=data.get('pool'), fee=fee,
+                              block=data.get('block'), trace_id=tracer.start(), liquidity=liquidity))
+
+
+class UniswapFeed:
+    def __init__(self, connector, pairs: Iterable[Tuple[str, str]], interval: float = 1.0,
+                 amount_in: int = 10**18, venue: str = 'uniswap'):
+        """
+        Feed adapter that polls UniswapConnector.get_price (a blocking RPC call, run off the event loop).
+        :param connector: UniswapConnector instance
+        :param pairs: Token pairs to poll, as (token_in, token_out)
+        :param interval: Seconds between polling rounds
+        :param amount_in: Input amount get_price quotes for; the rate is amount_out / amount_in
+        :param venue: Venue label attached to the emitted edges
+        """
+        self.connector = connector
+        self.pairs = list(pairs)
+        self.interval = interval
+        self.amount_in = amount_in
+        self.venue = venue
+
+    async def run(self, emit: Callable[[EdgeUpdate], Awaitable[None]]) -> None:
+        while True:
+            for token_in, token_out in self.pairs:
+                try:
+                    amount_out = await asyncio.to_thread(self.connector.get_price, token_in, token_out)
+                except Exception as e:
+                    logging.error(f"Exception when pricing {token_in}/{token_out} on {self.venue}: {str(e)}")
+                    continue
+                if amount_out and amount_out > 0:
+                    await emit(EdgeUpdate(token_in, token_out, amount_out / self.amount_in, venue=self.venue,
+                                          trace_id=tracer.start()))
+            await asyncio.sleep(self.interval)
+
+
+class ArbitragePipeline:
+    def __init__(self, feeds: List[Any], sink: Callable[[Opportunity], Optional[Awaitable[None]]],
+                 detector: Optional[IncrementalArbitrageDetector] = None, token_graph: Optional[TokenGraph] = None,
+                 queue_size: int = 1024, recorder: Optional[MarketRecorder] = None):
+        """
+        Streaming price-feed -> graph -> detector pipeline. Each stage runs as its own task and
+        stages are linked by bounded queues, so a slow stage applies backpressure upstream. Updates
+        for the same pair are merged while they wait for the detector.
+        :param feeds: Feed adapters exposing `async run(emit)`
+        :param sink: Callback receiving each Opportunity (may be a coroutine function)
+        :param detector: Incremental detector to feed (a fresh one by default)
+        :param token_graph: Multi-venue graph receiving every quote (a fresh one by default)
+        :param queue_size: Capacity of each inter-stage queue
+        :param recorder: Market recorder receiving every raw quote, for offline replay
+        """
+        self.feeds = feeds
+        self.sink = sink
+        self.detector = detector or IncrementalArbitrageDetector()
+        self.token_graph = token_graph or TokenGraph()
+        self.recorder = recorder
+        self.last_block = 0
+
+        self.raw_updates: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.edge_updates = CoalescingQueue(maxsize=queue_size)
+        self.opportunities: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        self.counters = {'quotes': 0, 'edges': 0, 'opportunities': 0, 'errors': 0}
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Launches every feed and stage as background tasks.
+        """
+        self._tasks = [asyncio.ensure_future(feed.run(self.raw_updates.put)) for feed in self.feeds]
+        self._tasks += [
+            asyncio.ensure_future(self._edge_stage()),
+            asyncio.ensure_future(self._detector_stage()),
+            asyncio.ensure_future(self._sink_stage()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    async def __aenter__(self) -> 'ArbitragePipeline':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Per-stage queue depths and throughput counters.
+        """
+        return {
+            'raw_depth': self.raw_updates.qsize(),
+            'edge_depth': self.edge_updates.qsize(),
+            'opportunity_depth': self.opportunities.qsize(),
+            'merged': self.edge_updates.merged,
+            **self.counters,
+        }
+
+    async def _edge_stage(self) -> None:
+        """
+        Applies raw quotes to the multi-venue graph and forwards the best rate per pair.
+        """
+        while True:
+            update: EdgeUpdate = await self.raw_updates.get()
+            self.counters['quotes'] += 1
+            try:
+                # Quotes without a block number, or from a feed lagging behind, are filed under the
+                # latest block seen so the recorded tape stays in block order
+                if update.block is not None:
+                    self.last_block = max(self.last_block, update.block)
+                if self.recorder is not None:
+                    self.recorder.record_update(update, self.last_block)
+                self.token_graph.add_edge(update.token_in, update.token_out, update.rate, update.venue,
+                                          update.pool, update.fee)
+                best = self.token_graph.best_edge(update.token_in, update.token_out)
+                rate = math.exp(-self.token_graph.weight[best])
+                tracer.mark(update.trace_id, 'graph_update')
+                # A merged update keeps only the newest quote's trace
+                await self.edge_updates.put((update.token_in, update.token_out),
+                                            (update.token_in, update.token_out, rate, update.block, update.trace_id))
+            except Exception as e:
+                self.counters['errors'] += 1
+                logging.error(f"Dropped quote {update.token_in}/{update.token_out} from {update.venue}: {str(e)}")
+
+    async def _detector_stage(self) -> None:
+        while True:
+            token_in, token_out, rate, block, trace_id = await self.edge_updates.get()
+            self.counters['edges'] += 1
+            try:
+                new, _ = self.detector.update_edge(token_in, token_out, rate)
+                tracer.mark(trace_id, 'detection')
+                for i, cycle in enumerate(new):
+                    weight = sum(self.detector.graph[u][v] for u, v in zip(cycle, cycle[1:]))
+                    opportunity = Opportunity(cycle, math.exp(-weight), self.token_graph.route(cycle), block,
+                                              time.time(), trace_id if i == 0 else tracer.fork(trace_id))
+                    await self.opportunities.put(opportunity)
+            except Exception as e:
+                self.counters['errors'] += 1
+                logging.error(f"Detection failed for {token_in}/{token_out}: {str(e)}")
+            # Yield so the edge stage can merge the backlog while detection is busy
+            await asyncio.sleep(0)
+
+    async def _sink_stage(self) -> None:
+        while True:
+            opportunity = await self.opportunities.get()
+            self.counters['opportunities'] += 1
+            try:
+                result = self.sink(opportunity)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logging.error(f"Opportunity sink failed: {str(e)}")
@@ -0,0 +1,145 @@
+# File: /offchain/bot/replayengine.py
+
+import logging
+import math
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from src.bots.BellmanFord import BellmanFordArbitrage, TokenGraph
+from src.bots.IncrementalDetector import IncrementalArbitrageDetector
+from src.utils.MarketRecorder import MarketTape
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class ReplayOpportunity(NamedTuple):
+    block: int
+    cycle: List[str]
+    rate_product: float
+    min_liquidity: float
+
+
+class ReplayReport(NamedTuple):
+    variant: str
+    blocks: int
+    updates: int
+    opportunities: List[ReplayOpportunity]
+    elapsed: float
+
+    @property
+    def updates_per_second(self) -> float:
+        return self.updates / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class FullRecompute:
+    def __init__(self, engine: Type[BellmanFordArbitrage] = BellmanFordArbitrage, start_token: Optional[str] = None):
+        """
+        Detector variant that runs a search engine over the whole graph after every block that
+        changed it: find_arbitrage from start_token, or find_all_arbitrage without one.
+        """
+        self.engine = engine
+        self.start_token = start_token
+
+    def __call__(self, graph: Dict[str, Dict[str, float]], changed: Sequence[Tuple[str, str]]) -> List[List[str]]:
+        if self.start_token is not None:
+            if self.start_token not in graph:
+                return []
+            cycle = self.engine(graph).find_arbitrage(self.start_token)
+            return [cycle] if cycle else []
+        return [cycle for cycle, _ in self.engine(graph).find_all_arbitrage()]
+
+
+class IncrementalReplay:
+    def __init__(self):
+        """
+        Detector variant that feeds only the changed pairs to an IncrementalArbitrageDetector and
+        reports the cycles each block opens.
+        """
+        self.detector = IncrementalArbitrageDetector()
+
+    def __call__(self, graph: Dict[str, Dict[str, float]], changed: Sequence[Tuple[str, str]]) -> List[List[str]]:
+        opened = []
+        for u, v in changed:
+            new, _ = self.detector.update_edge(u, v, math.exp(-graph[u][v]))
+            opened.extend(new)
+        return opened
+
+
+class ReplayEngine:
+    def __init__(self, tape: MarketTape):
+        """
+        Replays a recorded market tape block by block through the graph builder and a detector
+        variant, without RPC. Each block's rows are applied to a TokenGraph (best edge per pair
+        across pools), the weight graph is patched for the pairs that changed, and the detector runs once.
+        :param tape: Memory-mapped tape from MarketRecorder
+        """
+        self.tape = tape
+
+    def replay(self, detector: Callable, variant: str = '', start_block: Optional[int] = None,
+               end_block: Optional[int] = None, quiet: bool = True) -> ReplayReport:
+        """
+        Runs one detector variant over the tape.
+        :param detector: Callable (graph, changed pairs) -> closed cycles, e.g. FullRecompute or IncrementalReplay
+        :param variant: Label for the report
+        :param quiet: Silence per-search INFO logging while replaying
+        :return: Opportunities found per block plus replay throughput
+        """
+        tape = self.tape
+        tokens, pools, venues = tape.tokens, tape.pools, tape.venues
+        token_in, token_out = tape['token_in'], tape['token_out']
+        pool, venue, fee = tape['pool'], tape['venue'], tape['fee']
+        rate, liquidity = tape['rate'], tape['liquidity']
+
+        token_graph = TokenGraph()
+        graph: Dict[str, Dict[str, float]] = {}
+        edge_liquidity: Dict[int, float] = {}
+        opportunities: List[ReplayOpportunity] = []
+        blocks = updates = 0
+
+        previous_disable = logging.root.manager.disable
+        if quiet:
+            logging.disable(logging.INFO)
+        started = time.perf_counter()
+        try:
+            for block, first, end in tape.block_slices(start_block, end_block):
+                blocks += 1
+                updates += end - first
+                changed = {}
+                rows = zip(token_in[first:end].tolist(), token_out[first:end].tolist(), pool[first:end].tolist(),
+                           venue[first:end].tolist(), fee[first:end].tolist(), rate[first:end].tolist(),
+                           liquidity[first:end].tolist())
+                for u_id, v_id, pool_id, venue_id, pool_fee, pool_rate, pool_liquidity in rows:
+                    if pool_rate <= 0:
+                        continue
+                    u, v = tokens[u_id], tokens[v_id]
+                    edge = token_graph.add_edge(u, v, pool_rate, venues[venue_id], pools[pool_id] or None, pool_fee)
+                    edge_liquidity[edge] = pool_liquidity
+                    changed[(u, v)] = None
+
+                for u, v in changed:
+                    best = token_graph.best_edge(u, v)
+                    graph.setdefault(u, {})[v] = token_graph.weight[best]
+                    graph.setdefault(v, {})
+
+                for cycle in detector(graph, list(changed)):
+                    hops = list(zip(cycle, cycle[1:]))
+                    weight = sum(graph[u][v] for u, v in hops)
+                    depth = min(edge_liquidity.get(token_graph.best_edge(u, v), 0.0) for u, v in hops)
+                    opportunities.append(ReplayOpportunity(block, cycle, math.exp(-weight), depth))
+        finally:
+            logging.disable(previous_disable)
+
+        report = ReplayReport(variant, blocks, updates, opportunities, time.perf_counter() - started)
+        logging.info(f"Replayed {blocks} blocks ({updates} updates) with {variant or 'detector'} in "
+                     f"{report.elapsed:.2f}s: {len(opportunities)} opportunities")
+        return report
+
+    def compare(self, variants: Dict[str, Callable[[], Callable]], start_block: Optional[int] = None,
+                end_block: Optional[int] = None) -> Dict[str, ReplayReport]:
+        """
+        Replays the same blocks through several detector variants.
+        :param variants: Variant name -> factory returning a fresh detector
+        :return: Report per variant
+        """
+        return {name: self.replay(factory(), name, start_block, end_block) for name, factory in variants.items()}
@@ -0,0 +1,342 @@
+# File: /offchain/bot/scheduler.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.bots.AMMQuoteEngine import V3
+from src.bots.BellmanFord import Hop
+from src.bots.Pipeline import Opportunity
+from src.utils.TransactionFactory import EXECUTE_POOL_FEE
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class ScheduledOpportunity(NamedTuple):
+    """
+    An opportunity waiting for (or in) execution, with the block its bundle must land in.
+    """
+    opportunity: Opportunity
+    expected_profit: float
+    target_block: Optional[int]
+    pools: FrozenSet[Hashable]
+    scheduled_at: float
+
+
+def route_pools(route: Sequence[Hop]) -> FrozenSet[Hashable]:
+    """
+    Pools a route trades through. Hops without a pool address are keyed by venue and token pair.
+    """
+    return frozenset(hop.pool or (hop.venue,) + tuple(sorted((hop.token_in, hop.token_out))) for hop in route)
+
+
+def default_estimate(opportunity: Opportunity) -> float:
+    return opportunity.rate_product - 1.0
+
+
+class OpportunityScheduler:
+    def __init__(self, handler: Callable[[ScheduledOpportunity], Awaitable[Any]],
+                 estimate: Optional[Callable[[Opportunity], float]] = None, workers: int = 4,
+                 max_pending: int = 256, blocks_ahead: int = 1, max_age: Optional[float] = 12.0,
+                 current_block: Optional[int] = None):
+        """
+        Deadline-aware priority queue between detection and execution. Opportunities wait in a
+        heap ordered by expected net profit and a fixed number of workers executes the best one
+        first. Opportunities that trade through a pool already queued are merged: a fresher copy
+        of the same cycle replaces the old one, and of overlapping cycles only the more profitable
+        is kept, since they compete for the same liquidity. Each opportunity targets the block
+        after the latest one seen and is dropped, even mid-execution, once that block has passed.
+        :param handler: Coroutine function executing one ScheduledOpportunity (sizing, signing and
+                        submission), e.g. a BundleExecutor
+        :param estimate: Expected net profit of an opportunity; non-positive ones are dropped
+                         (default: rate product - 1, i.e. profit per unit traded)
+        :param workers: Opportunities executed concurrently
+        :param max_pending: Queue capacity; when full the least profitable opportunity is evicted
+        :param blocks_ahead: Target block = latest block seen + blocks_ahead
+        :param max_age: Seconds an opportunity may wait before it is dropped (None: no limit)
+        :param current_block: Latest block known at start (opportunity blocks advance it)
+        """
+        self.handler = handler
+        self.estimate = estimate or default_estimate
+        self.workers = workers
+        self.max_pending = max_pending
+        self.blocks_ahead = blocks_ahead
+        self.max_age = max_age
+        self.current_block = current_block
+
+        # Max-heap by expected profit with lazy deletion: entries whose sequence number is no
+        # longer pending are skipped when popped
+        self._heap: List[Tuple[float, int]] = []
+        self._pending: Dict[int, ScheduledOpportunity] = {}
+        self._by_pool: Dict[Hashable, int] = {}
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self._running: Dict[asyncio.Task, ScheduledOpportunity] = {}
+        self._tasks: List[asyncio.Task] = []
+
+        self.counters = {'scheduled': 0, 'merged': 0, 'evicted': 0, 'unprofitable': 0, 'expired': 0,
+                         'executed': 0, 'failed': 0}
+
+    async def start(self) -> None:
+        """
+        Launches the worker pool.
+        """
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> 'OpportunityScheduler':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        return {'pending': len(self._pending), 'running': len(self._running), **self.counters}
+
+    def schedule(self, opportunity: Opportunity) -> bool:
+        """
+        Queues an opportunity (usable directly as an ArbitragePipeline or ArbitrageBot sink).
+        :return: True if it was queued, False if it was dropped or lost to a queued rival
+        """
+        if opportunity.block is not None:
+            self.set_block(opportunity.block)
+        expected_profit = self.estimate(opportunity)
+        if expected_profit <= 0:
+            self.counters['unprofitable'] += 1
+            return False
+
+        pools = route_pools(opportunity.route)
+        rivals = {self._by_pool[pool] for pool in pools if pool in self._by_pool}
+        for sequence in list(rivals):
+            if self._pending[sequence].pools == pools:
+                # Same cycle through the same pools: the fresher quote wins
+                self._remove(sequence)
+                rivals.discard(sequence)
+                self.counters['merged'] += 1
+        if rivals:
+            if max(self._pending[sequence].expected_profit for sequence in rivals) >= expected_profit:
+                self.counters['merged'] += 1
+                return False
+            for sequence in rivals:
+                self._remove(sequence)
+                self.counters['merged'] += 1
+
+        if len(self._pending) >= self.max_pending:
+            worst = min(self._pending, key=lambda sequence: self._pending[sequence].expected_profit)
+            self.counters['evicted'] += 1
+            if self._pending[worst].expected_profit >= expected_profit:
+                return False
+            self._remove(worst)
+
+        target_block = self.current_block + self.blocks_ahead if self.current_block is not None else None
+        sequence = next(self._sequence)
+        self._pending[sequence] = ScheduledOpportunity(opportunity, expected_profit, target_block, pools,
+                                                       time.monotonic())
+        for pool in pools:
+            self._by_pool[pool] = sequence
+        heapq.heappush(self._heap, (-expected_profit, sequence))
+        self.counters['scheduled'] += 1
+        self._ready.set()
+        return True
+
+    def set_block(self, block: int) -> None:
+        """
+        Advances the chain head. Queued and running opportunities whose target block is no
+        longer in the future are dropped.
+        """
+        if self.current_block is not None and block <= self.current_block:
+            return
+        self.current_block = block
+        for sequence in [sequence for sequence, item in self._pending.items() if self._expired(item)]:
+            self._remove(sequence)
+            self.counters['expired'] += 1
+        for task, item in list(self._running.items()):
+            if self._expired(item):
+                task.cancel()
+
+    def _expired(self, item: ScheduledOpportunity) -> bool:
+        if item.target_block is not None and self.current_block >= item.target_block:
+            return True
+        return self.max_age is not None and time.monotonic() - item.scheduled_at > self.max_age
+
+    def _remove(self, sequence: int) -> ScheduledOpportunity:
+        item = self._pending.pop(sequence)
+        for pool in item.pools:
+            if self._by_pool.get(pool) == sequence:
+                del self._by_pool[pool]
+        return item
+
+    def _pop(self) -> Optional[ScheduledOpportunity]:
+        while self._heap:
+            _, sequence = heapq.heappop(self._heap)
+            if sequence in self._pending:
+                return self._remove(sequence)
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            item = self._pop()
+            if item is None:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            if self._expired(item):
+                self.counters['expired'] += 1
+                continue
+
+            task = asyncio.ensure_future(self.handler(item))
+            self._running[task] = item
+            try:
+                await asyncio.shield(task)
+                self.counters['executed'] += 1
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # The worker itself is being stopped
+                    task.cancel()
+                    raise
+                self.counters['expired'] += 1
+                logging.info(f"Dropped {' -> '.join(item.opportunity.cycle)} mid-execution: "
+                             f"block {item.target_block} has passed")
+            except Exception as e:
+                self.counters['failed'] += 1
+                logging.error(f"Executing {' -> '.join(item.opportunity.cycle)} failed: {str(e)}")
+            finally:
+                del self._running[task]
+
+
+class BundleExecutor:
+    def __init__(self, sizer, factory, submitter, nonce_manager, gas_estimator, percentiles: Sequence[int] = (50,)):
+        """
+        Scheduler handler that sizes a cycle against pool depth (CycleSizer), signs one
+        executeArbitrage transaction per priority-fee percentile on a single nonce
+        (TransactionFactory) and sends each as its own bundle for the target block
+        (BundleSubmitter). Route tokens must be token addresses. The Execute contract only receives
+        the token path and swaps each hop through the Uniswap V3 0.3% pool, so only routes whose
+        every hop is such a pool are executed; others are worth 0 and never signed.
+        All calls share one account, so they run one at a time: opportunities for the block a
+        bundle is already in flight for reuse its nonce (the bundles then compete and at most one
+        lands, instead of the second depending on the first), and the first call for a later block
+        re-syncs the nonce from the chain, whether the in-flight bundle landed or not. A nonce no
+        relay accepted is released, and the counter is re-synced when it cannot be reclaimed or a
+        relay reports a nonce error. The fee model is refreshed once per target block (to the block
+        before it), and nothing is signed while it has no fee history.
+        :param sizer: CycleSizer over the pools the routes trade through
+        :param factory: TransactionFactory for the Execute contract
+        :param submitter: Started BundleSubmitter
+        :param nonce_manager: NonceManager of the sending account
+        :param gas_estimator: GasEstimator (update, seeded, base_fee and priority_fee are used)
+        :param percentiles: Priority fee percentiles to bid, one bundle each
+        """
+        self.sizer = sizer
+        self.factory = factory
+        self.submitter = submitter
+        self.nonce_manager = nonce_manager
+        self.gas_estimator = gas_estimator
+        self.percentiles = list(percentiles)
+
+        self._lock = asyncio.Lock()
+        # (nonce, target block) of the latest bundle a relay accepted, until its block has passed
+        self._in_flight: Optional[Tuple[int, int]] = None
+        # Target block the fee model was last refreshed for
+        self._fees_block: Optional[int] = None
+
+    def executable(self, route: Sequence[Hop]) -> bool:
+        """
+        True if Execute.executeArbitrage would trade the route through the pools it was sized on:
+        every hop must be a Uniswap V3 pool of the contract's fee tier tracked by the quote engine.
+        """
+        engine = self.sizer.engine
+        for hop in route:
+            pool = engine.pool_index.get(hop.pool)
+            if pool is None or engine.kind[pool] != V3 or engine.fee[pool] != EXECUTE_POOL_FEE:
+                return False
+        return True
+
+    def estimate(self, opportunity: Opportunity) -> float:
+        """
+        Expected net profit at the optimal size (usable as the scheduler's estimate).
+        Routes the contract cannot execute as sized, or through pools the quote engine does not
+        track, are worth 0.
+        """
+        if not self.executable(opportunity.route):
+            return 0.0
+        try:
+            sized = self.sizer.size([opportunity.route])
+        except KeyError:
+            return 0.0
+        return sized[0].net_profit if sized else 0.0
+
+    async def __call__(self, item: ScheduledOpportunity) -> List:
+        """
+        :return: RelayResults of every bundle sent (empty if the cycle is no longer profitable or
+                 cannot be executed as sized)
+        """
+        if item.target_block is None:
+            raise ValueError("Opportunity has no target block")
+        if not self.executable(item.opportunity.route):
+            logging.warning(f"Not executing {' -> '.join(item.opportunity.cycle)}: the contract only trades "
+                            f"Uniswap V3 pools with fee {EXECUTE_POOL_FEE}")
+            return []
+        trace_ids = [item.opportunity.trace_id]
+        sized = self.sizer.size([item.opportunity.route], trace_ids)
+        if not sized:
+            return []
+        cycle = sized[0]
+        path = [cycle.route[0].token_in] + [hop.token_out for hop in cycle.route]
+
+        async with self._lock:
+            if self._fees_block != item.target_block:
+                await asyncio.to_thread(self.gas_estimator.update, item.target_block - 1)
+                if self.gas_estimator.seeded:
+                    self._fees_block = item.target_block
+            if not self.gas_estimator.seeded:
+                logging.warning(f"No fee history yet; not signing a bundle for block {item.target_block}")
+                return []
+
+            if self._in_flight is not None and self._in_flight[1] < item.target_block:
+                # The in-flight bundle's block has passed: the chain now says whether its nonce was used
+                self._in_flight = None
+                await self.nonce_manager.sync_async()
+            reserved = self._in_flight is None
+            nonce = self.nonce_manager.next_nonce() if reserved else self._in_flight[0]
+
+            accepted = False
+            results = []
+            try:
+                tips = [self.gas_estimator.priority_fee(percentile) for percentile in self.percentiles]
+                transactions = self.factory.build_variants(path, [cycle.amount_in], tips, nonce,
+                                                           self.gas_estimator.base_fee())
+                signed = await asyncio.to_thread(self.factory.sign_many, transactions, trace_ids)
+                batches = await asyncio.gather(*(
+                    self.submitter.submit([transaction], item.target_block, trace_ids if i == 0 else None)
+                    for i, transaction in enumerate(signed)
+                ))
+                results = [result for batch in batches for result in batch]
+                accepted = any(result.ok for result in results)
+                if accepted:
+                    self._in_flight = (nonce, item.target_block)
+                return results
+            finally:
+                if not accepted and reserved:
+                    await self._return_nonce(nonce, results)
+
+    async def _return_nonce(self, nonce: int, results: List) -> None:
+        for result in results:
+            if result.error and await asyncio.to_thread(self.nonce_manager.handle_error, result.error):
+                return
+        if not self.nonce_manager.release([nonce]):
+            # Something else took a nonce after ours; close the gap from the chain
+            await self.nonce_manager.sync_async()
@@ -2,8 +2,10 @@ from web3 import Web3
 from uniswap import Uniswap
 import requests
 
+from src.utils.Multicall import MulticallQuoter
+
 class UniswapConnector:
-    def __init__(self, infura_url, wallet_address, private_key, version=3):
+    def __init__(self, infura_url, wallet_address, private_key, version=3, liquidity_cache=None):
         # Connect to Ethereum node
         self.web3 = Web3(Web3.HTTPProvider(infura_url))
 
@@ -19,10 +21,24 @@ class UniswapConnector:
             version=version
         )
 
+        # Optional LiquidityCache shared with LiquidityAggregator
+        self.liquidity_cache = liquidity_cache
+
+        # Batched on-chain quoting through Multicall3
+        self.quoter = MulticallQuoter(self.web3)
+
     def get_price(self, token_in, token_out):
         # Fetches token price from Uniswap
         return self.uniswap.get_price_input(token_in, token_out, 1 * 10**18)
 
+    def get_prices(self, pairs, amount_in=1 * 10**18, fee=3000):
+        """
+        Prices many pairs in a few Multicall3 aggregate calls instead of one RPC per pair.
+        Pairs are (token_in, token_out) or (token_in, token_out, fee) address tuples.
+        Returns a NumPy array of amount_out / amount_in in pair order (NaN where a quote failed).
+        """
+        return self.quoter.get_prices(pairs, amount_in, fee)
+
     def swap_tokens(self, token_in, token_out, amount_in_wei):
         # Executes token swap
         return self.uniswap.make_trade(token_in, token_out, amount_in_wei)
@@ -32,6 +48,14 @@ class UniswapConnector:
         Dynamically fetches liquidity from a remote router API endpoint.
         This allows off-chain aggregation of liquidity data before initiating swaps.
         """
+        if self.liquidity_cache is not None:
+            return self.liquidity_cache.get_or_fetch(
+                self.liquidity_cache.key(router_url, token_1, token_2),
+                lambda: self._request_liquidity(router_url, token_1, token_2)
+            )
+        return self._request_liquidity(router_url, token_1, token_2)
+
+    def _request_liquidity(self, router_url, token_1, token_2):
         try:
             response = requests.get(
                 f'{router_url}/liquidity',
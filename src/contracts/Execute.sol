@@ -33,12 +33,13 @@ contract Execute {
         require(path.length >= 2, "Invalid path");
 
         uint256 amountOutMin = 0; // We won't perform a slippage check here as per your requirement
-        uint256 amountOut;
+        // Trade exactly the sized input, then chain each hop's output into the next hop
+        uint256 amountOut = amountIn;
 
         for (uint256 i = 0; i < path.length - 1; i++) {
             // Execute the swap from token[i] to token[i+1]
-            uint256 amountIn = IERC20(path[i]).balanceOf(address(this));
-            IERC20(path[i]).approve(address(swapRouter), amountIn);
+            uint256 hopAmountIn = amountOut;
+            IERC20(path[i]).approve(address(swapRouter), hopAmountIn);
 
             ISwapRouter.ExactInputSingleParams memory params = ISwapRouter.ExactInputSingleParams({
                 tokenIn: path[i],
@@ -46,7 +47,7 @@ contract Execute {
                 fee: 3000, // Using the 0.3% fee tier for Uniswap V3
                 recipient: address(this),
                 deadline: block.timestamp + 300,
-                amountIn: amountIn,
+                amountIn: hopAmountIn,
                 amountOutMinimum: amountOutMin,
                 sqrtPriceLimitX96: 0
             });
@@ -55,6 +56,7 @@ contract Execute {
         }
 
         // Logic to handle flash loan repayment and profit distribution
+        require(amountOut > amountIn, "Unprofitable");
         uint256 profit = amountOut - amountIn;
         payable(owner).transfer(profit);
     }
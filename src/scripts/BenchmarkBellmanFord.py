@@ -0,0 +1,87 @@
+# File: /offchain/scripts/benchmark_bellmanford.py
+
+import argparse
+import logging
+import math
+import random
+import time
+from typing import Dict, List
+
+from src.bots.BellmanFord import (
+    BellmanFordArbitrage,
+    SPFAArbitrage,
+    VectorizedBellmanFordArbitrage,
+    build_graph_from_prices,
+)
+
+ENGINES = {
+    'bellman-ford': BellmanFordArbitrage,
+    'vectorized': VectorizedBellmanFordArbitrage,
+    'spfa': SPFAArbitrage,
+}
+
+
+def generate_prices(num_tokens: int, avg_degree: float, seed: int, planted_cycles: int = 0,
+                    cycle_length: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Builds a random market whose rates derive from per-token prices minus a 0.3% fee, so it holds no
+    arbitrage unless cycles are planted on purpose. Each token quotes about avg_degree random
+    counterparts, so generation stays linear in the number of edges up to 10,000+ tokens.
+    :param num_tokens: Number of tokens
+    :param avg_degree: Average number of quoted pairs per token
+    :param seed: RNG seed
+    :param planted_cycles: Number of profitable cycles to plant (a bool plants one); the first runs through T0
+    :param cycle_length: Hops per planted cycle
+    :return: Raw token exchange rates
+    """
+    rng = random.Random(seed)
+    tokens = [f'T{i}' for i in range(num_tokens)]
+    price = {token: math.exp(rng.uniform(-5, 5)) for token in tokens}
+    prices: Dict[str, Dict[str, float]] = {token: {} for token in tokens}
+
+    degree = min(avg_degree, num_tokens - 1)
+    for i, base in enumerate(tokens):
+        # Round the fractional part randomly so the average degree is met
+        count = int(degree) + (rng.random() < degree - int(degree))
+        for j in rng.sample(range(num_tokens - 1), count):
+            quote = tokens[j + (j >= i)]
+            prices[base][quote] = price[base] / price[quote] * 0.997
+
+    length = min(cycle_length, num_tokens)
+    for k in range(int(planted_cycles)):
+        members = [tokens[0]] + rng.sample(tokens[1:], length - 1) if k == 0 else rng.sample(tokens, length)
+        for base, quote in zip(members, members[1:]):
+            prices[base][quote] = price[base] / price[quote]
+        prices[members[-1]][members[0]] = price[members[-1]] / price[members[0]] * 1.01
+    return prices
+
+
+def time_engine(engine, graph: Dict[str, Dict[str, float]], start_token: str, repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        engine(graph).find_arbitrage(start_token)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes: List[int], repeats: int) -> None:
+    logging.disable(logging.INFO)
+    scenarios = [('sparse', 4.0), ('dense', None)]
+    print(f"{'tokens':>7} {'graph':>7} {'cycle':>6} " + ' '.join(f'{name:>13}' for name in ENGINES))
+    for num_tokens in sizes:
+        for label, avg_degree in scenarios:
+            degree = avg_degree if avg_degree is not None else num_tokens / 4
+            for planted in (False, True):
+                graph = build_graph_from_prices(generate_prices(num_tokens, degree, num_tokens, planted))
+                timings = [time_engine(engine, graph, 'T0', repeats) for engine in ENGINES.values()]
+                print(f"{num_tokens:>7} {label:>7} {str(planted):>6} "
+                      + ' '.join(f'{seconds * 1000:>11.2f}ms' for seconds in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Bellman-Ford engines on sparse and dense graphs")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
@@ -0,0 +1,261 @@
+# File: /offchain/scripts/benchmark_suite.py
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.bots.BellmanFord import build_graph_from_prices
+from src.bots.LiquidityAggregator import AsyncLiquidityAggregator, LiquidityAggregator
+from src.scripts.BenchmarkBellmanFord import ENGINES, generate_prices
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+# Baseline entry holding the calibration workload's timing on the machine that recorded it
+CALIBRATION = '_calibration'
+
+
+class Measurement(NamedTuple):
+    """
+    Summary of one benchmark case. Latencies are in seconds, peak memory in KiB.
+    """
+    name: str
+    units: int
+    p50: float
+    p90: float
+    p99: float
+    throughput: float
+    peak_kib: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'p50': self.p50, 'p90': self.p90, 'p99': self.p99,
+                'throughput': self.throughput, 'peak_kib': self.peak_kib}
+
+
+def measure(name: str, fn: Callable[[], object], units: int, repeats: int, warmup: int = 1) -> Measurement:
+    """
+    Times fn over several repeats, then runs it once more under tracemalloc for peak memory.
+    :param units: Work items per call (edges, quotes, ...) used for throughput
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return Measurement(name, units, float(p50), float(p90), float(p99), units / p50 if p50 > 0 else 0.0,
+                       peak / 1024)
+
+
+def calibration_workload() -> None:
+    """
+    Fixed CPU workload independent of the code under test (Python sorting, dict building and numpy),
+    timed with every run so baseline latencies can be rescaled to the current machine.
+    """
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(100_000)]
+    index = {value: i for i, value in enumerate(sorted(values))}
+    np.sort(np.fromiter(index, dtype=float, count=len(index)))
+
+
+class MockRouter:
+    """
+    Local router API serving GET /<router>/liquidity and POST /<router>/liquidity/batch with keep-alive.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        router = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                router.requests += 1
+                time.sleep(router.latency)
+                name = self.path.split('/')[1]
+                self._reply({'router': name, 'liquidity': 1000.0, 'rate': 1.0})
+
+            def do_POST(self):
+                router.requests += 1
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(router.latency)
+                name = self.path.split('/')[1]
+                self._reply({'results': [{'router': name, 'liquidity': 1000.0, 'rate': 1.0} for _ in body['pairs']]})
+
+            def _reply(self, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def url(self, name: str) -> str:
+        return f'{self.base_url}/{name}'
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def bench_graph(sizes: List[int], avg_degree: float, planted_cycles: int, repeats: int,
+                max_reference_tokens: int) -> List[Measurement]:
+    """
+    build_graph_from_prices and every engine's find_arbitrage on seeded synthetic markets.
+    The dict-based reference engine is skipped above max_reference_tokens (it is O(V*E) on every call).
+    """
+    results = []
+    for num_tokens in sizes:
+        prices = generate_prices(num_tokens, avg_degree, seed=num_tokens, planted_cycles=planted_cycles)
+        edges = sum(len(quotes) for quotes in prices.values())
+        results.append(measure(f'build_graph/{num_tokens}', lambda: build_graph_from_prices(prices), edges, repeats))
+        graph = build_graph_from_prices(prices)
+        for engine_name, engine in ENGINES.items():
+            if engine_name == 'bellman-ford' and num_tokens > max_reference_tokens:
+                continue
+            results.append(measure(f'find_arbitrage/{engine_name}/{num_tokens}',
+                                   lambda: engine(graph).find_arbitrage('T0'), edges, repeats))
+    return results
+
+
+def bench_liquidity(num_routers: int, num_pairs: int, latency: float, repeats: int) -> List[Measurement]:
+    """
+    LiquidityAggregator (sequential requests) and AsyncLiquidityAggregator (concurrent and batched)
+    against a local mock router.
+    """
+    router = MockRouter(latency)
+    try:
+        urls = [router.url(f'router{i}') for i in range(num_routers)]
+        pairs = [(f'T{i}', f'T{i + 1}') for i in range(num_pairs)]
+        quotes = num_routers * num_pairs
+
+        sync_aggregator = LiquidityAggregator(urls)
+        results = [measure('liquidity/sync', lambda: [sync_aggregator.aggregate_liquidity(*pair) for pair in pairs],
+                           quotes, repeats)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            async_aggregator = AsyncLiquidityAggregator(urls)
+            batched = AsyncLiquidityAggregator(urls, batch_sizes={url: 100 for url in urls})
+            results.append(measure('liquidity/async', lambda: loop.run_until_complete(
+                async_aggregator.aggregate_liquidity_pairs(pairs)), quotes, repeats))
+
+            async def stream():
+                return [item async for item in batched.aggregate_liquidity_many(pairs)]
+
+            results.append(measure('liquidity/async-batch', lambda: loop.run_until_complete(stream()), quotes, repeats))
+            loop.run_until_complete(async_aggregator.close())
+            loop.run_until_complete(batched.close())
+        finally:
+            loop.close()
+        return results
+    finally:
+        router.stop()
+
+
+def compare(results: List[Measurement], baseline: Dict[str, Dict[str, float]], tolerance: float,
+            min_delta: float = 0.0005, calibration: Optional[float] = None) -> List[str]:
+    """
+    Lists regressions against a stored baseline: p50 latency or peak memory above baseline * (1 + tolerance).
+    Latency changes smaller than min_delta seconds are treated as noise.
+    :param calibration: p50 of calibration_workload on this machine; when the baseline holds its own
+                        calibration timing, baseline latencies are rescaled by the ratio of the two
+    """
+    scale = 1.0
+    if calibration is not None and CALIBRATION in baseline:
+        scale = calibration / baseline[CALIBRATION]['p50']
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        expected = reference['p50'] * scale
+        if result.p50 > expected * (1 + tolerance) and result.p50 - expected > min_delta:
+            regressions.append(f"{result.name}: p50 {result.p50 * 1000:.2f}ms vs baseline {expected * 1000:.2f}ms")
+        if result.peak_kib > reference['peak_kib'] * (1 + tolerance) and result.peak_kib - reference['peak_kib'] > 64:
+            regressions.append(f"{result.name}: peak {result.peak_kib:.0f}KiB vs baseline {reference['peak_kib']:.0f}KiB")
+    return regressions
+
+
+def report(results: List[Measurement]) -> None:
+    print(f"{'benchmark':<34} {'p50':>10} {'p90':>10} {'p99':>10} {'units/s':>12} {'peak':>10}")
+    for result in results:
+        print(f"{result.name:<34} {result.p50 * 1000:>8.2f}ms {result.p90 * 1000:>8.2f}ms {result.p99 * 1000:>8.2f}ms "
+              f"{result.throughput:>12.0f} {result.peak_kib:>7.0f}KiB")
+
+
+def run(args: argparse.Namespace) -> int:
+    logging.disable(logging.INFO)
+    calibration = measure(CALIBRATION, calibration_workload, 1, args.repeats)
+    results = bench_graph(args.sizes, args.degree, args.planted, args.repeats, args.max_reference_tokens)
+    if not args.skip_liquidity:
+        results += bench_liquidity(args.routers, args.pairs, args.router_latency, args.repeats)
+    report(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({result.name: result.to_dict() for result in [calibration] + results}, f, indent=2,
+                      sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, calibration=calibration.p50)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}, "
+              f"machine speed x{baseline.get(CALIBRATION, {}).get('p50', calibration.p50) / calibration.p50:.2f} "
+              f"of the baseline's)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark graph search and liquidity aggregation")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--degree', type=float, default=4.0, help="Average quoted pairs per token")
+    parser.add_argument('--planted', type=int, default=3, help="Profitable cycles planted per market")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-reference-tokens', type=int, default=1000)
+    parser.add_argument('--routers', type=int, default=4)
+    parser.add_argument('--pairs', type=int, default=25)
+    parser.add_argument('--router-latency', type=float, default=0.002, help="Mock router delay in seconds")
+    parser.add_argument('--skip-liquidity', action='store_true')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Record results as the new baseline")
+    parser.add_argument('--check', action='store_true', help="Exit non-zero on regressions against the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    sys.exit(run(parser.parse_args()))
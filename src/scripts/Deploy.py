@@ -1,54 +1,116 @@
+import argparse
+from typing import Dict, Optional, Sequence
+
 from web3 import Web3
-from solcx import compile_source
+
+from src.utils.CompileCache import CompileCache
+from src.utils.GasEstimator import GasEstimator
 
 class ContractDeployer:
-    def __init__(self, web3_provider, private_key, address):
+    def __init__(self, web3_provider, private_key, address, compile_cache: Optional[CompileCache] = None,
+                 import_remappings: Optional[Dict[str, str]] = None, solc_version: Optional[str] = None):
+        """
+        :param compile_cache: Artifact cache; unchanged contracts are not recompiled on redeploy
+        :param import_remappings: Import prefix -> local directory for the default cache
+                                  (e.g. {'@openzeppelin/': 'node_modules/@openzeppelin/'})
+        :param solc_version: solc version for the default cache (solcx's active version if not given)
+        """
         self.web3 = Web3(Web3.HTTPProvider(web3_provider))
         self.private_key = private_key
         self.address = address
+        self.gas_estimator = GasEstimator(self.web3, gas_margin=1.1, default_gas=2000000)
+        self.compile_cache = compile_cache or CompileCache(solc_version=solc_version,
+                                                           settings={'optimize': True, 'optimize_runs': 200},
+                                                           import_remappings=import_remappings)
+
+    def compile_contract(self, contract_source, contract_name: Optional[str] = None) -> Dict:
+        """
+        Compiles the Solidity contract from the source code, or loads it from the compile cache.
+        :param contract_name: Contract to return; may be omitted when the source defines only one
+        :return: {'abi', 'bin'} of the contract
+        """
+        return self._select(self.compile_cache.compile_source(contract_source), contract_name)
+
+    def compile_file(self, path: str, contract_name: Optional[str] = None) -> Dict:
+        """
+        compile_contract for a source file (relative imports resolve from its directory).
+        """
+        return self._select(self.compile_cache.compile_file(path), contract_name)
 
-    def compile_contract(self, contract_source):
+    def compile_contracts(self, paths: Sequence[str]) -> Dict[str, Dict[str, Dict]]:
         """
-        Compiles the Solidity contract from the source code.
+        Compiles several source files in parallel, reusing cached artifacts.
+        :return: Source path -> contract name -> {'abi', 'bin'}
         """
-        compiled = compile_source(contract_source)
-        return compiled['<stdin>:MyContract']  # Replace 'MyContract' with actual contract name
+        return self.compile_cache.compile_files(paths)
+
+    @staticmethod
+    def _select(contracts: Dict[str, Dict], contract_name: Optional[str]) -> Dict:
+        if contract_name is None:
+            if len(contracts) != 1:
+                raise ValueError(f"Source defines {', '.join(contracts)}; pass contract_name")
+            return next(iter(contracts.values()))
+        if contract_name not in contracts:
+            raise ValueError(f"Contract {contract_name} not found in source")
+        return contracts[contract_name]
 
-    def deploy_contract(self, contract_source):
+    def deploy_contract(self, contract_source, contract_name: Optional[str] = None, constructor_args: Sequence = (),
+                        compiled_contract: Optional[Dict] = None):
         """
         Deploy the contract to the Ethereum network.
+        :param compiled_contract: Already compiled {'abi', 'bin'} artifact (contract_source is then ignored)
         """
-        compiled_contract = self.compile_contract(contract_source)
+        compiled_contract = compiled_contract or self.compile_contract(contract_source, contract_name)
         contract_abi = compiled_contract['abi']
         contract_bytecode = compiled_contract['bin']
 
         contract = self.web3.eth.contract(abi=contract_abi, bytecode=contract_bytecode)
 
-        # Prepare transaction for deployment
-        transaction = contract.constructor().buildTransaction({
+        # Prepare transaction for deployment. build_transaction already ran eth_estimateGas and
+        # filled in fees, so only the margin is added to its gas. Its fees are replaced from the fee
+        # history when that could be loaded, and kept otherwise
+        self.gas_estimator.update()
+        transaction = contract.constructor(*constructor_args).build_transaction({
             'from': self.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.toWei('20', 'gwei'),
-            'nonce': self.web3.eth.getTransactionCount(self.address),
+            'nonce': self.web3.eth.get_transaction_count(self.address),
         })
+        transaction['gas'] = int(transaction['gas'] * self.gas_estimator.gas_margin)
+        if self.gas_estimator.seeded:
+            transaction.pop('gasPrice', None)
+            transaction.update(self.gas_estimator.fee_fields())
 
         # Sign and send the transaction
         signed_txn = self.web3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        txn_hash = self.web3.eth.sendRawTransaction(signed_txn.rawTransaction)
+        txn_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
 
         # Wait for the transaction receipt to get the contract address
-        txn_receipt = self.web3.eth.waitForTransactionReceipt(txn_hash)
+        txn_receipt = self.web3.eth.wait_for_transaction_receipt(txn_hash)
         contract_address = txn_receipt.contractAddress
         return contract_address
 
 # Example usage:
-contract_source = """
-pragma solidity ^0.8.0;
-
-contract MyContract {
-    // Contract code here
-}
-"""
-deployer = ContractDeployer(web3_provider="https://mainnet.infura.io/v3/YOUR_INFURA_PROJECT_ID", private_key="YOUR_PRIVATE_KEY", address="YOUR_ADDRESS")
-contract_address = deployer.deploy_contract(contract_source)
-print(f"Contract deployed at address: {contract_address}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile (cached) and deploy a contract")
+    parser.add_argument('source', nargs='?', default='src/contracts/Execute.sol')
+    parser.add_argument('--contract', default=None, help="Contract name when the source defines several")
+    parser.add_argument('--args', nargs='*', default=[], help="Constructor arguments (e.g. the swap router address)")
+    parser.add_argument('--compile-only', nargs='*', default=None, metavar='SOURCE',
+                        help="Compile these sources in parallel into the cache and exit")
+    parser.add_argument('--remap', nargs='*', default=[], metavar='PREFIX=PATH',
+                        help="Import remappings, e.g. @openzeppelin/=node_modules/@openzeppelin/")
+    parser.add_argument('--solc-version', default=None, help="solc version (solcx's active version by default)")
+    parser.add_argument('--provider', default="https://mainnet.infura.io/v3/YOUR_INFURA_PROJECT_ID")
+    parser.add_argument('--private-key', default="YOUR_PRIVATE_KEY")
+    parser.add_argument('--address', default="YOUR_ADDRESS")
+    args = parser.parse_args()
+
+    remappings = dict(remap.split('=', 1) for remap in args.remap)
+    deployer = ContractDeployer(web3_provider=args.provider, private_key=args.private_key, address=args.address,
+                                import_remappings=remappings, solc_version=args.solc_version)
+    if args.compile_only is not None:
+        for path, contracts in deployer.compile_contracts(args.compile_only or [args.source]).items():
+            print(f"{path}: {', '.join(contracts)}")
+    else:
+        compiled = deployer.compile_file(args.source, args.contract)
+        contract_address = deployer.deploy_contract(None, compiled_contract=compiled, constructor_args=args.args)
+        print(f"Contract deployed at address: {contract_address}")
@@ -1,7 +1,7 @@
 # File: src/tests/test.algorithm.py
 
 import unittest
-from src.bots.bellmanford import bellman_ford
+from src.bots.BellmanFord import BellmanFordArbitrage
 
 class TestAlgorithm(unittest.TestCase):
     def test_arbitrage_detection(self):
@@ -10,8 +10,8 @@ class TestAlgorithm(unittest.TestCase):
             'DAI': {'USDT': -0.1, 'WETH': -0.1},
             'USDT': {'DAI': -0.05, 'WETH': -0.15}
         }
-        result = bellman_ford(graph, 'WETH')
-        self.assertIsInstance(result, dict)
+        result = BellmanFordArbitrage(graph).find_arbitrage('WETH')
+        self.assertIsInstance(result, list)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,31 @@
 # File: src/tests/test_all.py
 
 import unittest
-from src.bots.bellmanford import bellman_ford
-from src.utils.MEVWrapper import prepare_flashbots_bundle
+from src.bots.BellmanFord import BellmanFordArbitrage
+from src.utils.MEVWrapper import MEVBotWrapper
+
+
+class ChainStandIn:
+    """
+    Minimal web3 stand-in: account nonce, gas estimation and fee history for one block.
+    """
+
+    def __init__(self):
+        self.eth = self
+        self.middleware_stack = self
+        self.block_number = 1
+
+    def inject(self, middleware, layer=0):
+        pass
+
+    def get_transaction_count(self, address, block_identifier='latest'):
+        return 0
+
+    def estimate_gas(self, transaction):
+        return 150000
+
+    def fee_history(self, count, newest, percentiles):
+        return {'baseFeePerGas': [10**9] * (count + 1), 'reward': [[10**8] * len(percentiles)] * count}
 
 class TestAlgorithm(unittest.TestCase):
     def test_arbitrage_detection(self):
@@ -11,15 +34,17 @@ class TestAlgorithm(unittest.TestCase):
             'DAI': {'USDT': -0.1, 'WETH': -0.1},
             'USDT': {'DAI': -0.05, 'WETH': -0.15}
         }
-        result = bellman_ford(graph, 'WETH')
-        self.assertIsInstance(result, dict)
+        result = BellmanFordArbitrage(graph).find_arbitrage('WETH')
+        self.assertIsInstance(result, list)
 
 class TestMEVWrapper(unittest.TestCase):
     def test_prepare_flashbots_bundle_structure(self):
-        dummy_tx = {"to": "0x0", "value": 0, "data": "0x"}
-        bundle = prepare_flashbots_bundle([dummy_tx])
+        wrapper = MEVBotWrapper(ChainStandIn(), "http://localhost", '0x' + '11' * 32, "http://localhost")
+        wrapper.gas_estimator.update()
+        bundle = wrapper.construct_mev_transaction_bundle({'routes': [['WETH', 'DAI']]})
         self.assertIn("txs", bundle)
         self.assertEqual(len(bundle["txs"]), 1)
+        self.assertEqual(bundle["txs"][0]["nonce"], 0)
 
 class TestFlashLoan(unittest.TestCase):
     def test_dummy_flashloan_execution(self):
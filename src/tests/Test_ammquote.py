@@ -0,0 +1,92 @@
+# File: src/tests/test_ammquote.py
+
+import random
+import unittest
+
+from src.bots.AMMQuoteEngine import Q96, AMMQuoteEngine
+from src.bots.BellmanFord import BellmanFordArbitrage
+
+
+def v2_reference(amount_in, reserve_in, reserve_out):
+    # UniswapV2Library.getAmountOut
+    amount_in_with_fee = amount_in * 997
+    return amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+
+
+def v3_reference(amount_in, sqrt_price, liquidity, fee, zero_for_one):
+    amount = amount_in * (10**6 - fee) // 10**6
+    if zero_for_one:
+        numerator = liquidity << 96
+        next_price = (numerator * sqrt_price + (numerator + amount * sqrt_price) - 1) // (numerator + amount * sqrt_price)
+        return liquidity * (sqrt_price - next_price) // Q96
+    next_price = sqrt_price + (amount << 96) // liquidity
+    return ((liquidity << 96) * (next_price - sqrt_price) // next_price) // sqrt_price
+
+
+class TestAMMQuoteEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = AMMQuoteEngine()
+        # WETH/DAI at ~3000 DAI per WETH on V2, and a V3 pool at the same price
+        self.engine.add_v2_pool('0xv2', 'WETH', 'DAI', 1_000 * 10**18, 3_000_000 * 10**18)
+        self.sqrt_price = int((3000 ** 0.5) * Q96)
+        self.engine.add_v3_pool('0xv3', 'WETH', 'DAI', 500, self.sqrt_price, 10**24)
+
+    def test_v2_matches_contract_math(self):
+        for amount in (1, 10**15, 10**18, 50 * 10**18):
+            self.assertEqual(self.engine.quote('0xv2', 'WETH', amount),
+                             v2_reference(amount, 1_000 * 10**18, 3_000_000 * 10**18))
+            self.assertEqual(self.engine.quote('0xv2', 'DAI', amount),
+                             v2_reference(amount, 3_000_000 * 10**18, 1_000 * 10**18))
+
+    def test_v3_matches_contract_math(self):
+        for amount in (10**12, 10**18, 10**20):
+            self.assertEqual(self.engine.quote('0xv3', 'WETH', amount),
+                             v3_reference(amount, self.sqrt_price, 10**24, 500, True))
+            self.assertEqual(self.engine.quote('0xv3', 'DAI', amount),
+                             v3_reference(amount, self.sqrt_price, 10**24, 500, False))
+        self.assertAlmostEqual(self.engine.quote('0xv3', 'WETH', 10**18) / 10**18, 3000 * 0.9995, delta=1)
+
+    def test_events_update_state(self):
+        self.engine.apply_sync('0xv2', 2_000 * 10**18, 3_000_000 * 10**18)
+        self.assertEqual(self.engine.quote('0xv2', 'WETH', 10**18),
+                         v2_reference(10**18, 2_000 * 10**18, 3_000_000 * 10**18))
+        self.engine.apply_swap('0xv3', self.sqrt_price, 0)
+        self.assertEqual(self.engine.quote('0xv3', 'WETH', 10**18), 0)
+        with self.assertRaises(ValueError):
+            self.engine.quote('0xv2', 'USDC', 10**18)
+
+    def test_batch_quotes_match_single_quotes(self):
+        rng = random.Random(1)
+        engine = AMMQuoteEngine()
+        for i in range(200):
+            reserve0, reserve1 = rng.randint(10**18, 10**24), rng.randint(10**18, 10**24)
+            engine.add_v2_pool(f'0x{i}', f'A{i}', f'B{i}', reserve0, reserve1)
+            engine.add_v3_pool(f'0x3{i}', f'A{i}', f'B{i}', 3000, rng.randint(Q96 // 100, Q96 * 100),
+                               rng.randint(10**15, 10**24))
+        ids = [rng.randrange(engine.size) for _ in range(1000)]
+        directions = [rng.random() < 0.5 for _ in ids]
+        amounts = [rng.randint(1, 10**20) for _ in ids]
+        batch = engine.quote_many(ids, directions, amounts)
+        for pool, forward, amount, out in zip(ids, directions, amounts, batch):
+            token_in = engine.token0[pool] if forward else engine.token1[pool]
+            self.assertEqual(out, engine.quote(engine.addresses[pool], token_in, amount))
+
+    def test_graph_and_cycle_simulation_without_rpc(self):
+        engine = AMMQuoteEngine()
+        engine.add_v2_pool('0xa', 'WETH', 'DAI', 1_000 * 10**18, 3_000_000 * 10**18)
+        engine.add_v2_pool('0xb', 'DAI', 'USDC', 10**24, 10**24)
+        engine.add_v2_pool('0xc', 'USDC', 'WETH', 3_100_000 * 10**18, 1_000 * 10**18)
+
+        token_graph = engine.to_token_graph()
+        self.assertEqual(len(token_graph), 6)
+        detector = BellmanFordArbitrage(token_graph)
+        cycle = detector.find_arbitrage('WETH')
+        route = detector.route_for_cycle(cycle)
+        amount_in = 10**17
+        token_in = route[0].token_in
+        self.assertEqual(token_in, cycle[0])
+        self.assertGreater(engine.simulate_route(route, amount_in), amount_in)
+
+
+if __name__ == '__main__':
+    unittest.main()
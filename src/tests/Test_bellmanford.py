@@ -0,0 +1,194 @@
+# File: src/tests/test_bellmanford.py
+
+import math
+import random
+import unittest
+
+from src.bots.BellmanFord import (
+    BellmanFordArbitrage,
+    SPFAArbitrage,
+    TokenGraph,
+    VectorizedBellmanFordArbitrage,
+    build_graph_from_prices,
+)
+
+
+def random_prices(num_tokens, density, seed):
+    rng = random.Random(seed)
+    tokens = [f'T{i}' for i in range(num_tokens)]
+    prices = {token: {} for token in tokens}
+    for base in tokens:
+        for quote in tokens:
+            if base != quote and rng.random() < density:
+                prices[base][quote] = rng.uniform(0.8, 1.05)
+    return prices
+
+
+def cycle_weight(graph, cycle):
+    return sum(graph[u][v] for u, v in zip(cycle, cycle[1:]))
+
+
+class TestVectorizedBellmanFord(unittest.TestCase):
+    def test_detects_same_cycle_as_reference(self):
+        prices = {
+            'WETH': {'DAI': 3000.0, 'USDT': 2995.0},
+            'DAI': {'USDT': 0.998, 'WETH': 0.00033},
+            'USDT': {'DAI': 1.002, 'WETH': 0.000334}
+        }
+        graph = build_graph_from_prices(prices)
+        expected = BellmanFordArbitrage(graph).find_arbitrage('WETH')
+        self.assertEqual(VectorizedBellmanFordArbitrage(graph).find_arbitrage('WETH'), expected)
+
+    def test_no_cycle_exits_early(self):
+        graph = build_graph_from_prices({
+            'WETH': {'DAI': 3000.0},
+            'DAI': {'WETH': 1 / 3010.0},
+        })
+        self.assertIsNone(VectorizedBellmanFordArbitrage(graph).find_arbitrage('WETH'))
+
+    def test_cycle_closing_through_start_is_returned_whole(self):
+        graph = build_graph_from_prices({
+            'WETH': {'DAI': 3005.0},
+            'DAI': {'USDC': 1.0},
+            'USDC': {'WETH': 1 / 2990.0},
+        })
+        cycle = VectorizedBellmanFordArbitrage(graph).find_arbitrage('WETH')
+        self.assertEqual(len(cycle), 4)
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertLess(cycle_weight(graph, cycle), 0)
+
+    def test_agrees_with_reference_on_random_graphs(self):
+        for seed in range(20):
+            graph = build_graph_from_prices(random_prices(12, 0.3, seed))
+            expected = BellmanFordArbitrage(graph).find_arbitrage('T0')
+            cycle = VectorizedBellmanFordArbitrage(graph).find_arbitrage('T0')
+            self.assertEqual(cycle is None, expected is None)
+            if cycle:
+                self.assertEqual(cycle[0], cycle[-1])
+                self.assertLess(cycle_weight(graph, cycle), 0)
+
+    def test_unknown_start_token(self):
+        graph = build_graph_from_prices({'WETH': {'DAI': 3000.0}})
+        self.assertIsNone(VectorizedBellmanFordArbitrage(graph).find_arbitrage('USDC'))
+
+
+class TestSPFAArbitrage(unittest.TestCase):
+    def test_agrees_with_reference_on_random_graphs(self):
+        for seed in range(50):
+            graph = build_graph_from_prices(random_prices(12, 0.25, seed))
+            expected = BellmanFordArbitrage(graph).find_arbitrage('T0')
+            cycle = SPFAArbitrage(graph).find_arbitrage('T0')
+            self.assertEqual(cycle is None, expected is None)
+            if cycle:
+                self.assertEqual(cycle[0], cycle[-1])
+                self.assertLess(cycle_weight(graph, cycle), 0)
+
+    def test_returns_cycle_through_start_token(self):
+        graph = build_graph_from_prices({
+            'WETH': {'DAI': 3005.0},
+            'DAI': {'USDC': 1.0},
+            'USDC': {'WETH': 1 / 2990.0},
+        })
+        self.assertEqual(SPFAArbitrage(graph).find_arbitrage('WETH'), ['WETH', 'DAI', 'USDC', 'WETH'])
+
+    def test_no_cycle(self):
+        graph = build_graph_from_prices({'WETH': {'DAI': 3000.0}, 'DAI': {'WETH': 1 / 3010.0}})
+        self.assertIsNone(SPFAArbitrage(graph).find_arbitrage('WETH'))
+        self.assertIsNone(SPFAArbitrage(graph).find_arbitrage('USDC'))
+
+    def test_quote_only_token(self):
+        graph = {'WETH': {'DAI': -math.log(3000.0)}}
+        self.assertIsNone(SPFAArbitrage(graph).find_arbitrage('WETH'))
+
+
+class TestFindAllArbitrage(unittest.TestCase):
+    prices = {
+        # Cycle reachable from WETH
+        'WETH': {'DAI': 3000.0},
+        'DAI': {'USDC': 1.0},
+        'USDC': {'WETH': 1 / 2900.0},
+        # Isolated long-tail cycle that no WETH scan can see
+        'PEPE': {'SHIB': 2.0},
+        'SHIB': {'PEPE': 0.51},
+    }
+
+    def test_finds_cycles_in_disconnected_components(self):
+        graph = build_graph_from_prices(self.prices)
+        self.assertIsNotNone(BellmanFordArbitrage(graph).find_arbitrage('WETH'))
+
+        for engine in (BellmanFordArbitrage, VectorizedBellmanFordArbitrage):
+            found = engine(graph).find_all_arbitrage()
+            self.assertEqual([cycle for cycle, _ in found], [
+                ['DAI', 'USDC', 'WETH', 'DAI'],
+                ['PEPE', 'SHIB', 'PEPE'],
+            ])
+            self.assertAlmostEqual(found[0][1], 3000.0 / 2900.0)
+            self.assertAlmostEqual(found[1][1], 1.02)
+
+    def test_rotations_are_deduplicated(self):
+        graph = build_graph_from_prices(random_prices(15, 0.4, 7))
+        for engine in (BellmanFordArbitrage, VectorizedBellmanFordArbitrage):
+            found = engine(graph).find_all_arbitrage()
+            self.assertTrue(found)
+            rates = [rate for _, rate in found]
+            self.assertEqual(rates, sorted(rates, reverse=True))
+            for cycle, rate in found:
+                self.assertEqual(cycle[0], min(cycle))
+                self.assertAlmostEqual(rate, math.exp(-cycle_weight(graph, cycle)))
+            self.assertEqual(len({tuple(cycle) for cycle, _ in found}), len(found))
+
+    def test_no_cycles(self):
+        graph = build_graph_from_prices({'WETH': {'DAI': 3000.0}, 'DAI': {'WETH': 1 / 3010.0}})
+        self.assertEqual(VectorizedBellmanFordArbitrage(graph).find_all_arbitrage(), [])
+        self.assertEqual(BellmanFordArbitrage(graph).find_all_arbitrage(), [])
+
+
+class TestTokenGraph(unittest.TestCase):
+    prices = {
+        'WETH': {'DAI': [
+            {'rate': 3000.0, 'venue': 'uniswap-v3', 'pool': '0xuni', 'fee': 500},
+            {'rate': 3005.0, 'venue': 'sushiswap', 'pool': '0xsushi', 'fee': 3000},
+        ]},
+        'DAI': {'USDC': 1.0},
+        'USDC': {'WETH': 1 / 2990.0},
+    }
+
+    def test_parallel_venues_are_kept(self):
+        token_graph = TokenGraph()
+        graph = build_graph_from_prices(self.prices, token_graph)
+
+        self.assertEqual(len(token_graph), 4)
+        self.assertEqual(len(token_graph.edges_between('WETH', 'DAI')), 2)
+        self.assertAlmostEqual(graph['WETH']['DAI'], -math.log(3005.0))
+        self.assertEqual(token_graph.to_weight_dict(), graph)
+
+    def test_requoting_same_pool_updates_in_place(self):
+        token_graph = TokenGraph()
+        edge = token_graph.add_edge('WETH', 'DAI', 3000.0, 'uniswap-v3', '0xuni', 500)
+        self.assertEqual(token_graph.add_edge('WETH', 'DAI', 3100.0, 'uniswap-v3', '0xuni', 500), edge)
+        self.assertEqual(len(token_graph), 1)
+        self.assertAlmostEqual(token_graph.hop(edge).rate, 3100.0)
+        with self.assertRaises(ValueError):
+            token_graph.add_edge('WETH', 'DAI', 0.0)
+
+    def test_detected_cycle_routes_through_best_pool(self):
+        token_graph = TokenGraph()
+        build_graph_from_prices(self.prices, token_graph)
+
+        for engine in (BellmanFordArbitrage, VectorizedBellmanFordArbitrage):
+            detector = engine(token_graph)
+            cycle = detector.find_arbitrage('WETH')
+            self.assertIsNotNone(cycle)
+            route = detector.route_for_cycle(cycle)
+            self.assertEqual([hop.token_in for hop in route], cycle[:-1])
+            weth_dai = next(hop for hop in route if hop.token_in == 'WETH')
+            self.assertEqual((weth_dai.venue, weth_dai.pool, weth_dai.fee), ('sushiswap', '0xsushi', 3000))
+
+    def test_routing_needs_token_graph(self):
+        detector = BellmanFordArbitrage(build_graph_from_prices(self.prices))
+        with self.assertRaises(ValueError):
+            detector.route_for_cycle(['WETH', 'DAI', 'USDC', 'WETH'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# File: src/tests/test_benchmark.py
+
+import unittest
+
+from src.bots.BellmanFord import SPFAArbitrage, build_graph_from_prices
+from src.scripts.BenchmarkBellmanFord import generate_prices
+from src.scripts.BenchmarkSuite import CALIBRATION, Measurement, bench_liquidity, compare, measure
+
+
+class TestGenerators(unittest.TestCase):
+    def test_seeded_and_sized(self):
+        self.assertEqual(generate_prices(100, 4.0, seed=1), generate_prices(100, 4.0, seed=1))
+        self.assertNotEqual(generate_prices(100, 4.0, seed=1), generate_prices(100, 4.0, seed=2))
+        prices = generate_prices(2000, 6.0, seed=3)
+        edges = sum(len(quotes) for quotes in prices.values())
+        self.assertAlmostEqual(edges / 2000, 6.0, delta=0.3)
+        self.assertTrue(all(base not in quotes for base, quotes in prices.items()))
+
+    def test_planted_cycles_are_the_only_arbitrage(self):
+        clean = build_graph_from_prices(generate_prices(300, 4.0, seed=5))
+        self.assertIsNone(SPFAArbitrage(clean).find_arbitrage('T0'))
+        planted = build_graph_from_prices(generate_prices(300, 4.0, seed=5, planted_cycles=3, cycle_length=4))
+        cycle = SPFAArbitrage(planted).find_arbitrage('T0')
+        self.assertIsNotNone(cycle)
+        self.assertLess(sum(planted[u][v] for u, v in zip(cycle, cycle[1:])), 0)
+
+
+class TestSuite(unittest.TestCase):
+    def test_measure_and_compare(self):
+        result = measure('noop', lambda: [0] * 1000, units=10, repeats=3)
+        self.assertGreater(result.throughput, 0)
+        self.assertGreater(result.peak_kib, 0)
+
+        baseline = {'a': {'p50': 0.010, 'peak_kib': 100.0}, 'b': {'p50': 0.010, 'peak_kib': 100.0}}
+        results = [Measurement('a', 1, 0.020, 0.02, 0.02, 50.0, 100.0),
+                   Measurement('b', 1, 0.0101, 0.01, 0.01, 99.0, 1000.0),
+                   Measurement('new', 1, 1.0, 1.0, 1.0, 1.0, 1.0)]
+        regressions = compare(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('a: p50'))
+        self.assertTrue(regressions[1].startswith('b: peak'))
+
+    def test_compare_rescales_by_calibration(self):
+        baseline = {CALIBRATION: {'p50': 0.010, 'peak_kib': 1.0}, 'a': {'p50': 0.010, 'peak_kib': 100.0}}
+        results = [Measurement('a', 1, 0.020, 0.02, 0.02, 50.0, 100.0)]
+        # This machine runs the calibration workload twice as slowly, so 20ms matches the recorded 10ms
+        self.assertEqual(compare(results, baseline, tolerance=0.25, calibration=0.020), [])
+        self.assertEqual(len(compare(results, baseline, tolerance=0.25, calibration=0.010)), 1)
+        self.assertEqual(len(compare(results, baseline, tolerance=0.25)), 1)
+
+    def test_liquidity_against_mock_router(self):
+        results = bench_liquidity(num_routers=2, num_pairs=3, latency=0.0, repeats=1)
+        self.assertEqual([result.name for result in results],
+                         ['liquidity/sync', 'liquidity/async', 'liquidity/async-batch'])
+        self.assertTrue(all(result.units == 6 for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
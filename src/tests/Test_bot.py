@@ -0,0 +1,140 @@
+# File: src/tests/test_bot.py
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.bots.AMMQuoteEngine import AMMQuoteEngine
+from src.bots.ArbitrageBot import ArbitrageBot, main
+from src.bots.BellmanFord import TokenGraph
+from src.bots.Pipeline import EdgeUpdate
+from src.tests.Test_noncemanager import CountingChain
+from src.tests.Test_pipeline import ListFeed, wait_for
+from src.utils.NonceManager import NonceManager
+from src.utils.StateSnapshot import load_snapshot, save_snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def planted_graph():
+    """
+    WETH -> DAI -> USDC -> WETH returns 1.5% on the best venues.
+    """
+    graph = TokenGraph()
+    graph.add_edge('WETH', 'DAI', 3000.0, 'uniswap', '0xuni', 3000)
+    graph.add_edge('WETH', 'DAI', 2990.0, 'sushiswap', '0xsushi', 3000)
+    graph.add_edge('DAI', 'USDC', 1.0, 'curve', '0xcurve', 400)
+    graph.add_edge('USDC', 'WETH', 1.015 / 3000.0, 'uniswap', '0xusdc', 500)
+    graph.add_edge('DAI', 'WETH', 0.99 / 3000.0, 'uniswap', '0xuni', 3000)
+    return graph
+
+
+class TestStateSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'state', 'bot.npz')
+
+    def test_round_trip(self):
+        graph = planted_graph()
+        engine = AMMQuoteEngine()
+        engine.add_v2_pool('0xv2', 'WETH', 'DAI', 10**21, 3 * 10**24)
+        engine.add_v3_pool('0xv3', 'WETH', 'USDC', 500, 4339505179874779489431521 * 10**6, 10**22)
+        save_snapshot(self.path, graph, engine, {'0xbot': 12}, block=19_000_000)
+
+        snapshot = load_snapshot(self.path)
+        self.assertEqual(snapshot.block, 19_000_000)
+        self.assertEqual(snapshot.nonces, {'0xbot': 12})
+        restored = snapshot.token_graph
+        self.assertEqual(restored.tokens, graph.tokens)
+        self.assertEqual(list(restored.weight), list(graph.weight))
+        self.assertEqual(restored.pools, graph.pools)
+        self.assertEqual(restored.to_weight_dict(), graph.to_weight_dict())
+        self.assertEqual(restored.edges_between('WETH', 'DAI'), [0, 1])
+        # Re-pricing a known pool updates its edge instead of adding a parallel one
+        self.assertEqual(restored.add_edge('WETH', 'DAI', 2995.0, 'sushiswap', '0xsushi', 3000), 1)
+        self.assertEqual(len(restored), len(graph))
+
+        for address, token_in in (('0xv2', 'WETH'), ('0xv2', 'DAI'), ('0xv3', 'WETH'), ('0xv3', 'USDC')):
+            self.assertEqual(snapshot.engine.quote(address, token_in, 10**18), engine.quote(address, token_in, 10**18))
+
+    def test_parts_are_optional(self):
+        save_snapshot(self.path, nonces={'0xbot': 3})
+        snapshot = load_snapshot(self.path)
+        self.assertIsNone(snapshot.token_graph)
+        self.assertIsNone(snapshot.engine)
+        self.assertEqual(snapshot.nonces, {'0xbot': 3})
+
+
+class TestArbitrageBot(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'bot.npz')
+        self.found = []
+
+    async def test_warm_start_serves_snapshot_then_refreshes(self):
+        save_snapshot(self.path, planted_graph(), block=100)
+        feed = ListFeed([EdgeUpdate('DAI', 'LINK', 0.07, 'uniswap', '0xlink', 3000, block=101),
+                         EdgeUpdate('LINK', 'DAI', 14.5, 'uniswap', '0xlink', 3000, block=101)])
+        bot = ArbitrageBot([feed], self.found.append, snapshot_path=self.path, snapshot_interval=0)
+
+        await bot.start()
+        # The snapshot's open cycle is served before any feed update has been applied
+        self.assertEqual(len(self.found), 1)
+        self.assertEqual(self.found[0].cycle[:-1], ['DAI', 'USDC', 'WETH'])
+        self.assertEqual(self.found[0].block, 100)
+        self.assertEqual([hop.pool for hop in self.found[0].route], ['0xcurve', '0xusdc', '0xuni'])
+        report = bot.report()
+        self.assertTrue(report.restored)
+        self.assertLessEqual(report.ready, report.time_to_first_detection)
+
+        await wait_for(lambda: bot.pipeline.counters['edges'] == 2)
+        await wait_for(lambda: len(self.found) == 2)
+        self.assertEqual(set(self.found[1].cycle), {'DAI', 'LINK'})
+        await bot.stop()
+
+        saved = load_snapshot(self.path)
+        self.assertEqual(saved.block, 101)
+        self.assertEqual(len(saved.token_graph), 7)
+
+    async def test_cold_start_without_snapshot(self):
+        feed = ListFeed([EdgeUpdate('WETH', 'DAI', 3000.0, block=5)])
+        async with ArbitrageBot([feed], self.found.append, snapshot_path=self.path, snapshot_interval=0) as bot:
+            await wait_for(lambda: bot.pipeline.counters['edges'] == 1)
+        report = bot.report()
+        self.assertFalse(report.restored)
+        self.assertIsNone(report.time_to_first_detection)
+        self.assertEqual(load_snapshot(self.path).token_graph.tokens, ['WETH', 'DAI'])
+
+    async def test_nonce_seeded_from_snapshot_then_synced(self):
+        save_snapshot(self.path, nonces={'0xbot': 5})
+        chain = CountingChain(7)
+        manager = NonceManager(chain, '0xbot')
+        bot = ArbitrageBot(snapshot_path=self.path, snapshot_interval=0, nonce_managers={'0xbot': manager})
+        bot.restore()
+        self.assertEqual(manager.peek(), 5)
+        self.assertEqual(chain.calls, 0)
+
+        await bot.start()
+        await wait_for(lambda: manager.peek() == 7)
+        await bot.stop()
+        self.assertEqual(load_snapshot(self.path).nonces, {'0xbot': 7})
+
+
+class TestEntryPoint(unittest.TestCase):
+    def test_heavy_dependencies_are_not_imported(self):
+        code = ("import sys, src.bots.ArbitrageBot; "
+                "print(','.join(m for m in ('web3', 'eth_account', 'uniswap', 'aiohttp') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), '')
+
+    def test_main_runs_for_duration(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bot.npz')
+        save_snapshot(path, planted_graph(), block=100)
+        report = main(['--snapshot', path, '--duration', '0.05', '--snapshot-interval', '0', '--rpc', ''])
+        self.assertTrue(report.restored)
+        self.assertEqual(report.opportunities, 1)
+        self.assertIsNotNone(report.time_to_first_detection)
+
+
+if __name__ == '__main__':
+    unittest.main()
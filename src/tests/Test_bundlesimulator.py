@@ -0,0 +1,146 @@
+# File: src/tests/test_bundlesimulator.py
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.BundleSimulator import BundleSimulator, Candidate
+
+OWNER = '0x' + '0a' * 20
+
+
+def candidate(profit, revert=False, delay_ms=20):
+    # The stand-in fork reads its outcome from the raw bytes: [revert flag, delay in ms, profit]
+    return Candidate(bytes([int(revert), delay_ms]) + profit.to_bytes(8, 'big'), expected_profit=profit)
+
+
+class LocalFork:
+    """
+    Stand-in for an anvil fork: snapshot/revert, balances, and raw transactions whose outcome is
+    encoded in their bytes. Records how many transactions executed at the same time.
+    """
+
+    def __init__(self):
+        self.balance = 10**18
+        self.snapshots = []
+        self.receipts = {}
+        self.executing = 0
+        self.overlap = 0
+        self.fail_revert = False
+        fork = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                try:
+                    reply = {'result': fork.handle(request['method'], request['params'])}
+                except Exception as e:
+                    reply = {'error': {'code': -32000, 'message': str(e)}}
+                body = json.dumps({'jsonrpc': '2.0', 'id': request['id'], **reply}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def handle(self, method, params):
+        if method == 'evm_snapshot':
+            self.snapshots.append(self.balance)
+            return hex(len(self.snapshots))
+        if method == 'evm_revert':
+            if self.fail_revert:
+                raise ValueError('snapshot not found')
+            self.balance = self.snapshots[int(params[0], 16) - 1]
+            del self.snapshots[int(params[0], 16) - 1:]
+            return True
+        if method == 'eth_getBalance':
+            return hex(self.balance)
+        if method == 'eth_sendRawTransaction':
+            raw = bytes.fromhex(params[0][2:])
+            self.executing += 1
+            self.overlap = max(self.overlap, self.executing)
+            time.sleep(raw[1] / 1000)
+            self.executing -= 1
+            tx_hash = '0x%064x' % len(self.receipts)
+            if raw[0]:
+                self.receipts[tx_hash] = {'status': '0x0', 'gasUsed': hex(30_000)}
+            else:
+                self.balance += int.from_bytes(raw[2:], 'big')
+                self.receipts[tx_hash] = {'status': '0x1', 'gasUsed': hex(150_000)}
+            return tx_hash
+        if method == 'eth_getTransactionReceipt':
+            return self.receipts.get(params[0])
+        raise ValueError(method)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestBundleSimulator(unittest.TestCase):
+    def setUp(self):
+        self.forks = [LocalFork() for _ in range(4)]
+        self.simulator = BundleSimulator([fork.url for fork in self.forks], OWNER)
+
+    def tearDown(self):
+        self.simulator.close()
+        for fork in self.forks:
+            fork.stop()
+
+    def test_reports_gas_and_profit_and_rolls_back(self):
+        results = self.simulator.simulate([candidate(500), candidate(0, revert=True)])
+        self.assertEqual([(r.success, r.gas_used, r.profit) for r in results],
+                         [(True, 150_000, 500), (False, 30_000, 0)])
+        self.assertEqual(results[1].error, 'reverted')
+        self.assertTrue(all(fork.balance == 10**18 and not fork.snapshots for fork in self.forks))
+
+    def test_runs_candidates_in_parallel(self):
+        started = time.perf_counter()
+        results = self.simulator.simulate([candidate(i + 1, delay_ms=100) for i in range(8)])
+        elapsed = time.perf_counter() - started
+        self.assertTrue(all(result.success for result in results))
+        self.assertLess(elapsed, 0.6)
+        # One candidate at a time per fork
+        self.assertEqual(max(fork.overlap for fork in self.forks), 1)
+
+    def test_budget_cuts_off_slow_candidates(self):
+        candidates = [candidate(1, delay_ms=10)] + [candidate(2, delay_ms=250) for _ in range(8)]
+        results = self.simulator.simulate(candidates, budget=0.15)
+        self.assertTrue(results[0].success)
+        self.assertIn('budget', [result.error for result in results])
+
+    def test_select_keeps_top_profitable_non_reverting(self):
+        candidates = [candidate(100), candidate(10**6, revert=True), candidate(300), candidate(0), candidate(200)]
+        selected = self.simulator.select(candidates, top_k=2)
+        self.assertEqual([result.profit for result in selected], [300, 200])
+
+    def test_failed_revert_takes_fork_out_of_rotation(self):
+        self.forks[0].fail_revert = True
+        results = self.simulator.simulate([candidate(i + 1) for i in range(8)])
+        # The measured results survive the failed rollback and the batch completes
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.profit for result in results], list(range(1, 9)))
+        self.assertEqual([client.healthy for client in self.simulator.clients], [False, True, True, True])
+
+        self.simulator.simulate([candidate(1) for _ in range(8)])
+        self.assertLessEqual(len(self.forks[0].snapshots), 1)
+
+    def test_all_forks_retired_fails_candidates(self):
+        for fork in self.forks:
+            fork.fail_revert = True
+        results = self.simulator.simulate([candidate(1) for _ in range(8)], budget=2.0)
+        self.assertTrue(all(client.healthy is False for client in self.simulator.clients))
+        self.assertIn('no healthy fork', [result.error for result in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# File: src/tests/test_bundlesubmitter.py
+
+import asyncio
+import json
+import time
+import unittest
+
+from aiohttp import web
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils import keccak
+
+from src.utils.BundleSubmitter import BundleSubmitter
+
+SIGNING_KEY = '0x' + '22' * 32
+
+
+class LocalRelays:
+    """
+    Local stand-in for several relays served as POST /<relay> on one port.
+    Behaviours: 'ok' accepts, 'slow' answers after 1s, 'reject' returns a JSON-RPC error.
+    """
+
+    def __init__(self):
+        self.bodies = []
+        self.headers = []
+        self.peers = {}
+        self.runner = None
+        self.base_url = None
+
+    async def handle(self, request):
+        relay = request.match_info['relay']
+        self.peers.setdefault(relay, set()).add(request.transport.get_extra_info('peername'))
+        body = await request.read()
+        payload = json.loads(body)
+        if payload['method'] == 'eth_sendBundle':
+            self.bodies.append(body)
+            self.headers.append(dict(request.headers))
+        if relay.startswith('slow'):
+            await asyncio.sleep(1.0)
+        if relay.startswith('reject'):
+            return web.json_response({'jsonrpc': '2.0', 'id': payload['id'], 'error': {'message': 'bundle reverted'}})
+        return web.json_response({'jsonrpc': '2.0', 'id': payload['id'], 'result': {'bundleHash': '0x01'}})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/{relay}', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    def url(self, relay):
+        return f'{self.base_url}/{relay}'
+
+
+class TestBundleSubmitter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.relays = LocalRelays()
+        await self.relays.start()
+
+    async def asyncTearDown(self):
+        await self.relays.stop()
+
+    async def test_fans_out_with_per_relay_deadlines(self):
+        urls = [self.relays.url(name) for name in ('ok', 'slow', 'reject')]
+        async with BundleSubmitter(urls, deadlines={urls[1]: 0.2}) as submitter:
+            started = time.perf_counter()
+            results = await submitter.submit([b'\x02\x01', b'\x02\x02'], block_number=100)
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual([result.relay for result in results], urls)
+        self.assertEqual([result.ok for result in results], [True, False, False])
+        self.assertEqual(results[1].error, 'timeout')
+        self.assertIn('bundle reverted', results[2].error)
+        self.assertEqual(submitter.stats[urls[1]]['timeouts'], 1)
+        self.assertGreater(submitter.stats[urls[0]]['avg_latency'], 0)
+
+        params = json.loads(self.relays.bodies[0])['params'][0]
+        self.assertEqual(params, {'txs': ['0x0201', '0x0202'], 'blockNumber': hex(100)})
+
+    async def test_reuses_connections(self):
+        url = self.relays.url('ok')
+        async with BundleSubmitter([url]) as submitter:
+            await submitter.warm()
+            for block in range(5):
+                await submitter.submit([b'\x01'], block)
+        self.assertEqual(len(self.relays.peers['ok']), 1)
+
+    async def test_submit_nowait_does_not_block(self):
+        url = self.relays.url('slow')
+        received = []
+        async with BundleSubmitter([url]) as submitter:
+            started = time.perf_counter()
+            task = submitter.submit_nowait([b'\x01'], 1, callback=received.append)
+            self.assertLess(time.perf_counter() - started, 0.05)
+            self.assertFalse(task.done())
+        # close() waits for background submissions
+        self.assertEqual(len(received), 1)
+        self.assertTrue(received[0][0].ok)
+
+    async def test_flashbots_signature_header(self):
+        async with BundleSubmitter([self.relays.url('ok')], signing_key=SIGNING_KEY) as submitter:
+            await submitter.submit([b'\x01'], 1)
+        address, signature = self.relays.headers[0]['X-Flashbots-Signature'].split(':')
+        message = encode_defunct(text='0x' + keccak(self.relays.bodies[0]).hex())
+        self.assertEqual(Account.recover_message(message, signature=signature), address)
+        self.assertEqual(address, Account.from_key(SIGNING_KEY).address)
+
+
+if __name__ == '__main__':
+    unittest.main()
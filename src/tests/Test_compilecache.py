@@ -0,0 +1,112 @@
+# File: src/tests/test_compilecache.py
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.utils.CompileCache import CompileCache
+
+
+class RecordingCompiler:
+    """
+    Stands in for the solc subprocess: returns one artifact per `contract` in the source after a delay.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, source, version, settings):
+        with self.lock:
+            self.calls.append((source, version, settings))
+        time.sleep(self.delay)
+        names = [line.split()[1] for line in source.splitlines() if line.startswith('contract ')]
+        return {f'<stdin>:{name}': {'abi': [{'name': name}], 'bin': '6080' + name.encode().hex()} for name in names}
+
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.compiler = RecordingCompiler()
+        self.cache = CompileCache(os.path.join(self.root, 'cache'), solc_version='0.8.20',
+                                  settings={'optimize': True}, compile_fn=self.compiler)
+        self.write('lib/Math.sol', 'library Math {}\n')
+        self.write('Execute.sol', 'import "./lib/Math.sol";\ncontract Execute {}\n')
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_second_compile_is_served_from_disk(self):
+        path = os.path.join(self.root, 'Execute.sol')
+        artifacts = self.cache.compile_file(path)
+        self.assertEqual(list(artifacts), ['Execute'])
+        self.assertEqual(self.compiler.calls[0][1:], ('0.8.20', {'optimize': True, 'base_path': self.root,
+                                                                 'allow_paths': [self.root]}))
+
+        fresh = CompileCache(self.cache.cache_dir, solc_version='0.8.20', settings={'optimize': True},
+                             compile_fn=self.compiler)
+        self.assertEqual(fresh.compile_file(path), artifacts)
+        self.assertEqual(len(self.compiler.calls), 1)
+        self.assertEqual((fresh.hits, fresh.misses), (1, 0))
+
+        [artifact_file] = os.listdir(self.cache.cache_dir)
+        with open(os.path.join(self.cache.cache_dir, artifact_file)) as f:
+            self.assertEqual(json.load(f)['contracts']['Execute']['bin'], artifacts['Execute']['bin'])
+
+    def test_key_covers_imports_version_and_settings(self):
+        path = os.path.join(self.root, 'Execute.sol')
+        self.cache.compile_file(path)
+        self.write('lib/Math.sol', 'library Math { }\n')
+        self.cache.compile_file(path)
+        self.assertEqual(len(self.compiler.calls), 2)
+
+        for version, settings in (('0.8.21', {'optimize': True}), ('0.8.20', {'optimize': False})):
+            CompileCache(self.cache.cache_dir, version, settings, compile_fn=self.compiler).compile_file(path)
+        self.assertEqual(len(self.compiler.calls), 4)
+
+    def test_default_version_is_resolved_before_hashing(self):
+        versions = []
+        cache = CompileCache(self.cache.cache_dir, settings={'optimize': True}, compile_fn=self.compiler,
+                             version_fn=lambda: versions.append('0.8.20') or '0.8.20')
+        source = 'contract Execute {}\n'
+        self.assertEqual(cache.key(source), self.cache.key(source))
+        switched = CompileCache(self.cache.cache_dir, settings={'optimize': True}, compile_fn=self.compiler,
+                                version_fn=lambda: '0.8.24')
+        self.assertNotEqual(switched.key(source), cache.key(source))
+        cache.compile_source(source)
+        self.assertEqual(self.compiler.calls[-1][1], '0.8.20')
+        self.assertEqual(versions, ['0.8.20'])
+
+    def test_remapped_imports_are_hashed(self):
+        self.write('node_modules/@oz/IERC20.sol', 'interface IERC20 {}\n')
+        cache = CompileCache(self.cache.cache_dir, import_remappings={'@oz/': os.path.join(self.root, 'node_modules/@oz/')},
+                             compile_fn=self.compiler)
+        source = 'import "@oz/IERC20.sol";\ncontract Token {}\n'
+        key = cache.key(source)
+        self.write('node_modules/@oz/IERC20.sol', 'interface IERC20 { function x() external; }\n')
+        self.assertNotEqual(cache.key(source), key)
+        cache.compile_source(source)
+        settings = self.compiler.calls[-1][2]
+        self.assertEqual(settings['import_remappings'], [f"@oz/={os.path.join(self.root, 'node_modules/@oz/')}"])
+        self.assertIn(os.path.join(self.root, 'node_modules/@oz'), settings['allow_paths'])
+
+    def test_sources_compile_in_parallel(self):
+        self.compiler.delay = 0.2
+        paths = [self.write(f'C{i}.sol', f'contract C{i} {{}}\n') for i in range(4)]
+        started = time.perf_counter()
+        results = self.cache.compile_files(paths)
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual([list(results[path]) for path in paths], [['C0'], ['C1'], ['C2'], ['C3']])
+        self.assertEqual(len(self.cache.clear()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
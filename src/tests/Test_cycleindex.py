@@ -0,0 +1,60 @@
+# File: src/tests/test_cycleindex.py
+
+import unittest
+
+from src.bots.BellmanFord import build_graph_from_prices
+from src.bots.CycleIndex import CycleIndex
+from src.tests.Test_bellmanford import cycle_weight, random_prices
+
+
+class TestCycleIndex(unittest.TestCase):
+    def test_enumerates_each_cycle_once(self):
+        tokens = ['WETH', 'DAI', 'USDC', 'USDT']
+        graph = build_graph_from_prices({a: {b: 0.99 for b in tokens if b != a} for a in tokens})
+
+        index = CycleIndex(graph)
+        # 6 two-hop, 8 three-hop and 6 four-hop directed cycles in a complete 4-token graph
+        self.assertEqual(len(index.cycles), 20)
+        self.assertEqual(len({frozenset(zip(c, c[1:] + c[:1])) for c in index.cycles}), 20)
+        self.assertEqual(len(CycleIndex(graph, max_length=3).cycles), 14)
+
+    def test_anchors_restrict_index(self):
+        tokens = ['WETH', 'DAI', 'USDC', 'USDT', 'PEPE']
+        graph = build_graph_from_prices({a: {b: 0.99 for b in tokens if b != a} for a in tokens})
+        index = CycleIndex(graph, max_length=3, anchors=['WETH'])
+        self.assertTrue(index.cycles)
+        self.assertTrue(all('WETH' in cycle for cycle in index.cycles))
+
+    def test_price_tick_rescores_only_affected_cycles(self):
+        graph = build_graph_from_prices({
+            'WETH': {'DAI': 3000.0, 'USDC': 3000.0},
+            'DAI': {'USDC': 0.999, 'WETH': 1 / 3010.0},
+            'USDC': {'WETH': 1 / 3010.0, 'DAI': 0.999},
+        })
+        index = CycleIndex(graph)
+        self.assertEqual(index.profitable_cycles(), [])
+        self.assertEqual(len(index.cycles_for_edge('USDC', 'WETH')), 2)
+
+        found = index.update_rate('USDC', 'WETH', 1 / 2980.0)
+        self.assertEqual([cycle for cycle, _ in found], [['USDC', 'WETH', 'USDC'], ['DAI', 'USDC', 'WETH', 'DAI']])
+        self.assertAlmostEqual(found[0][1], 3000.0 / 2980.0)
+        self.assertEqual(index.update_rate('USDC', 'WETH', 1 / 3010.0), [])
+        self.assertEqual(index.update_rate('USDC', 'PEPE', 2.0), [])
+
+    def test_scores_match_graph_weights(self):
+        prices = random_prices(10, 0.4, 3)
+        graph = build_graph_from_prices(prices)
+        index = CycleIndex(graph, max_length=3)
+        for cycle, rate in index.profitable_cycles():
+            self.assertLess(cycle_weight(graph, cycle), 0)
+        u = next(token for token in prices if prices[token])
+        v = next(iter(prices[u]))
+        prices[u][v] *= 1.5
+        graph = build_graph_from_prices(prices)
+        for cycle, _ in index.update_rate(u, v, prices[u][v]):
+            self.assertIn((u, v), list(zip(cycle, cycle[1:])))
+            self.assertLess(cycle_weight(graph, cycle), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# File: src/tests/test_gasestimator.py
+
+import unittest
+
+from src.utils.GasEstimator import GasEstimator
+
+
+class FeeChain:
+    """
+    Stand-in for web3 v6 serving eth.fee_history and eth.estimate_gas, with call counters.
+    Block n has base fee 100 + n and rewards [n, 2n, 3n] at the requested percentiles.
+    """
+
+    def __init__(self, block):
+        self.block_number = block
+        self.fee_calls = []
+        self.estimates = 0
+        self.eth = self
+
+    def fee_history(self, count, newest, percentiles):
+        self.fee_calls.append((count, newest))
+        blocks = range(newest - count + 1, newest + 1)
+        return {
+            'oldestBlock': newest - count + 1,
+            'baseFeePerGas': [100 + n for n in blocks] + [100 + newest + 1],
+            'reward': [[n * (i + 1) for i in range(len(percentiles))] for n in blocks],
+        }
+
+    def estimate_gas(self, transaction):
+        self.estimates += 1
+        if transaction.get('data') == 'revert':
+            raise ValueError('execution reverted')
+        return 100_000
+
+
+class TestGasEstimator(unittest.TestCase):
+    def setUp(self):
+        self.chain = FeeChain(100)
+        self.estimator = GasEstimator(self.chain, window=10, percentiles=(10, 50, 90))
+
+    def test_window_is_fetched_incrementally(self):
+        self.assertTrue(self.estimator.update())
+        self.assertFalse(self.estimator.update(100))
+        self.chain.block_number = 103
+        self.assertTrue(self.estimator.update())
+        self.assertEqual(self.chain.fee_calls, [(10, 100), (3, 103)])
+        self.assertEqual(self.estimator.base_fee(), 204)
+        # Window now covers blocks 94..103; medians are truncated to whole wei
+        self.assertEqual(self.estimator.priority_fee(10), 98)
+        self.assertEqual(self.estimator.priority_fee(90), int(3 * 98.5))
+
+    def test_fee_fields_read_from_memory(self):
+        self.estimator.update()
+        calls = len(self.chain.fee_calls)
+        fields = self.estimator.fee_fields(50)
+        self.assertEqual(fields, {'maxFeePerGas': 2 * 201 + 191, 'maxPriorityFeePerGas': 191})
+        self.assertEqual(self.estimator.priority_fee(60), self.estimator.priority_fee(50))
+        self.assertEqual(self.estimator.bundle_cost(1000, 10), 1000 * (201 + 95))
+        self.assertEqual(len(self.chain.fee_calls), calls)
+
+    def test_gas_cached_per_contract_and_path_length(self):
+        self.estimator.update()
+        tx = {'to': '0xexec', 'data': '0x01'}
+        self.assertEqual(self.estimator.estimate_gas(tx, 3), 120_000)
+        self.estimator.estimate_gas({'to': '0xexec', 'data': '0x02'}, 3)
+        self.assertEqual(self.chain.estimates, 1)
+        self.estimator.estimate_gas(tx, 4)
+        self.assertEqual(self.chain.estimates, 2)
+
+        self.estimator.invalidate('0xexec')
+        self.estimator.estimate_gas(tx, 3)
+        self.assertEqual(self.chain.estimates, 3)
+
+        self.chain.block_number = 100 + self.estimator.gas_cache_blocks
+        self.estimator.update()
+        self.estimator.estimate_gas(tx, 3)
+        self.assertEqual(self.chain.estimates, 4)
+
+    def test_unseeded_model_refuses_to_price(self):
+        self.assertFalse(self.estimator.seeded)
+        for read in (self.estimator.base_fee, self.estimator.priority_fee, self.estimator.fee_fields,
+                     lambda: self.estimator.price_transaction({'to': '0xexec'}, 2)):
+            with self.assertRaises(RuntimeError):
+                read()
+        self.assertEqual(self.chain.estimates, 0)
+
+        # A failing RPC leaves it unseeded instead of raising from update()
+        def unavailable(*args):
+            raise ConnectionError('node down')
+
+        self.chain.fee_history = unavailable
+        self.assertFalse(self.estimator.update())
+        del self.chain.block_number
+        self.assertFalse(self.estimator.update())
+        self.assertFalse(self.estimator.seeded)
+
+    def test_contract_creation_is_not_cached(self):
+        self.estimator.update()
+        self.estimator.estimate_gas({'data': '0x6001'})
+        self.estimator.estimate_gas({'to': None, 'data': '0x6002'})
+        self.assertEqual(self.chain.estimates, 2)
+        self.assertEqual(self.estimator._gas_cache, {})
+
+    def test_failed_estimate_falls_back(self):
+        self.estimator.update()
+        self.assertIsNone(self.estimator.estimate_gas({'to': '0xexec', 'data': 'revert'}, 2))
+        priced = self.estimator.price_transaction({'to': '0xexec', 'data': 'revert'}, 2)
+        self.assertEqual(priced['gas'], self.estimator.default_gas)
+        self.assertIn('maxFeePerGas', priced)
+        # The failure is remembered for the block, then retried
+        self.assertEqual(self.chain.estimates, 1)
+        self.estimator.update(101)
+        self.assertEqual(self.estimator.estimate_gas({'to': '0xexec', 'data': 'x'}, 2), 120_000)
+        self.assertEqual(self.chain.estimates, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# File: src/tests/test_incremental.py
+
+import random
+import unittest
+
+from src.bots.BellmanFord import BellmanFordArbitrage, build_graph_from_prices
+from src.bots.IncrementalDetector import IncrementalArbitrageDetector
+from src.tests.Test_bellmanford import cycle_weight, random_prices
+
+
+class TestIncrementalArbitrageDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = IncrementalArbitrageDetector(build_graph_from_prices({
+            'WETH': {'DAI': 3000.0},
+            'DAI': {'USDC': 1.0},
+            'USDC': {'WETH': 1 / 3010.0},
+        }))
+
+    def test_update_opens_and_closes_cycle(self):
+        self.assertEqual(self.detector.active_cycles(), [])
+
+        new, broken = self.detector.update_edge('USDC', 'WETH', 1 / 2900.0)
+        self.assertEqual(new, [['DAI', 'USDC', 'WETH', 'DAI']])
+        self.assertEqual(broken, [])
+
+        new, broken = self.detector.update_edge('DAI', 'USDC', 0.95)
+        self.assertEqual(new, [])
+        self.assertEqual(broken, [['DAI', 'USDC', 'WETH', 'DAI']])
+        self.assertEqual(self.detector.active_cycles(), [])
+
+    def test_remove_edge_breaks_cycle(self):
+        self.detector.update_edge('USDC', 'WETH', 1 / 2900.0)
+        new, broken = self.detector.remove_edge('WETH', 'DAI')
+        self.assertEqual(broken, [['DAI', 'USDC', 'WETH', 'DAI']])
+        self.assertEqual(self.detector.remove_edge('WETH', 'DAI'), ([], []))
+
+    def test_new_tokens_are_added_on_the_fly(self):
+        self.detector.update_edge('DAI', 'PEPE', 1e6)
+        new, _ = self.detector.update_edge('PEPE', 'DAI', 1.1e-6)
+        self.assertEqual(new, [['DAI', 'PEPE', 'DAI']])
+
+    def test_matches_full_recompute_on_random_updates(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            prices = random_prices(10, 0.25, seed)
+            detector = IncrementalArbitrageDetector(build_graph_from_prices(prices))
+            for _ in range(30):
+                u, v = rng.sample(sorted(prices), 2)
+                if rng.random() < 0.2:
+                    detector.remove_edge(u, v)
+                    prices[u].pop(v, None)
+                else:
+                    prices[u][v] = rng.uniform(0.85, 1.02)
+                    detector.update_edge(u, v, prices[u][v])
+
+                active = detector.active_cycles()
+                expected = BellmanFordArbitrage(build_graph_from_prices(prices)).find_all_arbitrage()
+                self.assertEqual(bool(active), bool(expected))
+                for cycle, _ in active:
+                    self.assertLess(cycle_weight(detector.graph, cycle), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
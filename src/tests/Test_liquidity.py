@@ -0,0 +1,167 @@
+# File: src/tests/test_liquidity.py
+
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+
+from src.bots.LiquidityAggregator import AsyncLiquidityAggregator
+
+
+class MockRouterServer:
+    """
+    Local stand-in for several router APIs, served as /<router>/liquidity on one port.
+    """
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = {router: 0 for router in delays}
+        self.peak = {router: 0 for router in delays}
+        self.requests = {router: 0 for router in delays}
+        self.batch_requests = {router: 0 for router in delays}
+        self.runner = None
+        self.base_url = None
+
+    async def handle_liquidity(self, request):
+        router = request.match_info['router']
+        self.requests[router] += 1
+        self.in_flight[router] += 1
+        self.peak[router] = max(self.peak[router], self.in_flight[router])
+        try:
+            await asyncio.sleep(self.delays[router])
+        finally:
+            self.in_flight[router] -= 1
+        return web.json_response({
+            'router': router,
+            'pair': [request.query['token_1'], request.query['token_2']],
+            'liquidity': 1000.0,
+        })
+
+    async def handle_batch(self, request):
+        router = request.match_info['router']
+        if not router.startswith('batch'):
+            raise web.HTTPNotFound()
+        self.batch_requests[router] += 1
+        body = await request.json()
+        await asyncio.sleep(self.delays[router])
+        return web.json_response({'results': [
+            {'router': router, 'pair': [pair['token_1'], pair['token_2']], 'liquidity': 1000.0}
+            for pair in body['pairs']
+        ]})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/{router}/liquidity', self.handle_liquidity)
+        app.router.add_post('/{router}/liquidity/batch', self.handle_batch)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    def url(self, router):
+        return f'{self.base_url}/{router}'
+
+
+class TestAsyncLiquidityAggregator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = MockRouterServer({'fast': 0.01, 'medium': 0.05, 'stuck': 5.0})
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def test_queries_routers_concurrently(self):
+        routers = [self.server.url('fast'), self.server.url('medium')]
+        async with AsyncLiquidityAggregator(routers) as aggregator:
+            started = time.perf_counter()
+            results = await aggregator.aggregate_liquidity('WETH', 'DAI')
+            elapsed = time.perf_counter() - started
+        self.assertEqual(set(results), set(routers))
+        self.assertEqual(results[routers[0]]['pair'], ['WETH', 'DAI'])
+        self.assertLess(elapsed, 0.5)
+
+    async def test_deadline_returns_partial_results(self):
+        routers = [self.server.url('fast'), self.server.url('stuck')]
+        async with AsyncLiquidityAggregator(routers) as aggregator:
+            started = time.perf_counter()
+            results = await aggregator.aggregate_liquidity('WETH', 'DAI', deadline=0.3)
+            elapsed = time.perf_counter() - started
+        self.assertEqual(list(results), [self.server.url('fast')])
+        self.assertLess(elapsed, 1.0)
+
+    async def test_per_router_limit_and_many_pairs(self):
+        pairs = [(f'T{i}', 'WETH') for i in range(20)]
+        routers = [self.server.url('medium')]
+        async with AsyncLiquidityAggregator(routers, per_router_limit=4) as aggregator:
+            results = await aggregator.aggregate_liquidity_pairs(pairs)
+        self.assertEqual(set(results), set(pairs))
+        self.assertEqual(self.server.requests['medium'], 20)
+        self.assertLessEqual(self.server.peak['medium'], 4)
+        self.assertGreater(self.server.peak['medium'], 1)
+
+    async def test_unreachable_router_is_skipped(self):
+        routers = [self.server.url('fast'), 'http://127.0.0.1:9']
+        async with AsyncLiquidityAggregator(routers, request_timeout=1.0) as aggregator:
+            results = await aggregator.aggregate_liquidity('WETH', 'DAI')
+        self.assertEqual(list(results), [self.server.url('fast')])
+
+
+class TestAggregateLiquidityMany(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = MockRouterServer({'batch-fast': 0.01, 'fast': 0.01, 'slow': 0.5, 'stuck': 5.0})
+        await self.server.start()
+        self.pairs = [(f'T{i}', 'WETH') for i in range(25)]
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def collect(self, aggregator, deadline=None):
+        received = []
+        async for router_url, results in aggregator.aggregate_liquidity_many(self.pairs, deadline):
+            received.append((router_url, results))
+        return received
+
+    async def test_batches_and_single_requests(self):
+        batching, single = self.server.url('batch-fast'), self.server.url('fast')
+        async with AsyncLiquidityAggregator([batching, single], batch_sizes={batching: 10}) as aggregator:
+            received = await self.collect(aggregator)
+
+        self.assertEqual(self.server.batch_requests['batch-fast'], 3)
+        self.assertEqual(self.server.requests['batch-fast'], 0)
+        self.assertEqual(self.server.requests['fast'], 25)
+        for router_url in (batching, single):
+            pairs = set()
+            for url, results in received:
+                if url == router_url:
+                    pairs.update(results)
+            self.assertEqual(pairs, set(self.pairs))
+
+    async def test_results_stream_before_slow_router(self):
+        batching, slow = self.server.url('batch-fast'), self.server.url('slow')
+        async with AsyncLiquidityAggregator([slow, batching], batch_sizes={batching: 25}) as aggregator:
+            stream = aggregator.aggregate_liquidity_many(self.pairs)
+            router_url, results = await stream.__anext__()
+            await stream.aclose()
+        self.assertEqual(router_url, batching)
+        self.assertEqual(len(results), 25)
+
+    async def test_deadline_and_batch_fallback(self):
+        # 'fast' has no batch endpoint, so its batches fall back to single requests
+        fast, stuck = self.server.url('fast'), self.server.url('stuck')
+        async with AsyncLiquidityAggregator([fast, stuck], batch_sizes={fast: 10}) as aggregator:
+            started = time.perf_counter()
+            received = await self.collect(aggregator, deadline=0.5)
+            elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual({url for url, _ in received}, {fast})
+        self.assertEqual(sum(len(results) for _, results in received), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# File: src/tests/test_liquiditycache.py
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.bots.LiquidityAggregator import AsyncLiquidityAggregator
+from src.tests.Test_liquidity import MockRouterServer
+from src.utils.LiquidityCache import LiquidityCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLiquidityCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LiquidityCache(max_entries=2, ttl=10.0, clock=self.clock)
+
+    def test_ttl_expiry(self):
+        key = LiquidityCache.key('router', 'WETH', 'DAI')
+        self.cache.put(key, {'liquidity': 1})
+        self.assertEqual(self.cache.get(key), {'liquidity': 1})
+        self.clock.now = 10.0
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.stats()['expirations'], 1)
+
+    def test_block_expiry(self):
+        self.cache.set_block(100)
+        self.cache.put('pair', {'liquidity': 1})
+        self.assertIsNotNone(self.cache.get('pair'))
+        self.cache.set_block(101)
+        self.assertIsNone(self.cache.get('pair'))
+
+    def test_lru_eviction(self):
+        self.cache.put('a', 1)
+        self.cache.put('b', 2)
+        self.cache.get('a')
+        self.cache.put('c', 3)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_failed_fetch_is_not_cached(self):
+        self.assertIsNone(self.cache.get_or_fetch('pair', lambda: None))
+        self.assertEqual(self.cache.get_or_fetch('pair', lambda: {'liquidity': 1}), {'liquidity': 1})
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_concurrent_threads_share_one_fetch(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'liquidity': 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_fetch('pair', fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'liquidity': 1}] * 8)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'] + stats['coalesced'] + stats['hits'], 8)
+
+
+class TestAsyncLiquidityCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = MockRouterServer({'medium': 0.05})
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def test_concurrent_tasks_share_one_request(self):
+        cache = LiquidityCache()
+        async with AsyncLiquidityAggregator([self.server.url('medium')], cache=cache) as aggregator:
+            results = await asyncio.gather(*[aggregator.aggregate_liquidity('WETH', 'DAI') for _ in range(10)])
+            await aggregator.aggregate_liquidity('WETH', 'DAI')
+
+        self.assertEqual(self.server.requests['medium'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['coalesced'], 9)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    async def test_cancelled_owner_hands_fetch_to_waiter(self):
+        cache = LiquidityCache()
+        calls = []
+
+        async def fetch():
+            calls.append(len(calls))
+            await asyncio.sleep(0.05)
+            return {'rate': 3000.0}
+
+        owner = asyncio.ensure_future(cache.get_or_fetch_async('key', fetch))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.get_or_fetch_async('key', fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        self.assertEqual(await asyncio.gather(*waiters), [{'rate': 3000.0}] * 3)
+        self.assertTrue(owner.cancelled())
+        # One waiter took over; the other two coalesced on its fetch
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
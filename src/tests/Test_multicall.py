@@ -0,0 +1,129 @@
+# File: src/tests/test_multicall.py
+
+import math
+import unittest
+
+from src.utils.Multicall import (
+    AGGREGATE3_SELECTOR,
+    QUOTE_EXACT_INPUT_SINGLE_SELECTOR,
+    MulticallQuoter,
+    decode_aggregate3,
+    encode_aggregate3,
+    encode_quote_exact_input_single,
+)
+
+
+def word(data, index):
+    return int.from_bytes(data[32 * index:32 * (index + 1)], 'big')
+
+
+class LocalChain:
+    """
+    In-process chain stand-in: executes Multicall3.aggregate3 over a table of constant-product pools.
+    """
+
+    def __init__(self, reserves):
+        self.reserves = reserves
+        self.calls = []
+        self.eth = self
+
+    def call(self, transaction, block_identifier='latest'):
+        data = bytes.fromhex(transaction['data'][2:])
+        assert data[:4] == AGGREGATE3_SELECTOR
+        self.calls.append(transaction)
+        args = data[4:]
+        array = word(args, 0)
+        count = int.from_bytes(args[array:array + 32], 'big')
+        heads = args[array + 32:]
+
+        results = []
+        for i in range(count):
+            call = heads[word(heads, i):]
+            length = word(call, 3)
+            call_data = call[128:128 + length]
+            results.append(self.quote(call_data))
+
+        # Encode (bool, bytes)[] the long way round
+        tails = [b''.join([(1 if ok else 0).to_bytes(32, 'big'), (64).to_bytes(32, 'big'),
+                           len(out).to_bytes(32, 'big'), out]) for ok, out in results]
+        offsets, position = [], 32 * len(tails)
+        for tail in tails:
+            offsets.append(position.to_bytes(32, 'big'))
+            position += len(tail)
+        return (32).to_bytes(32, 'big') + len(tails).to_bytes(32, 'big') + b''.join(offsets) + b''.join(tails)
+
+    def quote(self, call_data):
+        assert call_data[:4] == QUOTE_EXACT_INPUT_SINGLE_SELECTOR
+        args = call_data[4:]
+        token_in = '0x' + args[12:32].hex()
+        token_out = '0x' + args[44:64].hex()
+        fee, amount_in = word(args, 2), word(args, 3)
+        pool = self.reserves.get((token_in, token_out, fee))
+        if pool is None:
+            return False, b''
+        reserve_in, reserve_out = pool
+        amount_in_with_fee = amount_in * (10**6 - fee)
+        amount_out = amount_in_with_fee * reserve_out // (reserve_in * 10**6 + amount_in_with_fee)
+        return True, amount_out.to_bytes(32, 'big')
+
+
+def token(i):
+    return '0x' + f'{i:040x}'
+
+
+class TestMulticallEncoding(unittest.TestCase):
+    def test_round_trip_shapes(self):
+        encoded = encode_aggregate3([(token(1), True, b'\x01\x02'), (token(2), False, b'')])
+        self.assertEqual(encoded[:4], AGGREGATE3_SELECTOR)
+        self.assertEqual(len(encoded[4:]) % 32, 0)
+
+    def test_decode(self):
+        chain = LocalChain({(token(1), token(2), 3000): (10**21, 3 * 10**24)})
+        data = chain.call({'data': '0x' + encode_aggregate3([
+            (token(9), True, encode_quote_exact_input_single(token(1), token(2), 3000, 10**18)),
+            (token(9), True, encode_quote_exact_input_single(token(2), token(1), 3000, 10**18)),
+        ]).hex()})
+        (ok, out), (failed, empty) = decode_aggregate3(data)
+        self.assertTrue(ok)
+        self.assertGreater(int.from_bytes(out, 'big'), 0)
+        self.assertFalse(failed)
+        self.assertEqual(empty, b'')
+
+
+class TestMulticallQuoter(unittest.TestCase):
+    def setUp(self):
+        self.reserves = {}
+        self.pairs = []
+        for i in range(1000):
+            pair = (token(i), token(i + 1), 3000 if i % 2 else 500)
+            self.reserves[pair] = (10**21, (i + 1) * 10**21)
+            self.pairs.append(pair)
+        self.chain = LocalChain(self.reserves)
+
+    def test_prices_many_pairs_in_few_calls(self):
+        rates = MulticallQuoter(self.chain).get_prices(self.pairs)
+
+        # The default 30M gas cap fits 200 quotes of 150k gas per aggregate call
+        self.assertEqual(len(self.chain.calls), 5)
+        self.assertEqual(rates.shape, (1000,))
+        for i in (0, 1, 999):
+            reserve_in, reserve_out = self.reserves[self.pairs[i]]
+            fee = self.pairs[i][2]
+            expected = 10**18 * (10**6 - fee) * reserve_out // (reserve_in * 10**6 + 10**18 * (10**6 - fee))
+            self.assertEqual(rates[i], expected / 10**18)
+
+    def test_batches_respect_gas_and_payload_limits(self):
+        self.assertEqual(MulticallQuoter(self.chain, gas_limit=3_000_000, gas_per_quote=100_000).batch_size(), 30)
+        self.assertEqual(MulticallQuoter(self.chain, max_payload_bytes=35_200).batch_size(), 100)
+        MulticallQuoter(self.chain, gas_limit=3_000_000, gas_per_quote=100_000).get_prices(self.pairs[:95])
+        self.assertEqual(len(self.chain.calls), 4)
+        self.assertTrue(all(call['gas'] == 3_000_000 for call in self.chain.calls))
+
+    def test_failed_quotes_are_nan(self):
+        rates = MulticallQuoter(self.chain).get_prices([(token(1), token(2)), (token(5), token(1))], fee=3000)
+        self.assertFalse(math.isnan(rates[0]))
+        self.assertTrue(math.isnan(rates[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# File: src/tests/test_noncemanager.py
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.NonceManager import NonceManager
+
+
+class CountingChain:
+    """
+    Stand-in for web3 exposing eth.get_transaction_count and counting how often it is called.
+    """
+
+    def __init__(self, nonce):
+        self.nonce = nonce
+        self.calls = 0
+        self.eth = self
+
+    def get_transaction_count(self, address, block_identifier):
+        self.calls += 1
+        return self.nonce
+
+
+class TestNonceManager(unittest.TestCase):
+    def setUp(self):
+        self.chain = CountingChain(7)
+        self.manager = NonceManager(self.chain, '0xbot')
+
+    def test_seeds_once_then_counts_locally(self):
+        self.assertEqual([self.manager.next_nonce() for _ in range(3)], [7, 8, 9])
+        self.assertEqual(self.chain.calls, 1)
+
+    def test_seed_skips_chain_until_sync(self):
+        self.manager.seed(5)
+        self.assertEqual(self.manager.next_nonce(), 5)
+        self.assertEqual(self.manager.peek(), 6)
+        self.assertEqual(self.chain.calls, 0)
+        self.manager.sync()
+        self.assertEqual(self.manager.peek(), 7)
+
+    def test_threads_get_distinct_nonces(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            nonces = list(pool.map(lambda _: self.manager.next_nonce(), range(1000)))
+        self.assertEqual(sorted(nonces), list(range(7, 1007)))
+
+    def test_tasks_get_distinct_nonces(self):
+        async def build():
+            await asyncio.sleep(0)
+            return self.manager.next_nonce()
+
+        async def main():
+            return await asyncio.gather(*(build() for _ in range(200)))
+
+        self.assertEqual(sorted(asyncio.run(main())), list(range(7, 207)))
+
+    def test_reserve_is_consecutive_and_disjoint(self):
+        barrier = threading.Barrier(8)
+
+        def reserve(_):
+            barrier.wait()
+            return self.manager.reserve(5)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            blocks = list(pool.map(reserve, range(8)))
+        for block in blocks:
+            self.assertEqual(block, list(range(block[0], block[0] + 5)))
+        self.assertEqual(sorted(n for block in blocks for n in block), list(range(7, 47)))
+
+    def test_release_reclaims_only_the_latest_block(self):
+        first = self.manager.reserve(2)
+        second = self.manager.reserve(2)
+        self.assertFalse(self.manager.release(first))
+        self.assertTrue(self.manager.release(second))
+        self.assertEqual(self.manager.next_nonce(), 9)
+
+    def test_resync_after_dropped_bundle_and_nonce_error(self):
+        self.manager.reserve(3)
+        self.assertEqual(self.manager.sync(), 7)
+        self.assertEqual(self.manager.next_nonce(), 7)
+
+        self.chain.nonce = 12
+        self.assertFalse(self.manager.handle_error(Exception('insufficient funds')))
+        self.assertTrue(self.manager.handle_error(Exception('Nonce too low: next nonce 12')))
+        self.assertEqual(self.manager.next_nonce(), 12)
+        self.assertEqual(asyncio.run(self.manager.sync_async()), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# File: src/tests/test_parallel.py
+
+import unittest
+
+from src.bots.BellmanFord import BellmanFordArbitrage, build_graph_from_prices
+from src.bots.ParallelArbitrage import ParallelBellmanFordArbitrage, strongly_connected_components
+from src.tests.Test_bellmanford import random_prices
+
+
+class TestStronglyConnectedComponents(unittest.TestCase):
+    def test_components(self):
+        graph = {
+            'WETH': {'DAI': 0.0},
+            'DAI': {'WETH': 0.0, 'PEPE': 0.0},
+            'PEPE': {'SHIB': 0.0},
+            'SHIB': {'PEPE': 0.0, 'DOGE': 0.0},
+        }
+        components = sorted(sorted(component) for component in strongly_connected_components(graph))
+        self.assertEqual(components, [['DAI', 'WETH'], ['DOGE'], ['PEPE', 'SHIB']])
+
+
+class TestParallelBellmanFordArbitrage(unittest.TestCase):
+    def setUp(self):
+        prices = {}
+        # Three disjoint random markets joined by one-way bridges
+        for market in range(3):
+            for base, quotes in random_prices(8, 0.4, market).items():
+                prices[f'{base}.{market}'] = {f'{quote}.{market}': rate for quote, rate in quotes.items()}
+        prices['T0.0']['T0.1'] = 1.0
+        prices['T0.1']['T0.2'] = 1.0
+        prices['LONELY'] = {'T0.0': 1.0}
+        self.graph = build_graph_from_prices(prices)
+
+    def test_skips_acyclic_singletons(self):
+        detector = ParallelBellmanFordArbitrage(self.graph, max_workers=1)
+        self.assertNotIn('LONELY', detector.component_of)
+        self.assertEqual(len(detector.components), 3)
+
+    def test_matches_sequential_search(self):
+        expected = {tuple(cycle) for cycle, _ in BellmanFordArbitrage(self.graph).find_all_arbitrage()}
+        with ParallelBellmanFordArbitrage(self.graph, max_workers=2, min_parallel_edges=0) as detector:
+            found = detector.find_all_arbitrage()
+        rates = [rate for _, rate in found]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertTrue(expected)
+        self.assertLessEqual(expected, {tuple(cycle) for cycle, _ in found})
+
+    def test_giant_component_and_small_ones_use_the_pool(self):
+        prices = {f'{base}.big': {f'{quote}.big': rate for quote, rate in quotes.items()}
+                  for base, quotes in random_prices(40, 0.4, 7).items()}
+        for market in range(30):
+            for base, quotes in random_prices(4, 0.8, market).items():
+                prices[f'{base}.{market}'] = {f'{quote}.{market}': rate for quote, rate in quotes.items()}
+        graph = build_graph_from_prices(prices)
+        with ParallelBellmanFordArbitrage(graph, max_workers=1) as serial:
+            expected = {tuple(cycle) for cycle, _ in serial.find_all_arbitrage()}
+            self.assertIsNone(serial._executor)
+
+        # Default threshold: only the giant component reaches it, the rest is batched
+        with ParallelBellmanFordArbitrage(graph, max_workers=2) as detector:
+            found = detector.find_all_arbitrage()
+            self.assertIsNotNone(detector._executor)
+        self.assertEqual(expected, {tuple(cycle) for cycle, _ in found})
+
+    def test_find_arbitrage_only_searches_reachable_components(self):
+        detector = ParallelBellmanFordArbitrage(self.graph, max_workers=1)
+        cycle = detector.find_arbitrage('T0.2')
+        self.assertIsNotNone(cycle)
+        self.assertTrue(all(token.endswith('.2') for token in cycle))
+
+
+if __name__ == '__main__':
+    unittest.main()
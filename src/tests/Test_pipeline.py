@@ -0,0 +1,135 @@
+# File: src/tests/test_pipeline.py
+
+import asyncio
+import unittest
+
+from src.bots.LiquidityAggregator import AsyncLiquidityAggregator
+from src.bots.Pipeline import ArbitragePipeline, CoalescingQueue, EdgeUpdate, LiquidityFeed
+from src.tests.Test_liquidity import MockRouterServer
+
+
+class ListFeed:
+    def __init__(self, updates):
+        self.updates = updates
+
+    async def run(self, emit):
+        for update in self.updates:
+            await emit(update)
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("Condition not reached in time")
+        await asyncio.sleep(0.01)
+
+
+class TestCoalescingQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_merges_pending_updates_for_same_pair(self):
+        queue = CoalescingQueue(maxsize=2)
+        await queue.put(('WETH', 'DAI'), 1)
+        await queue.put(('WETH', 'DAI'), 2)
+        await queue.put(('DAI', 'USDC'), 3)
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.merged, 1)
+        self.assertEqual(await queue.get(), 2)
+
+    async def test_new_pairs_block_when_full(self):
+        queue = CoalescingQueue(maxsize=1)
+        await queue.put('a', 1)
+        blocked = asyncio.ensure_future(queue.put('b', 2))
+        await asyncio.sleep(0.05)
+        self.assertFalse(blocked.done())
+        # Re-pricing a waiting pair never blocks
+        await asyncio.wait_for(queue.put('a', 3), 0.1)
+        self.assertEqual(await queue.get(), 3)
+        await asyncio.wait_for(blocked, 0.1)
+        self.assertEqual(await queue.get(), 2)
+
+
+class TestArbitragePipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_feed_to_sink(self):
+        feed = ListFeed([
+            EdgeUpdate('WETH', 'DAI', 3000.0, venue='uniswap-v3', pool='0xuni', fee=500, block=7),
+            EdgeUpdate('DAI', 'USDC', 1.0, venue='curve', pool='0xcurve', block=7),
+            EdgeUpdate('USDC', 'WETH', 1 / 3010.0, venue='uniswap-v3', pool='0xusdc', block=7),
+            EdgeUpdate('WETH', 'DAI', 3020.0, venue='sushiswap', pool='0xsushi', fee=3000, block=7),
+        ])
+        received = []
+        async with ArbitragePipeline([feed], received.append) as pipeline:
+            await wait_for(lambda: received)
+            stats = pipeline.stats()
+
+        opportunity = received[0]
+        self.assertEqual(opportunity.cycle, ['DAI', 'USDC', 'WETH', 'DAI'])
+        self.assertAlmostEqual(opportunity.rate_product, 3020.0 / 3010.0)
+        self.assertEqual(opportunity.block, 7)
+        self.assertIn('0xsushi', [hop.pool for hop in opportunity.route])
+        self.assertEqual(stats['quotes'], 4)
+        self.assertEqual(stats['opportunities'], 1)
+
+    async def test_liquidity_feed(self):
+        server = MockRouterServer({'fast': 0.0})
+        await server.start()
+        try:
+            async with AsyncLiquidityAggregator([server.url('fast')]) as aggregator:
+                feed = LiquidityFeed(aggregator, [('WETH', 'DAI'), ('DAI', 'WETH')], interval=60,
+                                     to_rate=lambda data: data['liquidity'])
+                async with ArbitragePipeline([feed], lambda opportunity: None) as pipeline:
+                    await wait_for(lambda: pipeline.stats()['edges'] == 2)
+                    self.assertEqual(len(pipeline.token_graph), 2)
+        finally:
+            await server.stop()
+
+    async def test_bad_quote_does_not_stall_stages(self):
+        feed = ListFeed([
+            EdgeUpdate('WETH', 'DAI', -1.0, venue='broken'),
+            EdgeUpdate('WETH', 'DAI', 3000.0, venue='uniswap'),
+        ])
+        async with ArbitragePipeline([feed], lambda opportunity: None) as pipeline:
+            await wait_for(lambda: pipeline.stats()['edges'] == 1)
+            self.assertEqual(pipeline.stats()['errors'], 1)
+
+    async def test_liquidity_feed_drops_invalid_rates(self):
+        class Quotes:
+            def aggregate_liquidity(self, token_1, token_2):
+                return {'nan': {'rate': float('nan')}, 'negative': {'rate': -2.0}, 'zero': {'rate': 0},
+                        'text': {'rate': 'n/a'}, 'ok': {'rate': 2.0}}
+
+        emitted = []
+
+        async def emit(update):
+            emitted.append(update)
+
+        task = asyncio.ensure_future(LiquidityFeed(Quotes(), [('WETH', 'DAI')], interval=60).run(emit))
+        await wait_for(lambda: emitted)
+        await asyncio.sleep(0.01)
+        task.cancel()
+        self.assertEqual([(update.venue, update.rate) for update in emitted], [('ok', 2.0)])
+
+    async def test_liquidity_feed_survives_failing_round(self):
+        class FlakyQuotes:
+            calls = 0
+
+            def aggregate_liquidity(self, token_1, token_2):
+                FlakyQuotes.calls += 1
+                if FlakyQuotes.calls == 1:
+                    raise ConnectionError('router down')
+                return {'ok': {'rate': 2.0}}
+
+        emitted = []
+
+        async def emit(update):
+            emitted.append(update)
+
+        feed = LiquidityFeed(FlakyQuotes(), [('WETH', 'DAI')], interval=0.01)
+        task = asyncio.ensure_future(feed.run(emit))
+        await wait_for(lambda: emitted)
+        task.cancel()
+        self.assertGreaterEqual(FlakyQuotes.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# File: src/tests/test_replay.py
+
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.bots.BellmanFord import SPFAArbitrage
+from src.bots.Pipeline import ArbitragePipeline, EdgeUpdate
+from src.bots.ReplayEngine import FullRecompute, IncrementalReplay, ReplayEngine
+from src.tests.Test_pipeline import ListFeed, wait_for
+from src.utils.MarketRecorder import MarketRecorder, MarketTape
+
+
+def record_market(directory, blocks=20, flush_rows=7):
+    """
+    WETH/DAI/USDC quoted on two venues every block; block 12 opens WETH -> DAI -> USDC -> WETH.
+    """
+    with MarketRecorder(directory, flush_rows=flush_rows) as recorder:
+        for block in range(100, 100 + blocks):
+            skew = 1.02 if block == 112 else 0.99
+            recorder.record(block, 'WETH', 'DAI', 3000.0, '0xuni', 'uniswap', 3000, 5e5)
+            recorder.record(block, 'WETH', 'DAI', 2990.0, '0xsushi', 'sushiswap', 3000, 1e5)
+            recorder.record(block, 'DAI', 'USDC', 1.0, '0xcurve', 'curve', 400, 2e6)
+            recorder.record(block, 'USDC', 'WETH', skew / 3000.0, '0xusdc', 'uniswap', 500, 2e4)
+            recorder.record(block, 'DAI', 'WETH', 0.99 / 3000.0, '0xuni', 'uniswap', 3000, 5e5)
+
+
+class TestMarketTape(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_round_trip_and_append(self):
+        record_market(self.directory, blocks=10)
+        record_market(self.directory, blocks=0)
+        with MarketRecorder(self.directory) as recorder:
+            recorder.record(110, 'WETH', 'LINK', 200.0, '0xlink', 'uniswap', 3000, 1.0)
+
+        tape = MarketTape(self.directory)
+        self.assertEqual(len(tape), 51)
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, 'rate.bin')), 51 * 8)
+        self.assertEqual(tape.tokens, ['WETH', 'DAI', 'USDC', 'LINK'])
+        self.assertIsInstance(tape.columns['rate'], np.memmap)
+        self.assertEqual(tape.pools[tape['pool'][1]], '0xsushi')
+        self.assertEqual(tape['liquidity'][3], 2e4)
+        self.assertEqual(tape.tokens[tape['token_out'][-1]], 'LINK')
+
+        slices = list(tape.block_slices())
+        self.assertEqual(len(slices), 11)
+        self.assertEqual(slices[-1], (110, 50, 51))
+        self.assertEqual(list(tape.block_slices(105, 106)), [(105, 25, 30), (106, 30, 35)])
+
+    def test_reopen_after_interrupted_flush(self):
+        with MarketRecorder(self.directory) as recorder:
+            recorder.record(1, 'WETH', 'DAI', 1.0)
+            recorder.record(1, 'DAI', 'WETH', 2.0)
+        # The flush was cut off before the last rate reached disk
+        path = os.path.join(self.directory, 'rate.bin')
+        os.truncate(path, os.path.getsize(path) - 8)
+
+        with MarketRecorder(self.directory) as recorder:
+            recorder.record(2, 'WETH', 'DAI', 3.0)
+        tape = MarketTape(self.directory)
+        self.assertEqual(tape['block'].tolist(), [1, 2])
+        self.assertEqual(tape['rate'].tolist(), [1.0, 3.0])
+        self.assertTrue(all(len(column) == 2 for column in tape.columns.values()))
+
+
+class TestReplayEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        record_market(self.directory)
+        self.engine = ReplayEngine(MarketTape(self.directory))
+
+    def test_variants_find_the_planted_block(self):
+        reports = self.engine.compare({
+            'full': lambda: FullRecompute(start_token='WETH'),
+            'spfa-all': lambda: FullRecompute(SPFAArbitrage),
+            'incremental': IncrementalReplay,
+        })
+        for report in reports.values():
+            self.assertEqual(report.blocks, 20)
+            self.assertEqual(report.updates, 100)
+            self.assertEqual({opportunity.block for opportunity in report.opportunities}, {112})
+
+        opportunity = reports['incremental'].opportunities[0]
+        self.assertAlmostEqual(opportunity.rate_product, 1.02)
+        # The shallowest hop (USDC -> WETH) bounds the trade
+        self.assertEqual(opportunity.min_liquidity, 2e4)
+        self.assertGreater(reports['incremental'].updates_per_second, 0)
+
+    def test_block_range(self):
+        report = self.engine.replay(IncrementalReplay(), 'incremental', start_block=113)
+        self.assertEqual(report.blocks, 7)
+        self.assertEqual(report.opportunities, [])
+
+
+class TestPipelineRecording(unittest.IsolatedAsyncioTestCase):
+    async def test_pipeline_records_quotes(self):
+        directory = tempfile.mkdtemp()
+        recorder = MarketRecorder(directory)
+        feed = ListFeed([
+            EdgeUpdate('WETH', 'DAI', 3000.0, pool='0xuni', block=7, liquidity=5.0),
+            EdgeUpdate('DAI', 'USDC', 1.0, pool='0xcurve'),
+        ])
+        async with ArbitragePipeline([feed], lambda opportunity: None, recorder=recorder) as pipeline:
+            await wait_for(lambda: pipeline.stats()['quotes'] == 2)
+        tape = MarketTape(directory)
+        self.assertEqual(tape['block'].tolist(), [7, 7])
+        self.assertEqual(tape['liquidity'].tolist(), [5.0, 0.0])
+        self.assertTrue(math.isclose(tape['rate'][0], 3000.0))
+
+    async def test_lagging_feed_keeps_blocks_monotonic(self):
+        directory = tempfile.mkdtemp()
+        recorder = MarketRecorder(directory)
+        feed = ListFeed([
+            EdgeUpdate('WETH', 'DAI', 3000.0, block=9),
+            EdgeUpdate('DAI', 'USDC', 1.0, block=8),
+            EdgeUpdate('USDC', 'WETH', 0.0003, block=10),
+        ])
+        async with ArbitragePipeline([feed], lambda opportunity: None, recorder=recorder) as pipeline:
+            await wait_for(lambda: pipeline.stats()['quotes'] == 3)
+        self.assertEqual(MarketTape(directory)['block'].tolist(), [9, 9, 10])
+        self.assertEqual(pipeline.last_block, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,300 @@
+# File: src/tests/test_scheduler.py
+
+import asyncio
+import json
+import math
+import time
+import unittest
+
+from eth_utils import to_checksum_address
+
+from src.bots.AMMQuoteEngine import AMMQuoteEngine
+from src.bots.BellmanFord import Hop
+from src.bots.CycleSizer import CycleSizer
+from src.bots.Pipeline import Opportunity
+from src.bots.Scheduler import BundleExecutor, OpportunityScheduler
+from src.tests.Test_bundlesubmitter import LocalRelays
+from src.tests.Test_gasestimator import FeeChain
+from src.tests.Test_noncemanager import CountingChain
+from src.tests.Test_pipeline import wait_for
+from src.utils.BundleSubmitter import BundleSubmitter
+from src.utils.GasEstimator import GasEstimator
+from src.utils.NonceManager import NonceManager
+from src.utils.TransactionFactory import TransactionFactory
+
+
+def opportunity(pools, rate_product, block=None):
+    tokens = [f'T{i}' for i in range(len(pools))] + ['T0']
+    route = [Hop(tokens[i], tokens[i + 1], 1.0, 'uniswap', pool, 3000) for i, pool in enumerate(pools)]
+    return Opportunity(tokens, rate_product, route, block, time.time())
+
+
+class Recorder:
+    """
+    Handler recording execution order and the peak number of concurrent executions.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.executed = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, item):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            self.executed.append(item)
+        finally:
+            self.active -= 1
+
+
+class TestOpportunityScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_best_first_with_bounded_workers(self):
+        handler = Recorder(delay=0.02)
+        scheduler = OpportunityScheduler(handler, workers=2)
+        for i, rate in enumerate((1.01, 1.05, 1.02, 1.04, 1.03, 0.99)):
+            scheduler.schedule(opportunity([f'0x{i}a', f'0x{i}b'], rate))
+        self.assertEqual(scheduler.counters['unprofitable'], 1)
+
+        async with scheduler:
+            await wait_for(lambda: scheduler.counters['executed'] == 5)
+        self.assertEqual(handler.peak, 2)
+        profits = [round(item.expected_profit, 2) for item in handler.executed]
+        self.assertEqual(sorted(profits[:2]), [0.04, 0.05])
+        self.assertEqual(profits[2:], [0.03, 0.02, 0.01])
+
+    async def test_merges_cycles_sharing_pools(self):
+        scheduler = OpportunityScheduler(Recorder())
+        self.assertTrue(scheduler.schedule(opportunity(['0xa', '0xb'], 1.02)))
+        # A fresher quote of the same cycle replaces it even when it is worth less
+        self.assertTrue(scheduler.schedule(opportunity(['0xa', '0xb'], 1.01)))
+        # A worse cycle through a queued pool loses; a better one displaces the queued one
+        self.assertFalse(scheduler.schedule(opportunity(['0xb', '0xc'], 1.005)))
+        self.assertTrue(scheduler.schedule(opportunity(['0xb', '0xc', '0xd'], 1.03)))
+        self.assertTrue(scheduler.schedule(opportunity(['0xe', '0xf'], 1.01)))
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.counters['merged'], 3)
+        self.assertEqual(scheduler._pop().pools, {'0xb', '0xc', '0xd'})
+
+    async def test_full_queue_evicts_least_profitable(self):
+        scheduler = OpportunityScheduler(Recorder(), max_pending=2)
+        scheduler.schedule(opportunity(['0xa'], 1.02))
+        scheduler.schedule(opportunity(['0xb'], 1.01))
+        self.assertFalse(scheduler.schedule(opportunity(['0xc'], 1.005)))
+        self.assertTrue(scheduler.schedule(opportunity(['0xd'], 1.03)))
+        self.assertEqual([scheduler._pop().pools for _ in range(2)], [{'0xd'}, {'0xa'}])
+        self.assertEqual(scheduler.counters['evicted'], 2)
+
+    async def test_drops_opportunities_whose_block_passed(self):
+        handler = Recorder(delay=0.5)
+        scheduler = OpportunityScheduler(handler, workers=1)
+        scheduler.schedule(opportunity(['0xa'], 1.05, block=100))
+        scheduler.schedule(opportunity(['0xb'], 1.01, block=100))
+        self.assertEqual(scheduler._pending[0].target_block, 101)
+
+        async with scheduler:
+            await wait_for(lambda: scheduler.stats()['running'] == 1)
+            # Block 101 arrives: the queued one and the one being executed are both dropped
+            scheduler.schedule(opportunity(['0xc'], 1.02, block=101))
+            await wait_for(lambda: scheduler.counters['expired'] == 2)
+            self.assertEqual(len(scheduler), 0)
+        self.assertEqual(handler.executed, [])
+        self.assertEqual(scheduler.counters['executed'], 0)
+
+    async def test_drops_opportunities_that_waited_too_long(self):
+        handler = Recorder()
+        scheduler = OpportunityScheduler(handler, max_age=0.05)
+        scheduler.schedule(opportunity(['0xa'], 1.05))
+        await asyncio.sleep(0.1)
+        async with scheduler:
+            await wait_for(lambda: scheduler.counters['expired'] == 1)
+        self.assertEqual(handler.executed, [])
+
+    async def test_failures_do_not_stop_workers(self):
+        calls = []
+
+        async def handler(item):
+            calls.append(item)
+            if len(calls) == 1:
+                raise RuntimeError("relay down")
+
+        async with OpportunityScheduler(handler, workers=1) as scheduler:
+            scheduler.schedule(opportunity(['0xa'], 1.05))
+            scheduler.schedule(opportunity(['0xb'], 1.01))
+            await wait_for(lambda: scheduler.counters['executed'] == 1)
+        self.assertEqual(scheduler.counters['failed'], 1)
+
+
+WETH, DAI, USDC = (to_checksum_address('0x' + byte * 20) for byte in ('c0', '6b', 'a0'))
+
+
+def add_v3_pool(engine, address, token0, token1, reserve0, reserve1, fee=3000):
+    # In-range V3 pool with the same curve as a V2 pool holding these reserves
+    return engine.add_v3_pool(address, token0, token1, fee, math.isqrt((reserve1 << 192) // reserve0),
+                              math.isqrt(reserve0 * reserve1))
+
+
+class FixedFees:
+    seeded = True
+
+    def update(self, block_number=None):
+        return False
+
+    def base_fee(self):
+        return 10 * 10**9
+
+    def priority_fee(self, percentile=50):
+        return percentile * 10**7
+
+
+class TestBundleExecutor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.relays = LocalRelays()
+        await self.relays.start()
+        engine = AMMQuoteEngine()
+        add_v3_pool(engine, '0xweth-dai', WETH, DAI, 1_000 * 10**18, 3_000_000 * 10**18)
+        add_v3_pool(engine, '0xdai-usdc', DAI, USDC, 5_000_000 * 10**18, 5_000_000 * 10**18)
+        add_v3_pool(engine, '0xusdc-weth', USDC, WETH, 2_940_000 * 10**18, 1_000 * 10**18)
+        self.engine = engine
+        self.graph = engine.to_token_graph()
+        self.chain = CountingChain(7)
+        self.factory = TransactionFactory(to_checksum_address('0x' + 'ab' * 20), '0x' + '11' * 32)
+        self.submitter = BundleSubmitter([self.relays.url('ok')])
+        self.executor = BundleExecutor(CycleSizer(engine), self.factory, self.submitter,
+                                       NonceManager(self.chain, '0xbot'), FixedFees(), percentiles=(25, 75))
+
+    async def asyncTearDown(self):
+        await self.submitter.close()
+        self.factory.close()
+        await self.relays.stop()
+
+    def opportunity(self, tokens, block=100):
+        return Opportunity(tokens, 1.02, self.graph.route(tokens), block, time.time())
+
+    async def test_sizes_signs_and_submits_for_target_block(self):
+        async with OpportunityScheduler(self.executor, estimate=self.executor.estimate) as scheduler:
+            self.assertTrue(scheduler.schedule(self.opportunity([WETH, DAI, USDC, WETH])))
+            self.assertFalse(scheduler.schedule(self.opportunity([WETH, USDC, DAI, WETH])))
+            await wait_for(lambda: scheduler.counters['executed'] == 1)
+
+        self.assertEqual(len(self.relays.bodies), 2)
+        bundles = [json.loads(body)['params'][0] for body in self.relays.bodies]
+        self.assertEqual({bundle['blockNumber'] for bundle in bundles}, {hex(101)})
+        self.assertEqual(self.executor.nonce_manager.peek(), 8)
+
+    async def test_nonce_released_when_no_relay_accepts(self):
+        self.submitter.relay_urls = [self.relays.url('reject')]
+        scheduler = OpportunityScheduler(self.executor, current_block=99)
+        scheduler.schedule(self.opportunity([WETH, DAI, USDC, WETH]))
+        results = await self.executor(scheduler._pop())
+        self.assertFalse(any(result.ok for result in results))
+        self.assertEqual(self.executor.nonce_manager.peek(), 7)
+
+    def scheduled(self, tokens, block):
+        scheduler = OpportunityScheduler(self.executor)
+        scheduler.schedule(self.opportunity(tokens, block))
+        return scheduler._pop()
+
+    async def test_resyncs_once_the_in_flight_block_has_passed(self):
+        cycle = [WETH, DAI, USDC, WETH]
+        await self.executor(self.scheduled(cycle, 100))
+        self.assertEqual((self.executor.nonce_manager.peek(), self.chain.calls), (8, 1))
+
+        # Not included in block 101: the next block's bundle reuses nonce 7
+        await self.executor(self.scheduled(cycle, 101))
+        self.assertEqual((self.executor.nonce_manager.peek(), self.chain.calls), (8, 2))
+
+        # Included in block 102: the chain has moved on to nonce 8
+        self.chain.nonce = 8
+        await self.executor(self.scheduled(cycle, 102))
+        self.assertEqual((self.executor.nonce_manager.peek(), self.chain.calls), (9, 3))
+
+    async def test_same_block_bundles_share_one_nonce_one_at_a_time(self):
+        active, peak = [0], [0]
+        submit = self.submitter.submit
+
+        async def counting_submit(transactions, block, trace_ids=None):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            try:
+                await asyncio.sleep(0.02)
+                return await submit(transactions, block, trace_ids)
+            finally:
+                active[0] -= 1
+
+        self.submitter.submit = counting_submit
+        self.executor.percentiles = [50]
+        results = await asyncio.gather(self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100)),
+                                       self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100)))
+        self.assertEqual([len(batch) for batch in results], [1, 1])
+        self.assertTrue(all(result.ok for batch in results for result in batch))
+        self.assertEqual(peak[0], 1)
+        # Both bundles for block 101 bid nonce 7, so at most one of them can land
+        self.assertEqual((self.executor.nonce_manager.peek(), self.chain.calls), (8, 1))
+
+    async def test_resyncs_when_the_nonce_cannot_be_reclaimed(self):
+        self.submitter.relay_urls = [self.relays.url('reject')]
+        submit = self.submitter.submit
+        manager = self.executor.nonce_manager
+
+        async def submit_while_another_sender_takes_a_nonce(transactions, block, trace_ids=None):
+            manager.next_nonce()
+            return await submit(transactions, block, trace_ids)
+
+        self.submitter.submit = submit_while_another_sender_takes_a_nonce
+        await self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100))
+        # Nonces 7 and 8 are gone locally, but neither was used on chain
+        self.assertEqual((manager.peek(), self.chain.calls), (7, 2))
+
+    async def test_routes_the_contract_cannot_trade_are_not_executed(self):
+        opportunity = self.opportunity([WETH, DAI, USDC, WETH])
+        self.assertGreater(self.executor.estimate(opportunity), 0)
+        for kind in ('v2', 'v3-500'):
+            engine = AMMQuoteEngine()
+            if kind == 'v2':
+                engine.add_v2_pool('0xweth-dai', WETH, DAI, 1_000 * 10**18, 3_000_000 * 10**18)
+            else:
+                add_v3_pool(engine, '0xweth-dai', WETH, DAI, 1_000 * 10**18, 3_000_000 * 10**18, fee=500)
+            add_v3_pool(engine, '0xdai-usdc', DAI, USDC, 5_000_000 * 10**18, 5_000_000 * 10**18)
+            add_v3_pool(engine, '0xusdc-weth', USDC, WETH, 2_940_000 * 10**18, 1_000 * 10**18)
+            self.executor.sizer = CycleSizer(engine)
+            self.assertFalse(self.executor.executable(opportunity.route))
+            self.assertEqual(self.executor.estimate(opportunity), 0.0)
+            self.assertEqual(await self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100)), [])
+        self.assertEqual(self.relays.bodies, [])
+        self.assertIsNone(self.executor.nonce_manager.peek())
+
+    async def test_refreshes_real_fee_model_once_per_target_block(self):
+        chain = FeeChain(0)
+        self.executor.gas_estimator = GasEstimator(chain, window=5, percentiles=(25, 75))
+        base_fees = []
+        build_variants = self.factory.build_variants
+
+        def recording_build_variants(path, amounts, tips, nonce, base_fee):
+            base_fees.append(base_fee)
+            return build_variants(path, amounts, tips, nonce, base_fee)
+
+        self.factory.build_variants = recording_build_variants
+        await self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100))
+        await self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100))
+        # One eth_feeHistory for target block 101, read up to block 100; block 101's base fee is 201
+        self.assertEqual(chain.fee_calls, [(5, 100)])
+        self.assertEqual(base_fees, [201, 201])
+
+    async def test_does_not_sign_without_fee_history(self):
+        chain = FeeChain(0)
+
+        def unavailable(*args):
+            raise ConnectionError('node down')
+
+        chain.fee_history = unavailable
+        self.executor.gas_estimator = GasEstimator(chain)
+        self.assertEqual(await self.executor(self.scheduled([WETH, DAI, USDC, WETH], 100)), [])
+        self.assertEqual(self.relays.bodies, [])
+        self.assertIsNone(self.executor.nonce_manager.peek())
+
+
+if __name__ == '__main__':
+    unittest.main()
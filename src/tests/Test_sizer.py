@@ -0,0 +1,65 @@
+# File: src/tests/test_sizer.py
+
+import unittest
+
+from src.bots.AMMQuoteEngine import Q96, AMMQuoteEngine
+from src.bots.CycleSizer import CycleSizer
+
+
+class TestCycleSizer(unittest.TestCase):
+    def setUp(self):
+        self.engine = AMMQuoteEngine()
+        # WETH -> DAI -> USDC -> WETH is mispriced by ~2% on the USDC/WETH leg
+        self.engine.add_v2_pool('0xweth-dai', 'WETH', 'DAI', 1_000 * 10**18, 3_000_000 * 10**18)
+        self.engine.add_v2_pool('0xdai-usdc', 'DAI', 'USDC', 5_000_000 * 10**18, 5_000_000 * 10**18)
+        self.engine.add_v2_pool('0xusdc-weth', 'USDC', 'WETH', 2_940_000 * 10**18, 1_000 * 10**18)
+        # A shallow copy of the same mispricing through a V3 pool
+        sqrt_price = int((1 / 2940) ** 0.5 * Q96)
+        self.engine.add_v3_pool('0xusdc-weth-v3', 'USDC', 'WETH', 500, sqrt_price, 10**21)
+        self.graph = self.engine.to_token_graph()
+        self.sizer = CycleSizer(self.engine)
+
+    def route(self, *pools):
+        tokens = ['WETH', 'DAI', 'USDC', 'WETH']
+        hops = []
+        for i, pool in enumerate(pools):
+            edges = self.graph.edges_between(tokens[i], tokens[i + 1])
+            hops.append(self.graph.hop(next(edge for edge in edges if self.graph.pools[edge] == pool)))
+        return hops
+
+    def test_amount_maximizes_exact_profit(self):
+        route = self.route('0xweth-dai', '0xdai-usdc', '0xusdc-weth')
+        [sized] = self.sizer.size([route])
+        self.assertEqual(sized.amount_out, self.engine.simulate_route(route, sized.amount_in))
+        self.assertEqual(sized.profit, sized.amount_out - sized.amount_in)
+        for factor in (0.5, 0.9, 0.99, 1.01, 1.1, 2.0):
+            amount = int(sized.amount_in * factor)
+            self.assertLessEqual(self.engine.simulate_route(route, amount) - amount, sized.profit)
+
+    def test_ranks_by_depth_not_spot_rate(self):
+        deep = self.route('0xweth-dai', '0xdai-usdc', '0xusdc-weth')
+        shallow = self.route('0xweth-dai', '0xdai-usdc', '0xusdc-weth-v3')
+        ranked = self.sizer.size([shallow, deep])
+        self.assertEqual([cycle.route[-1].pool for cycle in ranked], ['0xusdc-weth', '0xusdc-weth-v3'])
+        self.assertGreater(ranked[0].profit, ranked[1].profit)
+
+    def test_unprofitable_and_gas_bound_cycles_are_dropped(self):
+        reverse = self.graph.route(['WETH', 'USDC', 'DAI', 'WETH'])
+        self.assertEqual(self.sizer.size([reverse]), [])
+
+        route = self.route('0xweth-dai', '0xdai-usdc', '0xusdc-weth')
+        [sized] = self.sizer.size([route])
+        expensive = CycleSizer(self.engine, gas_cost=sized.profit + 1)
+        self.assertEqual(expensive.size([route]), [])
+        priced = CycleSizer(self.engine, token_prices={'WETH': 2.0}, gas_cost_per_hop=10)
+        self.assertEqual(priced.size([route])[0].net_profit, sized.profit * 2.0 - 30)
+
+    def test_input_is_capped(self):
+        route = self.route('0xweth-dai', '0xdai-usdc', '0xusdc-weth')
+        capped = CycleSizer(self.engine, max_amounts={'WETH': 10**18})
+        [sized] = capped.size([route])
+        self.assertEqual(sized.amount_in, 10**18)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# File: src/tests/test_tracing.py
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from src.bots.Pipeline import ArbitragePipeline, EdgeUpdate
+from src.tests.Test_pipeline import ListFeed, wait_for
+from src.utils.Tracing import STAGES, Tracer, tracer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracer = Tracer(enabled=True, clock=self.clock)
+
+    def run_trace(self, delays):
+        trace_id = self.tracer.start()
+        for stage, delay in zip(STAGES[1:], delays):
+            self.clock.now += delay
+            self.tracer.mark(trace_id, stage)
+        self.tracer.finish(trace_id)
+        return trace_id
+
+    def test_disabled_records_nothing(self):
+        disabled = Tracer(enabled=False)
+        trace_id = disabled.start()
+        self.assertIsNone(trace_id)
+        disabled.mark(trace_id, 'detection')
+        disabled.mark_many([trace_id], 'sizing')
+        disabled.finish(disabled.fork(trace_id))
+        self.assertEqual(disabled.histograms, {})
+
+    def test_stage_latencies(self):
+        trace_id = self.run_trace([0.001, 0.002, 0.0003, 0.004, 0.02])
+        self.assertEqual([stage for stage, _ in self.tracer.trace(trace_id)], list(STAGES))
+        self.assertAlmostEqual(self.tracer.trace(trace_id)[-1][1], 0.0273)
+        self.assertEqual(self.tracer.histograms['detection'].count, 1)
+        self.assertAlmostEqual(self.tracer.histograms['total'].sum, 0.0273)
+
+    def test_fork_shares_history(self):
+        parent = self.tracer.start()
+        self.clock.now += 0.001
+        child = self.tracer.fork(parent)
+        self.tracer.mark(child, 'detection')
+        self.assertEqual(len(self.tracer.trace(parent)), 1)
+        self.assertEqual([stage for stage, _ in self.tracer.trace(child)], ['fetch', 'detection'])
+
+    def test_prometheus_and_json_exports(self):
+        self.run_trace([0.001, 0.002])
+        self.run_trace([0.003, 0.2])
+        text = self.tracer.prometheus_text()
+        self.assertIn('# TYPE bfas_stage_latency_seconds histogram', text)
+        self.assertIn('bfas_stage_latency_seconds_bucket{stage="detection",le="0.0025"} 1', text)
+        self.assertIn('bfas_stage_latency_seconds_bucket{stage="detection",le="+Inf"} 2', text)
+        self.assertIn('bfas_stage_latency_seconds_count{stage="total"} 2', text)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            self.tracer.dump_json(path)
+            with open(path) as f:
+                dump = json.load(f)
+        self.assertEqual(dump['histograms']['graph_update']['count'], 2)
+        self.assertEqual(len(dump['traces']), 2)
+
+        server = self.tracer.serve_prometheus(0)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            self.assertEqual(urllib.request.urlopen(url).read().decode(), self.tracer.prometheus_text())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestPipelineTracing(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tracer.reset()
+        tracer.enabled = True
+
+    async def asyncTearDown(self):
+        tracer.enabled = False
+        tracer.reset()
+
+    async def test_opportunity_carries_trace(self):
+        feed = ListFeed([
+            EdgeUpdate('WETH', 'DAI', 3000.0, trace_id=tracer.start()),
+            EdgeUpdate('DAI', 'USDC', 1.0, trace_id=tracer.start()),
+            EdgeUpdate('USDC', 'WETH', 1 / 2990.0, trace_id=tracer.start()),
+        ])
+        received = []
+        async with ArbitragePipeline([feed], received.append) as pipeline:
+            await wait_for(lambda: received)
+        trace_id = received[0].trace_id
+        self.assertIsNotNone(trace_id)
+        self.assertEqual([stage for stage, _ in tracer.trace(trace_id)], ['fetch', 'graph_update', 'detection'])
+        self.assertEqual(pipeline.stats()['opportunities'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# File: src/tests/test_transactionfactory.py
+
+import unittest
+
+from eth_account import Account
+from eth_utils import to_checksum_address
+
+from src.utils.TransactionFactory import TransactionFactory, encode_execute_arbitrage
+
+PRIVATE_KEY = '0x' + '11' * 32
+CONTRACT = to_checksum_address('0x' + 'ab' * 20)
+PATH = ['0x' + 'c0' * 20, '0x' + '6b' * 20, '0x' + 'a0' * 20, '0x' + 'c0' * 20]
+
+
+def reference_calldata(path, amount_in):
+    # Straightforward ABI layout: selector, offset, amount, length, addresses
+    words = [64, amount_in, len(path)] + [int(token, 16) for token in path]
+    return bytes.fromhex('8955e68d') + b''.join(word.to_bytes(32, 'big') for word in words)
+
+
+class TestTransactionFactory(unittest.TestCase):
+    def setUp(self):
+        self.factory = TransactionFactory(CONTRACT, PRIVATE_KEY, max_workers=2, min_parallel=8)
+
+    def tearDown(self):
+        self.factory.close()
+
+    def test_calldata_matches_abi_layout(self):
+        for amount in (0, 1, 10**18, 2**256 - 1):
+            self.assertEqual(self.factory.calldata(PATH, amount), reference_calldata(PATH, amount))
+        self.assertEqual(encode_execute_arbitrage(PATH[:2], 5), reference_calldata(PATH[:2], 5))
+
+    def test_templates_are_bounded(self):
+        factory = TransactionFactory(CONTRACT, PRIVATE_KEY, max_templates=2)
+        for i in range(5):
+            factory.calldata(PATH[:2 + i % 3], i)
+        self.assertEqual(len(factory._templates), 2)
+
+    def test_variants_cover_sizes_and_tips(self):
+        variants = self.factory.build_variants(PATH, [10**18, 2 * 10**18], [1, 2, 3], nonce=4, base_fee=10)
+        self.assertEqual(len(variants), 6)
+        self.assertEqual({tx['nonce'] for tx in variants}, {4})
+        self.assertEqual(variants[-1]['maxFeePerGas'], 23)
+        self.assertEqual(variants[-1]['data'], reference_calldata(PATH, 2 * 10**18))
+
+    def test_parallel_signatures_match_in_process(self):
+        variants = self.factory.build_variants(PATH, [10**18 + i for i in range(8)], [1, 2], nonce=0, base_fee=10)
+        signed = self.factory.sign_many(variants)
+        self.assertIsNotNone(self.factory._executor)
+        self.assertEqual(signed, [self.factory.sign(tx) for tx in variants])
+        sender = Account.from_key(PRIVATE_KEY).address
+        self.assertEqual(Account.recover_transaction(signed[0]), sender)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# File: /offchain/utils/bundle_simulator.py
+
+import logging
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+import requests
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class Candidate(NamedTuple):
+    """
+    A signed executeArbitrage transaction to try before submission, with caller data carried along.
+    """
+    raw_transaction: bytes
+    expected_profit: float = 0.0
+    payload: Any = None
+
+
+class SimulationResult(NamedTuple):
+    candidate: Candidate
+    success: bool
+    gas_used: int
+    profit: int
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class ForkClient:
+    def __init__(self, rpc_url: str, timeout: float = 5.0):
+        """
+        Minimal JSON-RPC client for a local forked node (anvil, hardhat or an eth-tester server)
+        over a keep-alive session. Used by one simulation worker at a time.
+        :param rpc_url: HTTP endpoint of the fork
+        :param timeout: Timeout for a single RPC call, in seconds
+        """
+        self.rpc_url = rpc_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._request_id = 0
+        # Cleared when the fork could not be snapshotted or rolled back; its state is then unknown
+        self.healthy = True
+
+    def call(self, method: str, params: List) -> Any:
+        self._request_id += 1
+        response = self.session.post(self.rpc_url, json={'jsonrpc': '2.0', 'id': self._request_id,
+                                                         'method': method, 'params': params},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        body = response.json()
+        if 'error' in body:
+            raise RuntimeError(body['error'].get('message', str(body['error'])))
+        return body['result']
+
+    def simulate(self, candidate: Candidate, profit_account: str) -> SimulationResult:
+        """
+        Executes the candidate on the fork inside a snapshot, measures it, and rolls the state back.
+        """
+        started = time.perf_counter()
+        try:
+            snapshot = self.call('evm_snapshot', [])
+        except Exception as e:
+            self._retire('snapshot', e)
+            return SimulationResult(candidate, False, 0, 0, str(e), time.perf_counter() - started)
+        try:
+            balance_before = int(self.call('eth_getBalance', [profit_account, 'latest']), 16)
+            tx_hash = self.call('eth_sendRawTransaction', ['0x' + bytes(candidate.raw_transaction).hex()])
+            receipt = self.call('eth_getTransactionReceipt', [tx_hash])
+            if receipt is None:
+                return SimulationResult(candidate, False, 0, 0, 'not mined', time.perf_counter() - started)
+            gas_used = int(receipt['gasUsed'], 16)
+            if int(receipt['status'], 16) != 1:
+                return SimulationResult(candidate, False, gas_used, 0, 'reverted', time.perf_counter() - started)
+            balance_after = int(self.call('eth_getBalance', [profit_account, 'latest']), 16)
+            return SimulationResult(candidate, True, gas_used, balance_after - balance_before, None,
+                                    time.perf_counter() - started)
+        except Exception as e:
+            return SimulationResult(candidate, False, 0, 0, str(e), time.perf_counter() - started)
+        finally:
+            # A failed rollback must not replace the measured result or abort the batch
+            try:
+                self.call('evm_revert', [snapshot])
+            except Exception as e:
+                self._retire('revert', e)
+
+    def _retire(self, step: str, error: Exception) -> None:
+        self.healthy = False
+        logging.error(f"Fork {self.rpc_url} failed to {step}, taking it out of rotation: {str(error)}")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class BundleSimulator:
+    def __init__(self, fork_urls: List[str], profit_account: str, rpc_timeout: float = 5.0):
+        """
+        Runs candidate bundles against local forks before they are sent to relays. Each fork is
+        used by one worker at a time (snapshot, execute, measure, revert), so simulations scale
+        with the number of forks started for the current block. A fork that fails to snapshot or
+        roll back is left out of rotation for the rest of the simulator's life.
+        :param fork_urls: RPC endpoints of local forks of the current head
+        :param profit_account: Account whose ETH balance change is the realized profit
+                               (the Execute contract owner)
+        :param rpc_timeout: Timeout for a single fork RPC call, in seconds
+        """
+        self.profit_account = profit_account
+        self.forks: 'queue.Queue[Optional[ForkClient]]' = queue.Queue()
+        self.clients = [ForkClient(url, rpc_timeout) for url in fork_urls]
+        for client in self.clients:
+            self.forks.put(client)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.clients))
+
+    def _run(self, candidate: Candidate) -> SimulationResult:
+        client = self.forks.get()
+        if client is None:
+            # Every fork has been retired; keep the marker queued for the other workers
+            self.forks.put(None)
+            return SimulationResult(candidate, False, 0, 0, 'no healthy fork')
+        try:
+            return client.simulate(candidate, self.profit_account)
+        finally:
+            if client.healthy:
+                self.forks.put(client)
+            elif not any(other.healthy for other in self.clients):
+                self.forks.put(None)
+
+    def simulate(self, candidates: Sequence[Candidate], budget: Optional[float] = None) -> List[SimulationResult]:
+        """
+        Simulates candidates in parallel across the forks.
+        :param candidates: Signed candidate transactions, most promising first
+        :param budget: Seconds available (e.g. what is left of the block time); candidates not
+                       finished by then are reported as failed with error 'budget'
+        :return: One result per candidate, in input order
+        """
+        futures = [self.executor.submit(self._run, candidate) for candidate in candidates]
+        done, _ = wait(futures, timeout=budget)
+        results = []
+        for candidate, future in zip(candidates, futures):
+            if future in done:
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(SimulationResult(candidate, False, 0, 0, 'budget'))
+        succeeded = sum(result.success for result in results)
+        logging.info(f"Simulated {len(candidates)} candidates, {succeeded} succeeded")
+        return results
+
+    def select(self, candidates: Sequence[Candidate], top_k: int = 3, min_profit: int = 1,
+               budget: Optional[float] = None) -> List[SimulationResult]:
+        """
+        Simulates candidates and keeps the most profitable ones that did not revert.
+        :param top_k: Maximum number of bundles to pass on to the submitter
+        :param min_profit: Smallest realized profit (wei) worth submitting
+        :return: Results sorted by realized profit, best first
+        """
+        results = [result for result in self.simulate(candidates, budget)
+                   if result.success and result.profit >= min_profit]
+        results.sort(key=lambda result: result.profit, reverse=True)
+        return results[:top_k]
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self) -> 'BundleSimulator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
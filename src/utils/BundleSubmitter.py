@@ -0,0 +1,190 @@
+# File: /offchain/utils/bundle_submitter.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+
+import aiohttp
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils import keccak
+
+from src.utils.Tracing import tracer
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class RelayResult(NamedTuple):
+    """
+    Outcome of sending one bundle to one relay.
+    """
+    relay: str
+    ok: bool
+    latency: float
+    status: Optional[int] = None
+    response: Optional[Dict] = None
+    error: Optional[str] = None
+
+
+def _relay_stats() -> Dict[str, float]:
+    return {'sent': 0, 'ok': 0, 'failed': 0, 'timeouts': 0, 'last_latency': 0.0, 'avg_latency': 0.0}
+
+
+class BundleSubmitter:
+    def __init__(self, relay_urls: List[str], signing_key: Optional[str] = None, request_timeout: float = 2.0,
+                 deadlines: Optional[Dict[str, float]] = None, max_connections: int = 100,
+                 keepalive_timeout: float = 60.0):
+        """
+        Sends signed bundles (eth_sendBundle) to several relays at once over persistent keep-alive
+        sessions. Every relay gets its own deadline, and latency and outcome are recorded per relay.
+        Use as an async context manager so the connection pool is closed.
+        :param relay_urls: Relay JSON-RPC endpoints (e.g. https://relay.flashbots.net)
+        :param signing_key: Key used for the X-Flashbots-Signature header (no header if not given)
+        :param request_timeout: Default per-relay deadline in seconds
+        :param deadlines: Per-relay deadline overrides in seconds
+        :param max_connections: Size of the shared connection pool
+        :param keepalive_timeout: How long idle relay connections are kept warm, in seconds
+        """
+        self.relay_urls = relay_urls
+        self.signer = Account.from_key(signing_key) if signing_key else None
+        self.request_timeout = request_timeout
+        self.deadlines = deadlines or {}
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        self.stats: Dict[str, Dict[str, float]] = {relay: _relay_stats() for relay in relay_urls}
+        self._request_id = 0
+        self._pending: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> 'BundleSubmitter':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Opens the shared connection pool (called implicitly on first use).
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self) -> None:
+        """
+        Waits for background submissions and closes the connection pool.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def warm(self) -> None:
+        """
+        Opens a connection to every relay ahead of the first bundle so submission skips the handshake.
+        """
+        await self.start()
+
+        async def touch(relay: str) -> None:
+            try:
+                async with self.session.post(relay, data=self._payload('eth_blockNumber', []),
+                                             timeout=aiohttp.ClientTimeout(total=self._deadline(relay))) as response:
+                    await response.read()
+            except Exception as e:
+                logging.warning(f"Could not warm connection to {relay}: {str(e)}")
+
+        await asyncio.gather(*(touch(relay) for relay in self.relay_urls))
+
+    async def submit(self, signed_transactions: Sequence[bytes], block_number: int,
+                     trace_ids: Optional[Sequence[Optional[int]]] = None) -> List[RelayResult]:
+        """
+        Sends one bundle to every relay concurrently.
+        :param signed_transactions: Raw signed transactions, in bundle order
+        :param block_number: Block the bundle targets
+        :param trace_ids: Traces of the opportunities in the bundle, closed once every relay has answered
+        :return: One RelayResult per relay, in relay_urls order
+        """
+        await self.start()
+        bundle = {
+            'txs': ['0x' + bytes(transaction).hex() for transaction in signed_transactions],
+            'blockNumber': hex(block_number),
+        }
+        body = self._payload('eth_sendBundle', [bundle])
+        headers = self._headers(body)
+        results = await asyncio.gather(*(self._send(relay, body, headers) for relay in self.relay_urls))
+        tracer.mark_many(trace_ids, 'submission')
+        for trace_id in trace_ids or ():
+            tracer.finish(trace_id)
+        accepted = sum(result.ok for result in results)
+        logging.info(f"Bundle for block {block_number} accepted by {accepted}/{len(results)} relays")
+        return list(results)
+
+    def submit_nowait(self, signed_transactions: Sequence[bytes], block_number: int,
+                      callback: Optional[Callable[[List[RelayResult]], None]] = None,
+                      trace_ids: Optional[Sequence[Optional[int]]] = None) -> asyncio.Task:
+        """
+        Schedules submit() in the background so the caller (e.g. the detection loop) is not blocked.
+        :param callback: Called with the relay results once every relay has answered or timed out
+        :return: The background task
+        """
+        task = asyncio.ensure_future(self.submit(signed_transactions, block_number, trace_ids))
+        self._pending.add(task)
+
+        def done(finished: asyncio.Task) -> None:
+            self._pending.discard(finished)
+            if callback is not None and not finished.cancelled() and finished.exception() is None:
+                callback(finished.result())
+
+        task.add_done_callback(done)
+        return task
+
+    def _deadline(self, relay: str) -> float:
+        return self.deadlines.get(relay, self.request_timeout)
+
+    def _payload(self, method: str, params: List) -> bytes:
+        self._request_id += 1
+        return json.dumps({'jsonrpc': '2.0', 'id': self._request_id, 'method': method, 'params': params}).encode()
+
+    def _headers(self, body: bytes) -> Dict[str, str]:
+        headers = {'Content-Type': 'application/json'}
+        if self.signer is not None:
+            # Flashbots authentication: EIP-191 signature over the hex keccak of the body
+            message = encode_defunct(text='0x' + keccak(body).hex())
+            signature = self.signer.sign_message(message).signature.hex()
+            headers['X-Flashbots-Signature'] = f"{self.signer.address}:{signature}"
+        return headers
+
+    async def _send(self, relay: str, body: bytes, headers: Dict[str, str]) -> RelayResult:
+        started = time.perf_counter()
+        try:
+            async with self.session.post(relay, data=body, headers=headers,
+                                         timeout=aiohttp.ClientTimeout(total=self._deadline(relay))) as response:
+                payload = await response.json(content_type=None)
+                ok = response.status == 200 and isinstance(payload, dict) and 'error' not in payload
+                error = None if ok else str(payload.get('error') if isinstance(payload, dict) else payload)
+                result = RelayResult(relay, ok, time.perf_counter() - started, response.status, payload, error)
+        except asyncio.TimeoutError:
+            result = RelayResult(relay, False, time.perf_counter() - started, error='timeout')
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = RelayResult(relay, False, time.perf_counter() - started, error=str(e))
+        self._record(result)
+        return result
+
+    def _record(self, result: RelayResult) -> None:
+        stats = self.stats.setdefault(result.relay, _relay_stats())
+        stats['sent'] += 1
+        stats['ok' if result.ok else 'failed'] += 1
+        if result.error == 'timeout':
+            stats['timeouts'] += 1
+        stats['last_latency'] = result.latency
+        stats['avg_latency'] += (result.latency - stats['avg_latency']) / stats['sent']
+        if not result.ok:
+            logging.warning(f"Relay {result.relay} rejected bundle: {result.error}")
@@ -0,0 +1,165 @@
+# File: /offchain/utils/compile_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+IMPORT_PATTERN = re.compile(r'import\s+(?:[^"\';]*\s+from\s+)?["\']([^"\']+)["\']')
+
+# Artifacts for one source: contract name -> {'abi': [...], 'bin': '0x...'}
+Artifacts = Dict[str, Dict]
+
+
+def _solc_compile(source: str, version: Optional[str], settings: Dict) -> Dict[str, Dict]:
+    # py-solc-x is only needed on a cache miss
+    import solcx
+
+    return solcx.compile_source(source, output_values=['abi', 'bin'], solc_version=version, **settings)
+
+
+def _solc_default_version() -> str:
+    import solcx
+
+    return str(solcx.get_solc_version())
+
+
+class CompileCache:
+    def __init__(self, cache_dir: str = 'build/cache', solc_version: Optional[str] = None,
+                 settings: Optional[Dict] = None, import_remappings: Optional[Dict[str, str]] = None,
+                 max_workers: int = 4, compile_fn: Optional[Callable[[str, Optional[str], Dict], Dict]] = None,
+                 version_fn: Optional[Callable[[], str]] = None):
+        """
+        On-disk cache of compiled ABI and bytecode artifacts. Entries are keyed by the SHA-256
+        of the source, every local file it imports, the compiler version and the compiler
+        settings, so a redeploy of unchanged contracts skips solc entirely.
+        :param cache_dir: Directory holding one JSON artifact file per cache key
+        :param solc_version: solc version to compile with (solcx's active version if not given; it is
+                             resolved before hashing so switching compilers invalidates the cache)
+        :param settings: Extra solcx.compile_source keyword arguments (optimize, optimize_runs, evm_version, ...)
+        :param import_remappings: Import prefix -> local directory (e.g. {'@openzeppelin/': 'node_modules/@openzeppelin/'})
+        :param max_workers: Sources compiled concurrently by compile_files
+        :param compile_fn: Compiler entry point (source, version, settings) -> solcx-style output
+        :param version_fn: Returns the version compile_fn uses when solc_version is not given
+                           (defaults to solcx.get_solc_version with the default compiler)
+        """
+        self.cache_dir = cache_dir
+        self.solc_version = solc_version
+        self.settings = settings or {}
+        self.import_remappings = import_remappings or {}
+        self.max_workers = max_workers
+        self.compile_fn = compile_fn or _solc_compile
+        self.version_fn = version_fn or (_solc_default_version if compile_fn is None else None)
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, path: str, base_dir: str) -> Optional[str]:
+        for prefix, target in self.import_remappings.items():
+            if path.startswith(prefix):
+                return os.path.join(target, path[len(prefix):])
+        if path.startswith('.'):
+            return os.path.normpath(os.path.join(base_dir, path))
+        return None
+
+    def _hash_imports(self, source: str, base_dir: str, digest, seen: Set[str]) -> None:
+        for path in IMPORT_PATTERN.findall(source):
+            resolved = self._resolve(path, base_dir)
+            digest.update(path.encode())
+            if resolved is None or resolved in seen or not os.path.isfile(resolved):
+                continue
+            seen.add(resolved)
+            with open(resolved) as f:
+                imported = f.read()
+            digest.update(imported.encode())
+            self._hash_imports(imported, os.path.dirname(resolved), digest, seen)
+
+    def _version(self) -> Optional[str]:
+        if self.solc_version is None and self.version_fn is not None:
+            self.solc_version = self.version_fn()
+        return self.solc_version
+
+    def _solc_settings(self, base_dir: str) -> Dict:
+        # Relative imports are resolved from base_path, and solc only reads files under allow_paths
+        settings = dict(self.settings)
+        base_path = os.path.abspath(base_dir)
+        # solc substitutes the prefix textually, so a target's trailing slash must survive abspath
+        remappings = {prefix: os.path.abspath(target) + ('/' if target.endswith('/') else '')
+                      for prefix, target in self.import_remappings.items()}
+        settings['base_path'] = base_path
+        settings['allow_paths'] = [base_path] + sorted({target.rstrip('/') for target in remappings.values()})
+        if remappings:
+            settings['import_remappings'] = [f'{prefix}={target}' for prefix, target in remappings.items()]
+        return settings
+
+    def key(self, source: str, base_dir: str = '.') -> str:
+        """
+        Cache key for a source compiled with this cache's compiler version and settings.
+        """
+        self._version()
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'solc': self.solc_version, 'settings': self.settings,
+                                  'remappings': self.import_remappings}, sort_keys=True).encode())
+        digest.update(source.encode())
+        self._hash_imports(source, base_dir, digest, set())
+        return digest.hexdigest()
+
+    def compile_source(self, source: str, base_dir: str = '.') -> Artifacts:
+        """
+        Returns the artifacts for a source, compiling only when the cache has no fresh entry.
+        :param base_dir: Directory relative imports are resolved from
+        :return: Contract name -> {'abi', 'bin'}
+        """
+        key = self.key(source, base_dir)
+        path = os.path.join(self.cache_dir, f'{key}.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                self.hits += 1
+                return json.load(f)['contracts']
+
+        self.misses += 1
+        output = self.compile_fn(source, self.solc_version, self._solc_settings(base_dir))
+        # solcx keys contracts as '<stdin>:Name'
+        contracts = {name.split(':')[-1]: {'abi': compiled['abi'], 'bin': compiled['bin']}
+                     for name, compiled in output.items()}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'solc': self.solc_version, 'settings': self.settings, 'contracts': contracts}, f)
+        os.replace(temporary, path)
+        logging.info(f"Compiled {', '.join(contracts)} into {path}")
+        return contracts
+
+    def compile_file(self, path: str) -> Artifacts:
+        with open(path) as f:
+            source = f.read()
+        return self.compile_source(source, os.path.dirname(os.path.abspath(path)))
+
+    def compile_files(self, paths: Sequence[str]) -> Dict[str, Artifacts]:
+        """
+        Compiles several source files concurrently (solc runs as a subprocess per source).
+        :return: Source path -> artifacts
+        """
+        if len(paths) < 2 or self.max_workers < 2:
+            return {path: self.compile_file(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+            return dict(zip(paths, pool.map(self.compile_file, paths)))
+
+    def clear(self) -> List[str]:
+        """
+        Deletes every cached artifact.
+        :return: Removed file paths
+        """
+        removed = []
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed.append(os.path.join(self.cache_dir, name))
+        return removed
@@ -1,24 +1,172 @@
-import pytest
-from web3 import Web3
-
-from gas_estimator import GasEstimator  # Assuming the gas estimator code is in 'gas_estimator.py'
-
-@pytest.fixture
-def setup_web3():
-    web3_provider = "https://mainnet.infura.io/v3/YOUR_INFURA_PROJECT_ID"
-    return Web3(Web3.HTTPProvider(web3_provider))
-
-def test_gas_estimator(setup_web3):
-    gas_estimator = GasEstimator(setup_web3)
-    
-    transaction_data = {
-        'to': '0xRecipientAddress',
-        'from': '0xSenderAddress',
-        'value': setup_web3.toWei(0.1, 'ether'),
-        'data': '0xTransactionData'
-    }
-    
-    gas = gas_estimator.estimate_gas(transaction_data)
-    
-    assert gas is not None, "Gas estimation failed."
-    assert gas > 0, "Estimated gas should be greater than 0."
+# File: /offchain/utils/gas_estimator.py
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+
+class GasEstimator:
+    def __init__(self, web3, window: int = 20, percentiles: Sequence[int] = (10, 25, 50, 75, 90),
+                 gas_margin: float = 1.2, default_gas: int = 200_000, gas_cache_blocks: int = 300):
+        """
+        Fee and gas model kept in memory. A rolling eth_feeHistory window is refreshed once per
+        block (fetching only the blocks not seen yet), so base fee and priority fee percentiles are
+        read without RPC. Until the first successful update() there is no fee data, and reading
+        fees raises instead of pricing transactions at zero. estimate_gas results are cached per
+        (contract, path length) and reused until invalidated or older than gas_cache_blocks.
+        :param web3: Web3 v6 instance (eth.fee_history, eth.estimate_gas and eth.block_number are used)
+        :param window: Number of recent blocks the fee model covers
+        :param percentiles: Priority fee reward percentiles requested from eth_feeHistory
+        :param gas_margin: Multiplier applied to eth.estimate_gas results
+        :param default_gas: Gas limit used when estimation fails and nothing is cached
+        :param gas_cache_blocks: Blocks after which a cached gas estimate is refreshed
+        """
+        self.web3 = web3
+        self.window = window
+        self.percentiles = list(percentiles)
+        self.gas_margin = gas_margin
+        self.default_gas = default_gas
+        self.gas_cache_blocks = gas_cache_blocks
+
+        self.last_block: Optional[int] = None
+        self.next_base_fee = 0
+        self._base_fees: Deque[int] = deque(maxlen=window)
+        self._rewards: Deque[List[int]] = deque(maxlen=window)
+        self._priority_fees: Dict[int, int] = {}
+        self._gas_cache: Dict[Hashable, Tuple[Optional[int], Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, block_number: Optional[int] = None) -> bool:
+        """
+        Refreshes the fee window up to block_number (latest if not given). Call once per new block.
+        :return: True if new blocks were added to the window, False if there were none or the RPC failed
+        """
+        try:
+            if block_number is None:
+                block_number = self.web3.eth.block_number
+            if self.last_block is not None and block_number <= self.last_block:
+                return False
+            count = self.window if self.last_block is None else min(self.window, block_number - self.last_block)
+            history = self.web3.eth.fee_history(count, block_number, self.percentiles)
+        except Exception as e:
+            logging.error(f"Exception when fetching fee history at block {block_number}: {str(e)}")
+            return False
+
+        base_fees = [int(fee) for fee in history['baseFeePerGas']]
+        rewards = history.get('reward') or [[0] * len(self.percentiles)] * (len(base_fees) - 1)
+        with self._lock:
+            # baseFeePerGas carries one extra entry: the base fee of the block after the newest one
+            self._base_fees.extend(base_fees[:-1])
+            self._rewards.extend([int(value) for value in reward] for reward in rewards)
+            self.next_base_fee = base_fees[-1]
+            self.last_block = block_number
+            matrix = np.array(self._rewards, dtype=np.float64).reshape(-1, len(self.percentiles))
+            medians = np.median(matrix, axis=0) if len(matrix) else np.zeros(len(self.percentiles))
+            self._priority_fees = {p: int(fee) for p, fee in zip(self.percentiles, medians)}
+        return True
+
+    @property
+    def seeded(self) -> bool:
+        """
+        True once update() has loaded fee history.
+        """
+        return self.last_block is not None
+
+    def _require_seeded(self) -> None:
+        if self.last_block is None:
+            raise RuntimeError("Fee model has no fee history yet; update() has not succeeded")
+
+    def base_fee(self) -> int:
+        """
+        Base fee of the next block, from memory.
+        """
+        self._require_seeded()
+        return self.next_base_fee
+
+    def priority_fee(self, percentile: int = 50) -> int:
+        """
+        Typical priority fee paid at the given reward percentile over the window, from memory.
+        Percentiles that were not requested fall back to the nearest requested one.
+        """
+        self._require_seeded()
+        if percentile not in self._priority_fees:
+            percentile = min(self._priority_fees, key=lambda known: abs(known - percentile))
+        return self._priority_fees[percentile]
+
+    def fee_fields(self, percentile: int = 50, base_fee_multiplier: float = 2.0) -> Dict[str, int]:
+        """
+        EIP-1559 fee fields for a transaction targeting the next block(s).
+        :param percentile: Priority fee percentile to bid
+        :param base_fee_multiplier: Headroom over the next base fee in maxFeePerGas
+        """
+        tip = self.priority_fee(percentile)
+        return {
+            'maxFeePerGas': int(self.next_base_fee * base_fee_multiplier) + tip,
+            'maxPriorityFeePerGas': tip,
+        }
+
+    def estimate_gas(self, transaction: Dict, path_length: Optional[int] = None) -> Optional[int]:
+        """
+        Gas limit for a transaction, cached per (contract, path length). A failed estimate is
+        remembered for the rest of the block, so callers fall back to default_gas without repeating
+        the failing RPC. Contract creations have no 'to' address to key on and are estimated on every call.
+        :param transaction: Transaction dict passed to eth.estimate_gas on a cache miss
+        :param path_length: Swap path length; calls with the same contract and length share an estimate
+        :return: Estimated gas with margin, or None if estimation failed
+        """
+        key = (transaction['to'], path_length) if transaction.get('to') else None
+        with self._lock:
+            cached = self._gas_cache.get(key) if key is not None else None
+        if cached is not None:
+            gas, block = cached
+            if gas is None:
+                if block is not None and block == self.last_block:
+                    return None
+            elif block is None or self.last_block is None or self.last_block - block < self.gas_cache_blocks:
+                return gas
+
+        try:
+            gas = int(self.web3.eth.estimate_gas(transaction) * self.gas_margin)
+        except Exception as e:
+            logging.error(f"Exception when estimating gas for {transaction.get('to')}: {str(e)}")
+            if key is not None and self.last_block is not None:
+                with self._lock:
+                    self._gas_cache[key] = (None, self.last_block)
+            return None
+        if key is not None:
+            with self._lock:
+                self._gas_cache[key] = (gas, self.last_block)
+        return gas
+
+    def invalidate(self, contract: Optional[str] = None) -> None:
+        """
+        Drops cached gas estimates for one contract, or all of them (e.g. after a redeploy).
+        """
+        with self._lock:
+            if contract is None:
+                self._gas_cache.clear()
+            else:
+                for key in [key for key in self._gas_cache if key[0] == contract]:
+                    del self._gas_cache[key]
+
+    def price_transaction(self, transaction: Dict, path_length: Optional[int] = None,
+                          percentile: int = 50) -> Dict:
+        """
+        Returns the transaction with gas limit and fee fields filled in from the cached model.
+        Raises RuntimeError while the fee model is not seeded.
+        """
+        self._require_seeded()
+        gas = self.estimate_gas(transaction, path_length) or self.default_gas
+        return {**transaction, 'gas': gas, **self.fee_fields(percentile)}
+
+    def bundle_cost(self, gas: int, percentile: int = 50) -> int:
+        """
+        Expected cost in wei of gas units included in the next block at the given tip percentile.
+        """
+        return gas * (self.base_fee() + self.priority_fee(percentile))
@@ -0,0 +1,190 @@
+# File: /offchain/utils/liquidity_cache.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Result handed to coalesced waiters when the task that owned the fetch was cancelled
+_ABANDONED = object()
+
+
+class LiquidityCache:
+    def __init__(self, max_entries: int = 10_000, ttl: float = 12.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Bounded LRU cache for router liquidity responses, shared by every liquidity client.
+        An entry expires when its TTL runs out or when a new block is announced via set_block,
+        whichever comes first. Concurrent lookups of the same missing key are collapsed into one
+        in-flight fetch, for threads and asyncio tasks alike.
+        :param max_entries: Maximum number of cached (router, pair) responses
+        :param ttl: Seconds an entry stays fresh (about one block by default)
+        :param clock: Monotonic time source, injectable for tests
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.current_block: Optional[int] = None
+
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float, Optional[int]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_async: Dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(router_url: str, token_1: str, token_2: str) -> Tuple[str, str, str]:
+        return router_url, token_1, token_2
+
+    def set_block(self, block_number: int) -> None:
+        """
+        Announces a new block; entries fetched in earlier blocks stop being served.
+        """
+        self.current_block = block_number
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns a fresh cached value or None, updating hit/miss counters.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drops one entry, or every entry when no key is given.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Returns the cached value for key, calling fetch on a miss. Threads asking for a key that is
+        already being fetched wait for that fetch instead of issuing their own.
+        Failed fetches (None) are passed through but not cached.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if value is not None:
+                self._store(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    async def get_or_fetch_async(self, key: Hashable, fetch: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """
+        Asyncio counterpart of get_or_fetch: tasks asking for a key already being fetched await that fetch.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            future = self._inflight_async.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            value = await asyncio.shield(future)
+            if value is _ABANDONED:
+                # The owner was cancelled, not us: one waiter takes over the fetch, the rest coalesce on it
+                return await self.get_or_fetch_async(key, fetch)
+            return value
+
+        try:
+            value = await fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight_async[key]
+            if isinstance(e, asyncio.CancelledError):
+                future.set_result(_ABANDONED)
+            else:
+                future.set_exception(e)
+                # Nobody else may be waiting; mark the exception as retrieved
+                future.exception()
+            raise
+
+        with self._lock:
+            if value is not None:
+                self._store(key, value)
+            del self._inflight_async[key]
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for tuning the cache size and TTL.
+        """
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'coalesced': self.coalesced,
+        }
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Optional[Any]]:
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at, block = entry
+        if self.clock() >= expires_at or (block is not None and block != self.current_block):
+            del self._entries[key]
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        # Caller holds the lock
+        self._entries[key] = (value, self.clock() + self.ttl, self.current_block)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
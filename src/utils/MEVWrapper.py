@@ -5,21 +5,30 @@ from web3 import Web3
 from eth_account import Account
 from web3.middleware import geth_poa_middleware
 import json
+from typing import List, Optional
+
+from src.utils.GasEstimator import GasEstimator
+from src.utils.NonceManager import NonceManager
 
 class MEVBotWrapper:
-    def __init__(self, web3: Web3, flashbot_url: str, private_key: str, flashbot_bundle_url: str):
+    def __init__(self, web3: Web3, flashbot_url: str, private_key: str, flashbot_bundle_url: str,
+                 nonce_manager: Optional[NonceManager] = None, gas_estimator: Optional[GasEstimator] = None):
         """
         Initializes the MEV Bot Wrapper.
         :param web3: Web3 instance for transaction management
         :param flashbot_url: URL for the Flashbot endpoint or another MEV provider
         :param private_key: Your wallet's private key to sign transactions
         :param flashbot_bundle_url: Flashbot API URL for submitting MEV bundles
+        :param nonce_manager: Shared local nonce counter for the account (created if not given)
+        :param gas_estimator: Shared fee and gas model, refreshed once per block (created if not given)
         """
         self.web3 = web3
         self.private_key = private_key
         self.flashbot_url = flashbot_url
         self.flashbot_bundle_url = flashbot_bundle_url
         self.account = Account.from_key(private_key)
+        self.nonce_manager = nonce_manager or NonceManager(web3, self.account.address)
+        self.gas_estimator = gas_estimator or GasEstimator(web3)
 
         # Optional: handle POA chain (if using Binance Smart Chain or other POA networks)
         self.web3.middleware_stack.inject(geth_poa_middleware, layer=0)
@@ -32,7 +41,7 @@ class MEVBotWrapper:
         """
         try:
             # Sending transaction bundle to Flashbots
-            response = requests.post(self.flashbot_bundle_url, json=transaction_data)
+            response = requests.post(self.flashbot_bundle_url, json=transaction_data, timeout=5)
             if response.status_code == 200:
                 return response.json()  # Return Flashbot's response with the result
             else:
@@ -65,36 +74,56 @@ class MEVBotWrapper:
         # You could apply any custom logic to detect arbitrage opportunities here, such as checking liquidity, prices, etc.
         return arbitrage_data
 
-    def construct_mev_transaction_bundle(self, arbitrage_data: dict):
+    def construct_mev_transaction_bundle(self, arbitrage_data: dict, nonce: Optional[int] = None):
         """
         Constructs a transaction bundle for MEV submission.
         :param arbitrage_data: The data related to the arbitrage opportunity
+        :param nonce: Nonce to use (next local nonce if not given)
         :return: A transaction bundle ready to be submitted to Flashbots or other MEV service
         """
+        # Fees come from the in-memory fee model; the gas limit is estimated once per path length.
+        # Pricing raises while the fee model is unseeded, before a nonce is taken
+        transaction = self.gas_estimator.price_transaction({
+            'from': self.account.address,
+            'to': '0xUniswapRouterAddress',
+            'data': '0xYourTransactionData',  # Raw data for the transaction (swap or arbitrage action)
+        }, path_length=len(arbitrage_data.get('routes', [])))
+        transaction['nonce'] = self.nonce_manager.next_nonce() if nonce is None else nonce
         # Construct a bundle of transactions that will be submitted to Flashbots
         transaction_bundle = {
-            'txs': [
-                # Example of a transaction object (for the sake of simplicity)
-                {
-                    'to': '0xUniswapRouterAddress',
-                    'data': '0xYourTransactionData',  # Raw data for the transaction (swap or arbitrage action)
-                    'gas': 200000,  # Estimated gas for the transaction
-                    'gasPrice': self.web3.toWei(100, 'gwei'),
-                    'nonce': self.web3.eth.getTransactionCount(self.account.address),
-                }
-            ],
+            'txs': [transaction],
             'target': 'flashbots',  # Target service (e.g., Flashbots)
             'arbitrage_data': arbitrage_data
         }
         return transaction_bundle
 
-    def execute_arbitrage(self, token_in: str, token_out: str):
+    def construct_candidate_bundles(self, opportunities: List[dict]) -> List[dict]:
+        """
+        Builds bundles for several opportunities at once, on consecutive nonces.
+        :param opportunities: Arbitrage opportunity data, in submission order
+        :return: One transaction bundle per opportunity
+        """
+        if not self.gas_estimator.seeded:
+            raise RuntimeError("Fee model has no fee history yet; refusing to build zero-fee bundles")
+        nonces = self.nonce_manager.reserve(len(opportunities))
+        return [self.construct_mev_transaction_bundle(data, nonce) for data, nonce in zip(opportunities, nonces)]
+
+    def execute_arbitrage(self, token_in: str, token_out: str, block_number: Optional[int] = None):
         """
         Executes the arbitrage strategy based on best opportunity.
         :param token_in: Token to trade from
         :param token_out: Token to trade to
+        :param block_number: Latest block from the caller's block feed; the fee model is refreshed
+                             to it (no RPC unless the block is new). Without it the fee model is
+                             used as last refreshed by the block feed
         :return: Transaction hash or None if no opportunity
         """
+        if block_number is not None:
+            self.gas_estimator.update(block_number)
+        if not self.gas_estimator.seeded:
+            print("Fee model has no fee history yet; not submitting.")
+            return None
+
         # Fetch the best arbitrage opportunity
         arbitrage_opportunity = self.get_best_arbitrage_opportunity(token_in, token_out)
 
@@ -105,11 +134,14 @@ class MEVBotWrapper:
             # Submit the transaction bundle to Flashbots
             response = self.submit_transaction_to_flashbots(transaction_bundle)
 
-            if response:
+            if response and 'error' not in response:
                 print(f"Transaction successfully submitted! Response: {response}")
                 return response
             else:
                 print("Failed to submit transaction.")
+                # The bundle was not included: re-sync so its nonce is reused instead of leaving a gap
+                if not (response and self.nonce_manager.handle_error(response['error'])):
+                    self.nonce_manager.sync()
         else:
             print("No arbitrage opportunity found.")
 
@@ -130,7 +162,8 @@ if __name__ == "__main__":
                                     private_key=private_key, flashbot_bundle_url="https://api.flashbots.xyz")
 
     # Execute arbitrage between WETH and USDT
-    txn_response = mev_bot_wrapper.execute_arbitrage('WETH', 'USDT')
+    # In a running bot the block number comes from the block subscription, not a per-call RPC
+    txn_response = mev_bot_wrapper.execute_arbitrage('WETH', 'USDT', web3.eth.block_number)
 
     if txn_response:
         print(f"Transaction Response: {txn_response}")
@@ -0,0 +1,200 @@
+# File: /offchain/utils/market_recorder.py
+
+import json
+import logging
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+FORMAT_VERSION = 1
+
+# Column name -> (array typecode used while buffering, numpy dtype on disk). One file per column.
+COLUMNS = {
+    'block': ('Q', '<u8'),
+    'token_in': ('I', '<u4'),
+    'token_out': ('I', '<u4'),
+    'pool': ('I', '<u4'),
+    'venue': ('H', '<u2'),
+    'fee': ('I', '<u4'),
+    'rate': ('d', '<f8'),
+    'liquidity': ('d', '<f8'),
+}
+
+
+def _load_meta(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, 'meta.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported market tape version {meta.get('version')} in {directory}")
+    return meta
+
+
+class MarketRecorder:
+    def __init__(self, directory: str, flush_rows: int = 65_536):
+        """
+        Appends edge updates to a columnar market tape: one fixed-width little-endian file per
+        column (block, token_in, token_out, pool, venue, fee, rate, liquidity) plus meta.json with
+        the token, pool and venue dictionaries. Rows must be recorded in block order. Reopening an
+        existing tape continues it, after cutting every column back to the rows all columns completed.
+        :param directory: Tape directory (created if missing)
+        :param flush_rows: Rows buffered in memory before they are appended to disk
+        """
+        self.directory = directory
+        self.flush_rows = flush_rows
+        os.makedirs(directory, exist_ok=True)
+
+        meta = _load_meta(directory) or {'tokens': [], 'pools': [''], 'venues': ['']}
+        self.tokens: List[str] = meta['tokens']
+        self.pools: List[str] = meta['pools']
+        self.venues: List[str] = meta['venues']
+        self._token_ids = {token: i for i, token in enumerate(self.tokens)}
+        self._pool_ids = {pool: i for i, pool in enumerate(self.pools)}
+        self._venue_ids = {venue: i for i, venue in enumerate(self.venues)}
+        self._buffers = {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+        self.rows = 0
+        self._truncate_to_complete_rows(meta is not None)
+
+    def _truncate_to_complete_rows(self, has_meta: bool) -> None:
+        # An interrupted flush can leave some column files a few rows longer than others. Appending
+        # to them as they are would shift every later row out of alignment, so drop the partial rows.
+        # Without meta.json the ids in existing column files cannot be resolved, so nothing is kept.
+        paths = {name: os.path.join(self.directory, f'{name}.bin') for name in COLUMNS}
+        sizes = {name: os.path.getsize(path) if os.path.exists(path) else 0 for name, path in paths.items()}
+        complete = min(sizes[name] // np.dtype(dtype).itemsize for name, (_, dtype) in COLUMNS.items())
+        if not has_meta:
+            complete = 0
+        for name, (_, dtype) in COLUMNS.items():
+            size = complete * np.dtype(dtype).itemsize
+            if sizes[name] > size:
+                logging.warning(f"Truncating {paths[name]} to {complete} complete rows")
+                os.truncate(paths[name], size)
+
+    @staticmethod
+    def _intern(value: str, ids: Dict[str, int], names: List[str]) -> int:
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(names)
+            names.append(value)
+        return index
+
+    def record(self, block: int, token_in: str, token_out: str, rate: float, pool: Optional[str] = None,
+               venue: str = '', fee: int = 0, liquidity: float = 0.0) -> None:
+        """
+        Buffers one edge update.
+        """
+        buffers = self._buffers
+        buffers['block'].append(block)
+        buffers['token_in'].append(self._intern(token_in, self._token_ids, self.tokens))
+        buffers['token_out'].append(self._intern(token_out, self._token_ids, self.tokens))
+        buffers['pool'].append(self._intern(pool or '', self._pool_ids, self.pools))
+        buffers['venue'].append(self._intern(venue, self._venue_ids, self.venues))
+        buffers['fee'].append(fee)
+        buffers['rate'].append(rate)
+        buffers['liquidity'].append(liquidity)
+        self.rows += 1
+        if len(buffers['block']) >= self.flush_rows:
+            self.flush()
+
+    def record_update(self, update, block: Optional[int] = None) -> None:
+        """
+        Buffers a pipeline EdgeUpdate (its own block is used unless one is given).
+        """
+        self.record(update.block if block is None else block, update.token_in, update.token_out, update.rate,
+                    update.pool, update.venue, update.fee, update.liquidity)
+
+    def record_block(self, block: int, updates: Iterable) -> None:
+        """
+        Buffers every EdgeUpdate observed in one block.
+        """
+        for update in updates:
+            self.record_update(update, block)
+
+    def flush(self) -> None:
+        """
+        Rewrites the dictionaries, then appends buffered rows to the column files. The dictionaries
+        go first so that every id in a column file already has a name, even if the append is interrupted.
+        """
+        meta = {
+            'version': FORMAT_VERSION,
+            'columns': {name: dtype for name, (_, dtype) in COLUMNS.items()},
+            'tokens': self.tokens,
+            'pools': self.pools,
+            'venues': self.venues,
+        }
+        temporary = os.path.join(self.directory, 'meta.json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temporary, os.path.join(self.directory, 'meta.json'))
+
+        for name, (typecode, _) in COLUMNS.items():
+            buffer = self._buffers[name]
+            if buffer:
+                with open(os.path.join(self.directory, f'{name}.bin'), 'ab') as f:
+                    buffer.tofile(f)
+                self._buffers[name] = array(typecode)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'MarketRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MarketTape:
+    def __init__(self, directory: str):
+        """
+        Read-only, memory-mapped view of a tape written by MarketRecorder. Columns are numpy
+        memmaps, so opening a day of blocks costs nothing until rows are touched.
+        :param directory: Tape directory
+        """
+        meta = _load_meta(directory)
+        if meta is None:
+            raise FileNotFoundError(f"No market tape in {directory}")
+        self.directory = directory
+        self.tokens: List[str] = meta['tokens']
+        self.pools: List[str] = meta['pools']
+        self.venues: List[str] = meta['venues']
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, dtype in meta['columns'].items():
+            path = os.path.join(directory, f'{name}.bin')
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            self.columns[name] = (np.memmap(path, dtype=dtype, mode='r') if size
+                                  else np.zeros(0, dtype=dtype))
+        # Rows of an interrupted write may be missing from some columns; use the complete prefix
+        self.rows = min(len(column) for column in self.columns.values())
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.rows]
+
+    def block_slices(self, start_block: Optional[int] = None,
+                     end_block: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (block, first row, end row) for every recorded block in [start_block, end_block].
+        """
+        blocks = self['block']
+        if not self.rows:
+            return
+        first = 0 if start_block is None else int(np.searchsorted(blocks, start_block, 'left'))
+        last = self.rows if end_block is None else int(np.searchsorted(blocks, end_block, 'right'))
+        if first >= last:
+            return
+        window = blocks[first:last]
+        boundaries = np.flatnonzero(window[1:] != window[:-1]) + 1
+        starts = np.concatenate(([0], boundaries)) + first
+        ends = np.concatenate((boundaries, [len(window)])) + first
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            yield int(blocks[start]), start, end
@@ -0,0 +1,155 @@
+# File: /offchain/utils/multicall.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+# Multicall3 is deployed at the same address on mainnet and most EVM chains
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+# Uniswap V3 Quoter (V1), the contract uniswap-python quotes through
+QUOTER_ADDRESS = '0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6'
+
+# aggregate3((address,bool,bytes)[])
+AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')
+# quoteExactInputSingle(address,address,uint24,uint256,uint160)
+QUOTE_EXACT_INPUT_SINGLE_SELECTOR = bytes.fromhex('f7729d43')
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big')
+
+
+def _address(address: str) -> bytes:
+    return bytes.fromhex(address[2:] if address.startswith('0x') else address).rjust(32, b'\0')
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b'\0' * (-len(data) % 32)
+
+
+def encode_quote_exact_input_single(token_in: str, token_out: str, fee: int, amount_in: int,
+                                    sqrt_price_limit_x96: int = 0) -> bytes:
+    """
+    ABI-encodes a Quoter.quoteExactInputSingle call (all arguments are static words).
+    """
+    return (QUOTE_EXACT_INPUT_SINGLE_SELECTOR + _address(token_in) + _address(token_out) + _word(fee)
+            + _word(amount_in) + _word(sqrt_price_limit_x96))
+
+
+def encode_aggregate3(calls: Sequence[Tuple[str, bool, bytes]]) -> bytes:
+    """
+    ABI-encodes Multicall3.aggregate3 for a list of (target, allow_failure, call_data).
+    """
+    heads = []
+    tails = []
+    offset = 32 * len(calls)
+    for target, allow_failure, call_data in calls:
+        # Each Call3 tuple is dynamic: (target, allowFailure, offset to callData) then the bytes
+        encoded = _address(target) + _word(int(allow_failure)) + _word(96) + _word(len(call_data)) + _padded(call_data)
+        heads.append(_word(offset))
+        tails.append(encoded)
+        offset += len(encoded)
+    return AGGREGATE3_SELECTOR + _word(32) + _word(len(calls)) + b''.join(heads) + b''.join(tails)
+
+
+def decode_aggregate3(data: bytes) -> List[Tuple[bool, bytes]]:
+    """
+    Decodes the (bool success, bytes returnData)[] result of Multicall3.aggregate3.
+    """
+    start = int.from_bytes(data[0:32], 'big')
+    count = int.from_bytes(data[start:start + 32], 'big')
+    base = start + 32
+    results = []
+    for i in range(count):
+        item = base + int.from_bytes(data[base + 32 * i:base + 32 * (i + 1)], 'big')
+        success = data[item + 31] == 1
+        payload = item + int.from_bytes(data[item + 32:item + 64], 'big')
+        length = int.from_bytes(data[payload:payload + 32], 'big')
+        results.append((success, data[payload + 32:payload + 32 + length]))
+    return results
+
+
+class MulticallQuoter:
+    def __init__(self, web3, quoter_address: str = QUOTER_ADDRESS, multicall_address: str = MULTICALL3_ADDRESS,
+                 max_calls_per_batch: int = 250, gas_per_quote: int = 150_000, gas_limit: int = 30_000_000,
+                 max_payload_bytes: int = 128 * 1024, max_workers: int = 4):
+        """
+        Prices many pairs with a handful of Multicall3 aggregate3 eth_calls instead of one RPC round
+        trip per pair. Batches are sized to stay under the eth_call gas cap and the RPC payload limit.
+        :param web3: Web3 instance (only web3.eth.call is used)
+        :param quoter_address: Uniswap V3 Quoter contract
+        :param multicall_address: Multicall3 contract
+        :param max_calls_per_batch: Hard cap on quotes per aggregate call
+        :param gas_per_quote: Gas budgeted for one quoter call
+        :param gas_limit: Gas cap for one eth_call
+        :param max_payload_bytes: Request calldata budget per aggregate call
+        :param max_workers: Aggregate calls issued concurrently
+        """
+        self.web3 = web3
+        self.quoter_address = quoter_address
+        self.multicall_address = multicall_address
+        self.max_calls_per_batch = max_calls_per_batch
+        self.gas_per_quote = gas_per_quote
+        self.gas_limit = gas_limit
+        self.max_payload_bytes = max_payload_bytes
+        self.max_workers = max_workers
+
+    def batch_size(self) -> int:
+        """
+        Number of quotes per aggregate call allowed by the call, gas and payload limits.
+        """
+        # One encoded Call3 with quoter calldata: offset + 3 head words + length + 164 bytes padded to 192
+        call_bytes = 32 * 5 + 192
+        return max(1, min(self.max_calls_per_batch, self.gas_limit // self.gas_per_quote,
+                          self.max_payload_bytes // call_bytes))
+
+    def quote_amounts(self, quotes: Sequence[Tuple[str, str, int]], amount_in: int,
+                      block_identifier='latest') -> List[Optional[int]]:
+        """
+        Quotes amount_in through every (token_in, token_out, fee) pool.
+        :return: Output amounts in pair order, None where the quote reverted
+        """
+        calls = [
+            (self.quoter_address, True, encode_quote_exact_input_single(token_in, token_out, fee, amount_in))
+            for token_in, token_out, fee in quotes
+        ]
+        size = self.batch_size()
+        batches = [calls[i:i + size] for i in range(0, len(calls), size)]
+
+        def run(batch):
+            transaction = {'to': self.multicall_address, 'data': '0x' + encode_aggregate3(batch).hex(),
+                           'gas': self.gas_limit}
+            return decode_aggregate3(bytes(self.web3.eth.call(transaction, block_identifier)))
+
+        if len(batches) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+                decoded = list(pool.map(run, batches))
+        else:
+            decoded = [run(batch) for batch in batches]
+
+        amounts: List[Optional[int]] = []
+        for results in decoded:
+            for success, return_data in results:
+                amounts.append(int.from_bytes(return_data[:32], 'big') if success and len(return_data) >= 32 else None)
+        logging.info(f"Quoted {len(quotes)} pools in {len(batches)} multicall batches")
+        return amounts
+
+    def get_prices(self, pairs: Sequence[Tuple], amount_in: int = 10**18, fee: int = 3000,
+                   block_identifier='latest') -> np.ndarray:
+        """
+        Prices many pairs at once.
+        :param pairs: (token_in, token_out) or (token_in, token_out, fee) address tuples
+        :param amount_in: Input amount quoted for every pair
+        :param fee: Fee tier used for pairs that do not name one
+        :param block_identifier: Block to quote at
+        :return: float64 array of amount_out / amount_in in pair order, NaN where the quote failed
+        """
+        quotes = [(pair[0], pair[1], pair[2] if len(pair) > 2 else fee) for pair in pairs]
+        amounts = self.quote_amounts(quotes, amount_in, block_identifier)
+        rates = np.array([np.nan if amount is None else amount for amount in amounts], dtype=np.float64)
+        return rates / amount_in
@@ -0,0 +1,120 @@
+# File: /offchain/utils/nonce_manager.py
+
+import asyncio
+import logging
+import threading
+from typing import List, Optional
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+# Substrings of node/relay errors that mean our local nonce no longer matches the chain
+NONCE_ERRORS = ('nonce too low', 'nonce too high', 'invalid nonce', 'replacement transaction underpriced',
+                'already known')
+
+
+class NonceManager:
+    def __init__(self, web3, address: str, block_identifier: str = 'pending'):
+        """
+        Hands out transaction nonces locally so bundle construction needs no RPC round trip.
+        The counter is seeded from the chain on first use and re-synced only when a bundle is
+        dropped or a nonce error comes back. Handing out nonces only takes a lock for a counter
+        increment, so it is safe from worker threads and from asyncio tasks alike.
+        :param web3: Web3 instance used to read the account's transaction count
+        :param address: Account whose nonces are managed
+        :param block_identifier: Block the transaction count is read at when syncing
+        """
+        self.web3 = web3
+        self.address = address
+        self.block_identifier = block_identifier
+
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        self.syncs = 0
+
+    def _chain_nonce(self) -> int:
+        return self.web3.eth.get_transaction_count(self.address, self.block_identifier)
+
+    def sync(self) -> int:
+        """
+        Re-reads the account nonce from the chain and discards every locally issued nonce above it.
+        :return: The next nonce that will be handed out
+        """
+        chain_nonce = self._chain_nonce()
+        with self._lock:
+            self._next = chain_nonce
+            self.syncs += 1
+        logging.info(f"Nonce for {self.address} synced to {chain_nonce}")
+        return chain_nonce
+
+    def seed(self, nonce: int) -> None:
+        """
+        Starts the counter at a known nonce (e.g. restored from a snapshot) without an RPC call.
+        A stale seed is corrected by the next sync or nonce error.
+        """
+        with self._lock:
+            self._next = nonce
+
+    def peek(self) -> Optional[int]:
+        """
+        Returns the next nonce that would be handed out, or None before the first sync.
+        """
+        return self._next
+
+    async def sync_async(self) -> int:
+        """
+        sync() with the RPC call run off the event loop.
+        """
+        return await asyncio.to_thread(self.sync)
+
+    def next_nonce(self) -> int:
+        """
+        Returns the next unused nonce.
+        """
+        return self.reserve(1)[0]
+
+    def reserve(self, count: int) -> List[int]:
+        """
+        Reserves a block of consecutive nonces, e.g. for several transactions or candidate bundles
+        built at the same time.
+        :param count: Number of nonces to reserve
+        :return: Consecutive nonces in ascending order
+        """
+        if self._next is None:
+            # Seed outside the lock; concurrent first callers may both fetch, the first result wins
+            chain_nonce = self._chain_nonce()
+            with self._lock:
+                if self._next is None:
+                    self._next = chain_nonce
+                    self.syncs += 1
+        with self._lock:
+            start = self._next
+            self._next += count
+        return list(range(start, start + count))
+
+    def release(self, nonces: List[int]) -> bool:
+        """
+        Returns nonces of a bundle that will not be sent. They are reused only when they are the
+        most recently issued ones; otherwise the gap is left for the next sync to close.
+        :return: True if the nonces were reclaimed
+        """
+        if not nonces:
+            return True
+        with self._lock:
+            if self._next is not None and max(nonces) + 1 == self._next:
+                self._next = min(nonces)
+                return True
+        return False
+
+    def handle_error(self, error: Exception) -> bool:
+        """
+        Re-syncs when a submission failed because of a nonce mismatch.
+        :param error: Exception or error message returned by the node or relay
+        :return: True if the error was nonce-related and the counter was re-synced
+        """
+        message = str(error).lower()
+        if any(pattern in message for pattern in NONCE_ERRORS):
+            logging.warning(f"Nonce error for {self.address}: {str(error)}")
+            self.sync()
+            return True
+        return False
@@ -0,0 +1,104 @@
+# File: /offchain/utils/state_snapshot.py
+
+import json
+import logging
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from src.bots.AMMQuoteEngine import V2, AMMQuoteEngine
+from src.bots.BellmanFord import TokenGraph
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+FORMAT_VERSION = 1
+
+
+class Snapshot(NamedTuple):
+    """
+    Bot state restored from disk. Parts that were not saved are None (nonces: empty).
+    """
+    token_graph: Optional[TokenGraph]
+    engine: Optional[AMMQuoteEngine]
+    nonces: Dict[str, int]
+    block: Optional[int]
+    saved_at: float
+
+
+def save_snapshot(path: str, token_graph: Optional[TokenGraph] = None, engine: Optional[AMMQuoteEngine] = None,
+                  nonces: Optional[Dict[str, int]] = None, block: Optional[int] = None) -> str:
+    """
+    Writes the token graph, cached pool state and account nonces to one .npz file. Edge and pool
+    columns are stored as raw arrays and names as JSON (no pickle), so a restart restores them
+    without re-deriving a single weight. The file is replaced atomically.
+    :param path: Snapshot file
+    :param token_graph: Multi-venue graph to save
+    :param engine: AMM pool state to save (big ints are stored as decimal strings)
+    :param nonces: Account address -> next nonce
+    :param block: Latest block the state reflects
+    :return: The snapshot path
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    meta: Dict = {'version': FORMAT_VERSION, 'saved_at': time.time(), 'block': block, 'nonces': nonces or {}}
+
+    if token_graph is not None:
+        src, dst, weight = token_graph.edge_arrays()
+        arrays.update(src=src, dst=dst, weight=weight, venue=np.frombuffer(token_graph.venue, dtype=np.uint16),
+                      fee=np.frombuffer(token_graph.fee, dtype=np.uint32))
+        meta['graph'] = {'tokens': token_graph.tokens, 'venues': token_graph.venues, 'pools': token_graph.pools}
+
+    if engine is not None:
+        size = engine.size
+        arrays.update(amm_kind=engine.kind[:size], amm_fee=engine.fee[:size])
+        meta['amm'] = {
+            'addresses': engine.addresses,
+            'token0': engine.token0,
+            'token1': engine.token1,
+            **{column: [str(value) for value in getattr(engine, column)[:size]]
+               for column in ('reserve0', 'reserve1', 'sqrt_price_x96', 'liquidity')},
+        }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(temporary, path)
+    return path
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """
+    Reads a snapshot written by save_snapshot.
+    :raises FileNotFoundError: No snapshot at path
+    :raises ValueError: Snapshot written by an incompatible version
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {meta.get('version')} in {path}")
+
+        token_graph = None
+        if 'graph' in meta:
+            graph = meta['graph']
+            token_graph = TokenGraph.from_columns(graph['tokens'], graph['venues'], data['src'], data['dst'],
+                                                  data['weight'], data['venue'], data['fee'], graph['pools'])
+
+        engine = None
+        if 'amm' in meta:
+            amm = meta['amm']
+            engine = AMMQuoteEngine()
+            columns = zip(amm['addresses'], amm['token0'], amm['token1'], data['amm_kind'].tolist(),
+                          data['amm_fee'].tolist(), amm['reserve0'], amm['reserve1'], amm['sqrt_price_x96'],
+                          amm['liquidity'])
+            for address, token0, token1, kind, fee, reserve0, reserve1, sqrt_price_x96, liquidity in columns:
+                if kind == V2:
+                    engine.add_v2_pool(address, token0, token1, int(reserve0), int(reserve1), fee)
+                else:
+                    engine.add_v3_pool(address, token0, token1, fee, int(sqrt_price_x96), int(liquidity))
+
+    return Snapshot(token_graph, engine, meta['nonces'], meta['block'], meta['saved_at'])
@@ -0,0 +1,209 @@
+# File: /offchain/utils/tracing.py
+
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Pipeline stages in the order an opportunity passes through them
+STAGES = ('fetch', 'graph_update', 'detection', 'sizing', 'signing', 'submission')
+
+# Histogram bucket upper bounds in seconds (Prometheus "le"), 50us to 10s
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+           2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (cumulative on export, Prometheus style).
+    """
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        buckets = []
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            total += count
+            buckets.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return buckets
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, max_traces: int = 10_000, clock=time.perf_counter):
+        """
+        Per-opportunity stage timing. start() hands out a trace ID and mark() stamps the stages an
+        opportunity passes through; the time since the previous stamp feeds that stage's histogram
+        and finish() records the end-to-end latency. While disabled, start() returns None and every
+        other call returns on its first check, so instrumented code pays almost nothing.
+        :param enabled: Whether traces are recorded
+        :param max_traces: Number of recent traces kept for the JSON dump
+        :param clock: Time source in seconds, injectable for tests
+        """
+        self.enabled = enabled
+        self.max_traces = max_traces
+        self.clock = clock
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._traces: 'OrderedDict[int, List[Tuple[str, float]]]' = OrderedDict()
+        self.histograms: Dict[str, Histogram] = {}
+
+    def start(self, stage: str = 'fetch') -> Optional[int]:
+        """
+        Opens a trace stamped with its first stage.
+        :return: Trace ID, or None while tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        trace_id = next(self._ids)
+        with self._lock:
+            self._traces[trace_id] = [(stage, self.clock())]
+            if len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return trace_id
+
+    def mark(self, trace_id: Optional[int], stage: str) -> None:
+        """
+        Stamps a stage on a trace and records the time spent since the previous stamp.
+        """
+        if trace_id is None:
+            return
+        now = self.clock()
+        with self._lock:
+            stamps = self._traces.get(trace_id)
+            if stamps is None:
+                return
+            self._observe(stage, now - stamps[-1][1])
+            stamps.append((stage, now))
+
+    def mark_many(self, trace_ids: Optional[Iterable[Optional[int]]], stage: str) -> None:
+        """
+        mark() for every trace of a batch processed together (e.g. sizing or signing).
+        """
+        if not trace_ids:
+            return
+        for trace_id in trace_ids:
+            self.mark(trace_id, stage)
+
+    def fork(self, trace_id: Optional[int]) -> Optional[int]:
+        """
+        Copies a trace's stamps under a new ID, for each opportunity found from one update.
+        """
+        if trace_id is None:
+            return None
+        with self._lock:
+            stamps = self._traces.get(trace_id)
+            if stamps is None:
+                return None
+            child = next(self._ids)
+            self._traces[child] = list(stamps)
+            if len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return child
+
+    def finish(self, trace_id: Optional[int]) -> None:
+        """
+        Records the trace's end-to-end latency (first to last stamp).
+        """
+        if trace_id is None:
+            return
+        with self._lock:
+            stamps = self._traces.get(trace_id)
+            if stamps is not None:
+                self._observe('total', stamps[-1][1] - stamps[0][1])
+
+    def trace(self, trace_id: int) -> List[Tuple[str, float]]:
+        """
+        Stage stamps of a recent trace as (stage, seconds since the trace started).
+        """
+        with self._lock:
+            stamps = list(self._traces.get(trace_id, []))
+        return [(stage, stamp - stamps[0][1]) for stage, stamp in stamps]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self.histograms = {}
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        # Caller holds the lock
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def prometheus_text(self, metric: str = 'bfas_stage_latency_seconds') -> str:
+        """
+        Stage histograms in the Prometheus text exposition format.
+        """
+        lines = [f'# HELP {metric} Time spent in each stage from price update to bundle submission.',
+                 f'# TYPE {metric} histogram']
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.sum!r}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self, traces: int = 100) -> Dict:
+        """
+        Histograms plus the most recent traces, as a JSON-serializable dict.
+        :param traces: Number of recent traces to include
+        """
+        with self._lock:
+            histograms = {
+                stage: {'buckets': dict(histogram.cumulative()), 'sum': histogram.sum, 'count': histogram.count}
+                for stage, histogram in self.histograms.items()
+            }
+            recent = list(self._traces.items())[-traces:] if traces else []
+        return {
+            'histograms': histograms,
+            'traces': {str(trace_id): [[stage, stamp - stamps[0][1]] for stage, stamp in stamps]
+                       for trace_id, stamps in recent},
+        }
+
+    def dump_json(self, path: str, traces: int = 100) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_json(traces), f, indent=2)
+
+    def serve_prometheus(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serves prometheus_text() on /metrics from a background thread.
+        :return: The server (call shutdown() to stop it)
+        """
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = tracer.prometheus_text().encode()
+                self.send_response(200 if self.path == '/metrics' else 404)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Process-wide tracer; enable with BFAS_TRACING=1 or by setting tracer.enabled
+tracer = Tracer(enabled=os.environ.get('BFAS_TRACING') == '1')
@@ -0,0 +1,165 @@
+# File: /offchain/utils/transaction_factory.py
+
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eth_account import Account
+
+from src.utils.Tracing import tracer
+
+# Set up logger to track events and errors
+logging.basicConfig(level=logging.INFO)
+
+# executeArbitrage(address[],uint256)
+EXECUTE_ARBITRAGE_SELECTOR = bytes.fromhex('8955e68d')
+# Execute.executeArbitrage trades every hop through the Uniswap V3 pool of this fee tier; the call
+# carries only the token path, so routes through other pools cannot be executed as sized
+EXECUTE_POOL_FEE = 3000
+
+# Private key of the signing worker process, set once by the pool initializer
+_worker_key: Optional[str] = None
+
+
+def _init_signer(private_key: str) -> None:
+    global _worker_key
+    _worker_key = private_key
+
+
+def _sign(transaction: Dict) -> bytes:
+    return bytes(Account.sign_transaction(transaction, _worker_key).rawTransaction)
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big')
+
+
+def encode_execute_arbitrage(path: Sequence[str], amount_in: int) -> bytes:
+    """
+    ABI-encodes Execute.executeArbitrage(address[] path, uint256 amountIn) from scratch.
+    """
+    prefix, suffix = _template(path)
+    return prefix + _word(amount_in) + suffix
+
+
+def _template(path: Sequence[str]) -> Tuple[bytes, bytes]:
+    # Head: selector, offset of the dynamic path (two head words), then the amount word.
+    # Tail: path length and one left-padded word per address.
+    prefix = EXECUTE_ARBITRAGE_SELECTOR + _word(64)
+    suffix = _word(len(path)) + b''.join(
+        bytes.fromhex(token[2:] if token.startswith('0x') else token).rjust(32, b'\0') for token in path
+    )
+    return prefix, suffix
+
+
+class TransactionFactory:
+    def __init__(self, contract_address: str, private_key: str, chain_id: int = 1, gas_limit: int = 500_000,
+                 max_workers: Optional[int] = None, min_parallel: int = 16, max_templates: int = 4096):
+        """
+        Builds and signs executeArbitrage transactions for the Execute contract.
+        The calldata around the amount is encoded once per path and cached, so a new size only
+        patches one word. Signing is spread over a process pool when a block needs many signed
+        variants (sizes x priority fees) at once.
+        :param contract_address: Deployed Execute contract
+        :param private_key: Key of the account sending the transactions (e.g. MEVBotWrapper.private_key)
+        :param chain_id: Chain the transactions are signed for
+        :param gas_limit: Gas limit set on every transaction
+        :param max_workers: Signing processes (CPU count by default)
+        :param min_parallel: Batches smaller than this are signed in-process
+        :param max_templates: Number of path templates kept (least recently used are dropped)
+        """
+        self.contract_address = contract_address
+        self.private_key = private_key
+        self.account = Account.from_key(private_key)
+        self.chain_id = chain_id
+        self.gas_limit = gas_limit
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.max_templates = max_templates
+
+        self._templates: 'OrderedDict[Tuple[str, ...], Tuple[bytes, bytes]]' = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def calldata(self, path: Sequence[str], amount_in: int) -> bytes:
+        """
+        executeArbitrage calldata for path and amount_in, reusing the cached path template.
+        """
+        key = tuple(path)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = _template(key)
+            if len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(key)
+        prefix, suffix = template
+        return prefix + _word(amount_in) + suffix
+
+    def build_transaction(self, path: Sequence[str], amount_in: int, nonce: int, max_fee_per_gas: int,
+                          max_priority_fee_per_gas: int, gas: Optional[int] = None) -> Dict:
+        """
+        Unsigned EIP-1559 transaction calling executeArbitrage.
+        """
+        return {
+            'type': 2,
+            'chainId': self.chain_id,
+            'to': self.contract_address,
+            'value': 0,
+            'data': self.calldata(path, amount_in),
+            'gas': gas or self.gas_limit,
+            'nonce': nonce,
+            'maxFeePerGas': max_fee_per_gas,
+            'maxPriorityFeePerGas': max_priority_fee_per_gas,
+        }
+
+    def build_variants(self, path: Sequence[str], amounts: Sequence[int], priority_fees: Sequence[int],
+                       nonce: int, base_fee: int) -> List[Dict]:
+        """
+        Unsigned transactions for every (amount, priority fee) combination of one opportunity.
+        They share a nonce, so at most one of them can be included.
+        :param base_fee: Current base fee; maxFeePerGas is set to twice the base fee plus the tip
+        """
+        return [
+            self.build_transaction(path, amount, nonce, 2 * base_fee + tip, tip)
+            for amount in amounts for tip in priority_fees
+        ]
+
+    def sign(self, transaction: Dict) -> bytes:
+        """
+        Signs one transaction in-process.
+        :return: Raw signed transaction bytes
+        """
+        return bytes(Account.sign_transaction(transaction, self.private_key).rawTransaction)
+
+    def sign_many(self, transactions: Sequence[Dict],
+                  trace_ids: Optional[Sequence[Optional[int]]] = None) -> List[bytes]:
+        """
+        Signs a batch of transactions, in the process pool when the batch is large enough.
+        :param trace_ids: Opportunity trace IDs to stamp with the signing stage
+        :return: Raw signed transactions in input order
+        """
+        if len(transactions) < self.min_parallel or self.max_workers < 2:
+            signed = [self.sign(transaction) for transaction in transactions]
+            tracer.mark_many(trace_ids, 'signing')
+            return signed
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_signer,
+                                                 initargs=(self.private_key,))
+        chunksize = max(1, len(transactions) // (4 * self.max_workers))
+        signed = list(self._executor.map(_sign, transactions, chunksize=chunksize))
+        tracer.mark_many(trace_ids, 'signing')
+        logging.info(f"Signed {len(signed)} transactions on {self.max_workers} workers")
+        return signed
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'TransactionFactory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()